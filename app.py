@@ -10,7 +10,14 @@ from dash import Dash
 from components.layout import get_main_layout
 from components.callbacks import register_callbacks
 from routes.home import home_bp
+from routes.health import health_bp
+from routes.export import export_bp
+from routes.api import api_bp
+from routes.raster import raster_bp
 from data.data_manager import DataManager
+from utils.profiling import install_profiler
+from utils.warmup import install_warmup
+from utils.background import create_background_manager
 import os
 
 def create_app():
@@ -23,25 +30,37 @@ def create_app():
     # Initialize Flask server
     server = Flask(__name__)
     
-    # Initialize data manager
+    # Initialize data manager, shared with the data blueprints through server.extensions
     data_manager = DataManager()
+    server.extensions['data_manager'] = data_manager
+    
+    # Slow callbacks run as background jobs in separate processes (None: run inline)
+    background_manager = create_background_manager(data_manager)
     
     # Initialize Dash app
     app = Dash(
         __name__, 
         server=server, 
         url_base_pathname="/dashboard/",
-        suppress_callback_exceptions=True
+        suppress_callback_exceptions=True,
+        background_callback_manager=background_manager
     )
     
     # Set the layout
-    app.layout = get_main_layout()
+    app.layout = get_main_layout(data_manager)
     
     # Register callbacks
-    register_callbacks(app, data_manager)
+    register_callbacks(app, data_manager, background=background_manager is not None)
+    
+    # Opt-in sampling profiler around callback dispatch (DASH_PROFILE env var)
+    install_profiler(server)
     
     # Register Flask blueprints
     server.register_blueprint(home_bp)
+    server.register_blueprint(health_bp)
+    server.register_blueprint(export_bp)
+    server.register_blueprint(api_bp)
+    server.register_blueprint(raster_bp)
     
     # Add default route
     @server.route("/")
@@ -54,4 +73,7 @@ def create_app():
 server = create_app()
 
 if __name__ == "__main__":
+    # The figure warm-up is started by the serving entry points (here and in
+    # gunicorn.conf.py), so importing the app never starts it
+    install_warmup(server, server.extensions['data_manager'])
     server.run(debug=True, port=8050)
\ No newline at end of file
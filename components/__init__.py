@@ -9,7 +9,8 @@ from .callbacks import register_callbacks
 from .dashboard_components import (
     create_historical_trends_section,
     create_vegetation_section,
-    create_correlations_section
+    create_correlations_section,
+    create_scenario_section
 )
 from .footer import get_footer
 
@@ -19,5 +20,6 @@ __all__ = [
     'create_historical_trends_section',
     'create_vegetation_section',
     'create_correlations_section',
+    'create_scenario_section',
     'get_footer'
 ] 
\ No newline at end of file
@@ -4,25 +4,219 @@ Callback functions for the Dash application.
 This module contains all the callback functions that handle user interactions
 and update the dashboard components accordingly. It manages tab switching,
 data filtering, and dynamic content updates.
+
+Outputs that depend only on the data and their control values are built by
+module-level functions backed by the shared figure cache, so the startup
+warm-up (utils.warmup) can prebuild exactly what the callbacks will serve.
+Outputs that depend on no control at all live in the section skeletons, and
+each user interaction maps to a single callback: highlights are sent as
+Patch updates instead of whole figures, and controls that drive each other
+(drought chart click -> year slider -> bubble chart) share one multi-output
+callback instead of chaining requests. Slow callbacks (zonal statistics,
+NDVI change maps) run as background jobs with progress and
+a cancel button when a background callback manager is configured (see
+utils.background).
 """
 
-from dash import Input, Output, State, ctx, exceptions
-import plotly.express as px
+import functools
+import re
+from dash import MATCH, Input, Output, Patch, State, ctx, exceptions, html, no_update
+import numpy as np
 import pandas as pd
 from components.dashboard_components import (
     create_historical_trends_section,
     create_vegetation_section,
-    create_correlations_section
+    create_correlations_section,
+    create_scenario_section,
+    create_veg_map_display,
+    INFO_PANEL_DEFAULT,
+    JOB_STATUS_STYLE,
+    SECTION_FIGURES,
+    fire_frame_url,
+    ndvi_change_url
 )
+from graphs.correlations import build_fire_bubble_chart
+from graphs.comparison import build_state_comparison_graph
+from graphs.scenario import build_scenario_histogram
+from maps.fire_stack import load_fire_stack
+from maps.ndvi import discover_rasters, ndvi_change_png
+from maps.reproject import warp_to_web_mercator
+from maps.zonal import zonal_stats
+from models.fire_risk import risk_label
+from models.scenario import quantize, run_scenario
+from utils.background import POLL_INTERVAL
+from utils.figure_cache import cached_output
+
+# Section skeleton builders for each tab id stored in 'active-tab'
+SECTION_BUILDERS = {
+    "trends": create_historical_trends_section,
+    "veg": create_vegetation_section,
+    "correlations": create_correlations_section,
+    "scenario": create_scenario_section,
+}
+
+
+def _as_year_range(value):
+    """Convert a RangeSlider value ([start, end] or None) to a (start, end) tuple."""
+    if not value or len(value) != 2:
+        return None
+    return (int(value[0]), int(value[1]))
+
+
+def render_section(data_manager, tab):
+    """
+    Build (or fetch from cache) the skeleton of one dashboard tab.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        tab: Tab identifier ('trends', 'veg', 'correlations' or 'scenario')
+        
+    Returns:
+        html.Div: The section content with empty 'section-graph' placeholders
+    """
+    build_section = SECTION_BUILDERS[tab]
+    return cached_output(f"section-{tab}", data_manager, (), lambda: build_section(data_manager))
+
+
+def build_section_figure(data_manager, name, year_range=None):
+    """
+    Build (or fetch from cache) one figure of a section skeleton.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        name: Key in SECTION_FIGURES
+        year_range: Optional inclusive (start_year, end_year) tuple
+        
+    Returns:
+        dict: The figure
+    """
+    build = SECTION_FIGURES[name]
+    return cached_output(f"figure-{name}", data_manager, (year_range,), lambda: build(data_manager, year_range))
+
+
+def build_bubble_outputs(data_manager, year_range=None):
+    """
+    Build (or fetch from cache) the California bubble chart and fire risk badge.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        year_range: Inclusive (start_year, end_year); (year, year) for a single slider year
+        
+    Returns:
+        tuple: (figure, risk_text)
+    """
+    def build():
+        # Sorted-index slice: a single year or the whole global range
+        filtered_df = data_manager.get_california_fire_data(year_range)
+        # The badge summarizes the risk levels precomputed per row at load time
+        return build_fire_bubble_chart(filtered_df), risk_label(filtered_df)
+    return cached_output("bubble-chart", data_manager, (year_range,), build)
+
 
+def background_options(prefix, background):
+    """
+    Dash callback options that run a slow callback as a background job.
+    
+    The job reports (value, max, status text) through set_progress into the
+    job_status(prefix) component, which is shown while the job runs and whose
+    button cancels it.
+    
+    Args:
+        prefix: Id prefix of the callback's job_status component
+        background: Whether a background callback manager is configured
+        
+    Returns:
+        dict: Keyword arguments for app.callback (empty when running inline)
+    """
+    if not background:
+        return {}
+    return {
+        'background': True,
+        'interval': POLL_INTERVAL,
+        'progress': [Output(f"{prefix}-progress", "value"),
+                     Output(f"{prefix}-progress", "max"),
+                     Output(f"{prefix}-status", "children")],
+        'progress_default': ["0", "1", ""],
+        'running': [(Output(f"{prefix}-job", "style"), JOB_STATUS_STYLE, {**JOB_STATUS_STYLE, 'display': 'none'})],
+        'cancel': [Input(f"{prefix}-cancel", "n_clicks")],
+    }
+
+
+def with_progress(background):
+    """Decorator giving a set_progress-taking callback a no-op set_progress when it runs inline."""
+    def decorate(callback):
+        if background:
+            return callback
+        return functools.wraps(callback)(lambda *args: callback(lambda _: None, *args))
+    return decorate
 
-def register_callbacks(app, data_manager):
+
+def timeline_highlight(data_manager, click_data):
+    """
+    Patch the fire severity timeline to highlight the year clicked in the bubble chart.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        click_data: clickData of 'bubble-chart-california' (customdata[0] is the year)
+        
+    Returns:
+        tuple: (Patch selecting the year's bubbles, info_text)
+    """
+    patch = Patch()
+    points = (click_data or {}).get('points') or []
+    if not points or not points[0].get('customdata'):
+        patch['data'][0]['selectedpoints'] = None
+        return patch, INFO_PANEL_DEFAULT
+    point = points[0]
+    year = int(point['customdata'][0])
+    # Timeline x values are the California fire rows in order, so positions index its points
+    years = data_manager.get_california_fire_data()['Year'].to_numpy()
+    patch['data'][0]['selectedpoints'] = np.flatnonzero(years == year).tolist()
+    info = (f"{year}: {point['marker.size']:,.0f} fires · NDVI {point['x']:.2f}"
+            f" · drought severity index {point['y']:.2f}")
+    return patch, info
+
+
+def build_veg_map_output(data_manager, year):
+    """Build (or fetch from cache) the satellite NDVI map display for a 'veg-map-year' option."""
+    return cached_output("veg-maps", data_manager, (year,), lambda: create_veg_map_display(year))
+
+
+def build_scenario_outputs(data_manager, drought_shift, ndvi_pct, year_range=None):
+    """
+    Build (or fetch from cache) the scenario chart and summary for quantized slider values.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        drought_shift: Change in drought severity index
+        ndvi_pct: Percentage change in NDVI
+        year_range: Optional inclusive (start_year, end_year) of historical years to resample
+        
+    Returns:
+        tuple: (figure, summary_text)
+    """
+    drought_shift, ndvi_pct = quantize(drought_shift, ndvi_pct)
+
+    def build():
+        result = run_scenario(data_manager, drought_shift, ndvi_pct, year_range)
+        if result is None:
+            return build_scenario_histogram(None), "No fire data available for this period."
+        baseline, scenario = result['baseline'], result['scenario']
+        change = 100.0 * (scenario['p50'] / baseline['p50'] - 1.0) if baseline['p50'] else 0.0
+        summary = (f"Median projected fires: {scenario['p50']:.0f} (baseline {baseline['p50']:.0f}, {change:+.0f}%)"
+                   f" · 90% range {scenario['p5']:.0f}–{scenario['p95']:.0f}")
+        return build_scenario_histogram(result), summary
+    return cached_output("scenario", data_manager, (drought_shift, ndvi_pct, year_range), build)
+
+
+def register_callbacks(app, data_manager, background=False):
     """
     Register all callback functions with the Dash application.
     
     Args:
         app: Dash application instance
         data_manager: DataManager instance containing all datasets
+        background: Run slow callbacks as background jobs (requires the app's background_callback_manager)
     """
     
     @app.callback(
@@ -31,11 +225,12 @@ def register_callbacks(app, data_manager):
             Input('btn-trends', 'n_clicks'),
             Input('btn-veg', 'n_clicks'),
             Input('btn-correlations', 'n_clicks'),
+            Input('btn-scenario', 'n_clicks'),
         ]
     )
-    def update_tab(trends, veg, correlations):
+    def update_tab(trends, veg, correlations, scenario):
         """
-        Callback triggered by clicks on tab buttons (trends, vegetation, correlations).
+        Callback triggered by clicks on tab buttons (trends, vegetation, correlations, scenario).
         Uses the triggered button's id to determine which tab to activate.
         Returns the active tab identifier as a string.
         """
@@ -45,133 +240,150 @@ def register_callbacks(app, data_manager):
 
     @app.callback(
         Output("tab-content", "children"),
-        Input("active-tab", "data")
+        [Input("active-tab", "data"),
+         Input("year-range", "value")]
     )
-    def render_tab(tab):
+    def render_tab(tab, year_range):
         """
-        Render the appropriate content based on the selected tab.
+        Render the skeleton of the selected tab.
+        
+        Re-rendering on a year-range change re-inserts the placeholder graphs,
+        which triggers their 'section-graph' callbacks with the new range.
         
         Args:
             tab: String identifier for the active tab
+            year_range: [start_year, end_year] from the global range slider
             
         Returns:
             html.Div: The content component for the selected tab
         """
-        if tab == "trends":
-            return create_historical_trends_section(data_manager)
-        elif tab == "veg":
-            return create_vegetation_section(data_manager)
-        elif tab == "correlations":
-            return create_correlations_section(data_manager)
+        if tab in SECTION_BUILDERS:
+            return render_section(data_manager, tab)
         return html.Div("Select a view above.")
 
-    # Callback for California-only bubble chart with year slider and reset button + Fire Risk Badge update
+    # One callback per placeholder graph: Dash requests them concurrently once the skeleton is in place
     @app.callback(
-        [Output("bubble-chart-california", "figure"),
+        Output({'type': 'section-graph', 'name': MATCH}, 'figure'),
+        Input({'type': 'section-graph', 'name': MATCH}, 'id'),
+        State("year-range", "value")
+    )
+    def fill_section_graph(graph_id, year_range):
+        """
+        Fill one placeholder graph of the rendered section.
+        
+        Args:
+            graph_id: Pattern-matching id of the graph ({'type': 'section-graph', 'name': ...})
+            year_range: [start_year, end_year] from the global range slider
+            
+        Returns:
+            dict: The figure, memoized per year range
+        """
+        return build_section_figure(data_manager, graph_id['name'], _as_year_range(year_range))
+
+    # Callback for the multi-state comparison chart
+    @app.callback(
+        Output("state-comparison-graph", "figure"),
+        [Input("state-selector", "value"),
+         Input("comparison-variable", "value")],
+        State("year-range", "value")
+    )
+    def update_state_comparison(states, variable, year_range):
+        """
+        Overlay the selected states' yearly series in one figure.
+        
+        Args:
+            states: List of selected state codes
+            variable: 'temperature' or 'precipitation'
+            year_range: [start_year, end_year] from the global range slider
+            
+        Returns:
+            dict: Comparison figure, memoized per sorted state selection
+        """
+        return build_state_comparison_graph(
+            data_manager, states or [], variable or 'temperature', _as_year_range(year_range)
+        )
+
+    # Callback for California-only bubble chart with year slider, reset button and drought chart clicks
+    # + Fire Risk Badge update: one request per interaction, the slider is only written on a drought click
+    @app.callback(
+        [Output("year-slider", "value"),
+         Output("bubble-chart-california", "figure"),
          Output("fire-risk-badge", "children")],
         [Input("year-slider", "value"),
-         Input("reset-year-btn", "n_clicks")]
+         Input("reset-year-btn", "n_clicks"),
+         Input({'type': 'section-graph', 'name': 'drought-line-chart'}, 'clickData')],
+        State("year-range", "value")
     )
-    def update_bubble_chart(year, reset_clicks):
+    def update_bubble_chart(year, reset_clicks, drought_click, year_range):
         """
-        Update the California bubble chart based on year selection and reset button.
+        Update the California bubble chart based on year selection, reset button and drought chart clicks.
         
         Args:
             year: Selected year from slider
             reset_clicks: Number of clicks on reset button
+            drought_click: Click data from the drought line chart; the clicked year moves the slider
+            year_range: [start_year, end_year] from the global range slider
             
         Returns:
-            tuple: (figure, risk_text) - Updated bubble chart and risk assessment
+            tuple: (slider_value, figure, risk_text) - Slider update and updated bubble chart and risk assessment
         """
-        color_metric = "FireCount"
-        ca_df = data_manager.get_california_fire_data()
-        
-        if ctx.triggered_id == "reset-year-btn":
-            filtered_df = ca_df
-        else:
-            filtered_df = ca_df[ca_df["Year"] == year] if year else ca_df
-
-        fig = px.scatter(
-            filtered_df,
-            x="NDVI",
-            y="DroughtSeverity",
-            size="FireCount",
-            color="FireCount",
-            color_continuous_scale=[
-                "#FFFFCC", "#FFEDA0", "#FED976", "#FEB24C", "#FD8D3C",
-                "#FC4E2A", "#E31A1C", "#BD0026", "#800026"
-            ],
-            hover_data=["Year", "State"],
-            title=None,
-            labels={
-                "NDVI": "NDVI (Vegetation Health)",
-                "DroughtSeverity": "Drought Severity Index",
-                "FireCount": "Fires Occurred",
-                "Temperature": "Temperature (°F)",
-                "FireCount": "Fires Occurred"
-            }
-        )
-        fig.update_layout(
-            margin=dict(l=40, r=40, t=40, b=40),
-            xaxis=dict(title='NDVI (Vegetation Health)', range=[0.2, 1.0]),
-            yaxis=dict(title='Drought Severity Index', range=[0, 4]),
-            title_font=dict(family="Arial, sans-serif", size=24, color="#000000"),
-            font=dict(family="Arial, sans-serif", color="#000000")
-        )
+        trigger = ctx.triggered_id
+        if trigger == "reset-year-btn":
+            return (no_update, *build_bubble_outputs(data_manager, _as_year_range(year_range)))
+        if isinstance(trigger, dict):
+            points = (drought_click or {}).get('points') or []
+            selected_year = points[0].get('x') if points else None
+            print("Drought chart clicked, selected year:", selected_year)
+            if not isinstance(selected_year, int):
+                raise exceptions.PreventUpdate
+            return (selected_year, *build_bubble_outputs(data_manager, (selected_year, selected_year)))
+        if not year:
+            return (no_update, *build_bubble_outputs(data_manager, _as_year_range(year_range)))
+        return (no_update, *build_bubble_outputs(data_manager, (year, year)))
 
-        # Fire Risk Badge logic
-        risk_text = ""
-        drought_mean = filtered_df["DroughtSeverity"].mean() if not filtered_df.empty else 0
-        ndvi_mean = filtered_df["NDVI"].mean() if not filtered_df.empty else 1
-        firecount_mean = filtered_df["FireCount"].mean() if not filtered_df.empty else 0
-
-        if (drought_mean > 2.5) and (ndvi_mean < 0.38) and (firecount_mean > 400):
-            risk_text = "🔥 High Risk"
-        elif (drought_mean > 1.5) and (ndvi_mean < 0.5) and (firecount_mean > 200):
-            risk_text = "⚠️ Moderate Risk"
-        else:
-            risk_text = "✅ Low Risk"
-
-        return fig, risk_text
-
-    # Callback for linked bubble timeline chart: always show full CA data, info panel static
+    # Callback highlighting the clicked bubble's year on the (static) fire severity timeline
     @app.callback(
         [Output("fire-severity-bubble", "figure"),
          Output("info-panel", "children")],
-        [Input("bubble-chart-california", "clickData")]
+        Input("bubble-chart-california", "clickData"),
+        prevent_initial_call=True
     )
-    def update_linked_line(_):
+    def update_linked_line(click_data):
         """
-        Update the fire severity bubble timeline chart.
+        Highlight the clicked year on the fire severity bubble timeline.
         
         Args:
-            _: Click data from bubble chart (unused)
+            click_data: Click data from bubble chart
             
         Returns:
-            tuple: (figure, info_text) - Updated timeline chart and info panel
+            tuple: (Patch of the timeline's selected points, info_text)
         """
-        df = data_manager.get_california_fire_data()
-        fig = px.scatter(
-            df,
-            x="Year",
-            y="DroughtSeverity",
-            size="FireCount",
-            color="NDVI",
-            color_continuous_scale="YlGn",
-            hover_data=["FireCount", "NDVI"],
-            labels={
-                "Year": "Year",
-                "DroughtSeverity": "Drought Index",
-                "FireCount": "Fires",
-                "NDVI": "NDVI (Vegetation Health)"
-            }
-        )
-        fig.update_layout(
-            margin=dict(l=40, r=40, t=40, b=40),
-            title_font=dict(family="Arial, sans-serif", size=22),
-            font=dict(family="Arial, sans-serif")
-        )
-        return fig, "Click on any bubble in the chart above to see detailed information."
+        return timeline_highlight(data_manager, click_data)
+
+    # Callback for the Monte Carlo fire scenario simulator. It stays inline: a
+    # memoized slider move takes tens of milliseconds, less than a background
+    # job's start and first poll, and job processes would not share the
+    # run_scenario memo
+    @app.callback(
+        [Output("scenario-histogram", "figure"),
+         Output("scenario-summary", "children")],
+        [Input("scenario-drought-shift", "value"),
+         Input("scenario-ndvi-pct", "value")],
+        State("year-range", "value")
+    )
+    def update_scenario(drought_shift, ndvi_pct, year_range):
+        """
+        Simulate projected fire counts for the selected drought and NDVI shifts.
+        
+        Args:
+            drought_shift: Change in drought severity index
+            ndvi_pct: Percentage change in NDVI
+            year_range: [start_year, end_year] from the global range slider
+            
+        Returns:
+            tuple: (figure, summary_text) - memoized per quantized slider position
+        """
+        return build_scenario_outputs(data_manager, drought_shift, ndvi_pct, _as_year_range(year_range))
 
     # Callback for Satellite Vegetation Comparison dropdown
     @app.callback(
@@ -188,155 +400,107 @@ def register_callbacks(app, data_manager):
         Returns:
             html.Div: Vegetation map display component
         """
-        from dash import html
-        
-        if year == "2001":
-            return html.Div([
-                # Accessible, text-based NDVI color legend
-                html.Div([
-                    html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
-                    html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
-                    html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
-                    html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
-                ], style={"marginBottom": "20px"}),
-                html.Div([
-                    html.H4("California (2001)", style={"textAlign": "center", "color": "#000000"}),
-                    html.Img(src="/static/2001_NVDI_CA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
-                    html.Pre("""// GEE NDVI for California (2001)
-var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
-  .filterDate("2001-01-01", "2001-12-31")
-  .select("NDVI")
-  .mean()
-  .clip(ee.FeatureCollection("TIGER/2018/States")
-         .filter(ee.Filter.eq("NAME", "California")));
-Map.centerObject(ndvi, 6);
-Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2001");""",
-                        style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ], style={"marginBottom": "20px"}),
-                html.Div([
-                    html.H4("Georgia (2001)", style={"textAlign": "center", "color": "#000000"}),
-                    html.Img(src="/static/2001_NVDI_GA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
-                    html.Pre("""// GEE NDVI for Georgia (2001)
-var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
-  .filterDate("2001-01-01", "2001-12-31")
-  .select("NDVI")
-  .mean()
-  .clip(ee.FeatureCollection("TIGER/2018/States")
-         .filter(ee.Filter.eq("NAME", "Georgia")));
-Map.centerObject(ndvi, 6);
-Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2001");""",
-                        style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ])
-            ])
-        elif year == "2022":
-            return html.Div([
-                # Accessible, text-based NDVI color legend
-                html.Div([
-                    html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
-                    html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
-                    html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
-                    html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
-                ], style={"marginBottom": "20px"}),
-                html.Div([
-                    html.H4("California (2022)", style={"textAlign": "center", "color": "#000000"}),
-                    html.Img(src="/static/2022_NVDI_CA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
-                    html.Pre("""// GEE NDVI for California (2022)
-var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
-  .filterDate("2022-01-01", "2022-12-31")
-  .select("NDVI")
-  .mean()
-  .clip(ee.FeatureCollection("TIGER/2018/States")
-         .filter(ee.Filter.eq("NAME", "California")));
-Map.centerObject(ndvi, 6);
-Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2022");""",
-                        style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ], style={"marginBottom": "20px"}),
-                html.Div([
-                    html.H4("Georgia (2022)", style={"textAlign": "center", "color": "#000000"}),
-                    html.Img(src="/static/2022_NVDI_GA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
-                    html.Pre("""// GEE NDVI for Georgia (2022)
-var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
-  .filterDate("2022-01-01", "2022-12-31")
-  .select("NDVI")
-  .mean()
-  .clip(ee.FeatureCollection("TIGER/2018/States")
-         .filter(ee.Filter.eq("NAME", "Georgia")));
-Map.centerObject(ndvi, 6);
-Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2022");""",
-                        style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ])
-            ])
-        else:  # Comparison view
-            return html.Div([
-                # Accessible, text-based NDVI color legend
-                html.Div([
-                    html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
-                    html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
-                    html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
-                    html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
-                ], style={"marginBottom": "20px"}),
-                html.Div([
-                    html.H4("California: 2001 vs 2022", style={"textAlign": "center", "color": "#000000"}),
-                    html.Div([
-                        html.Div([
-                            html.Img(
-                                src="/static/2001_NVDI_CA_Map.png",
-                                style={"width": "100%", "borderRadius": "12px", "height": "350px"}
-                            ),
-                        ], style={"width": "49%", "marginRight": "2%"}),
-                        html.Div([
-                            html.Img(
-                                src="/static/2022_NVDI_CA_Map.png",
-                                style={"width": "100%", "borderRadius": "12px", "height": "350px"}
-                            ),
-                        ], style={"width": "49%"})
-                    ], style={"display": "flex", "justifyContent": "space-between", "marginBottom": "20px"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ]),
-                html.Div([
-                    html.H4("Georgia: 2001 vs 2022", style={"textAlign": "center", "color": "#000000"}),
-                    html.Div([
-                        html.Div([
-                            html.Img(
-                                src="/static/2001_NVDI_GA_Map.png",
-                                style={"width": "100%", "borderRadius": "12px", "height": "350px"}
-                            ),
-                        ], style={"width": "49%", "marginRight": "2%"}),
-                        html.Div([
-                            html.Img(
-                                src="/static/2022_NVDI_GA_Map.png",
-                                style={"width": "100%", "borderRadius": "12px", "height": "350px"}
-                            ),
-                        ], style={"width": "49%"})
-                    ], style={"display": "flex", "justifyContent": "space-between"}),
-                    html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
-                ])
-            ])
-
-    # Callback to update year-slider value from drought-line-chart click
+        return build_veg_map_output(data_manager, year)
+
+    # Callback for the fire-frequency map's time slider
     @app.callback(
-        Output('year-slider', 'value'),
-        Input('drought-line-chart', 'clickData'),
+        Output("fire-frequency-overlay", "url"),
+        Input("fire-map-year", "value"),
         prevent_initial_call=True
     )
-    def update_year_from_drought_chart(clickData):
+    def update_fire_map_year(year):
+        """
+        Point the map overlay at the selected year's fire frame.
+        
+        Args:
+            year: Selected year from the 'fire-map-year' slider
+            
+        Returns:
+            str: Versioned URL of the year's PNG overlay
+        """
+        stack = load_fire_stack()
+        if stack is None or year not in stack.years:
+            raise exceptions.PreventUpdate
+        return fire_frame_url(stack, year)
+
+    # Callback for zonal statistics of polygons drawn on the fire-frequency map
+    @app.callback(
+        Output("fire-zonal-stats", "children"),
+        Input("fire-map-draw", "geojson"),
+        State("fire-frequency-overlay", "url"),
+        prevent_initial_call=True,
+        **background_options("fire-zonal", background)
+    )
+    @with_progress(background)
+    def update_fire_zonal_stats(set_progress, geojson, overlay_url):
+        """
+        Summarize fire frequency inside the most recently drawn polygon.
+        
+        Args:
+            set_progress: Reports (value, max, status text) of the background job
+            geojson: FeatureCollection of the shapes drawn on the map
+            overlay_url: Current overlay URL; a per-year frame selects that year of the fire stack
+            
+        Returns:
+            str: Statistics of the polygon, cached by geometry hash
+        """
+        features = [f for f in (geojson or {}).get('features', [])
+                    if (f.get('geometry') or {}).get('type') in ('Polygon', 'MultiPolygon')]
+        if not features:
+            return "Draw a polygon or rectangle on the map to summarize fire frequency inside it."
+        match = re.search(r'/fire/(\d{4})\.png', overlay_url or '')
+        year = int(match.group(1)) if match else None
+        set_progress(("0", "1", "Summarizing the shape…"))
+        try:
+            stats = zonal_stats(features[-1], year=year)
+        except (LookupError, ValueError) as e:
+            return f"Could not summarize this shape: {e}"
+        if stats['cells'] == 0:
+            return "The drawn shape does not overlap the fire-frequency raster."
+        period = str(year) if year else "2001–2022"
+        if stats['count'] == 0:
+            return f"No fires inside the drawn shape ({stats['cells']:,} cells, {period})."
+        return (f"{period}: {stats['count']:,} of {stats['cells']:,} cells burned ({stats['burned_fraction']:.1%})"
+                f" · mean frequency {stats['mean']:.2f} · max {stats['max']}")
+
+    # Callback for the computed NDVI change map (shown when NDVI rasters are ingested)
+    @app.callback(
+        [Output("ndvi-change-overlay", "url"),
+         Output("ndvi-change-overlay", "bounds"),
+         Output("ndvi-change-caption", "children")],
+        [Input("ndvi-change-state", "value"),
+         Input("ndvi-change-from", "value"),
+         Input("ndvi-change-to", "value")],
+        prevent_initial_call=True,
+        **background_options("ndvi-change", background)
+    )
+    @with_progress(background)
+    def update_ndvi_change(set_progress, state, year_from, year_to):
         """
-        Update the year slider when a point is clicked on the drought line chart.
+        Show the NDVI difference between two years for one state.
         
         Args:
-            clickData: Click data from the drought line chart
+            set_progress: Reports (value, max, status text) of the background job
+            state: State code
+            year_from: Earlier year
+            year_to: Later year
             
         Returns:
-            int: Selected year from the clicked point
+            tuple: (overlay URL, overlay bounds, caption)
         """
-        print("Drought chart clicked:", clickData)
-        if clickData and 'points' in clickData and clickData['points']:
-            selected_year = clickData['points'][0]['x']
-            print("Selected year:", selected_year)
-            if isinstance(selected_year, int):
-                return selected_year
-        raise exceptions.PreventUpdate
\ No newline at end of file
+        if year_from == year_to:
+            raise exceptions.PreventUpdate
+        # Reprojections are cached on disk, so warping first only splits the work into reportable steps
+        rasters = discover_rasters()
+        try:
+            for step, year in enumerate((year_from, year_to)):
+                if (state, 'NDVI', year) in rasters:
+                    set_progress((str(step), "3", f"Reprojecting {year}…"))
+                    warp_to_web_mercator(rasters[(state, 'NDVI', year)], 'continuous')
+            set_progress(("2", "3", "Computing the NDVI difference…"))
+            _, bounds = ndvi_change_png(state, year_from, year_to)
+        except (LookupError, ValueError) as e:
+            return no_update, no_update, f"Cannot compare these years: {e}"
+        caption = (f"NDVI change {year_from}–{year_to}: 🟫 brown = vegetation loss, ⬜ white = no change, "
+                   f"🟩 green = gain (saturates at ±0.3).")
+        return ndvi_change_url(state, year_from, year_to), bounds, caption
@@ -3,19 +3,111 @@ Dashboard content components for the wildfire climate change visualization.
 
 This module contains all the HTML/Dash components for different dashboard sections,
 including historical trends, vegetation indices, and climate correlations.
+
+Sections are lightweight skeletons: every figure is an empty placeholder graph
+(see section_graph and SECTION_FIGURES) filled by its own callback, so a tab
+appears immediately and its charts arrive as they are built. Figures that do
+not depend on any control (the fire severity timeline) are embedded in the
+skeleton itself, which is built once per dataset version.
 """
 
 from dash import html, dcc
+import dash_leaflet as dl
 import pandas as pd
 from graphs.temperature import build_georgia_temperature_graph, build_california_temperature_graph
 from graphs.precipitation import build_georgia_precip_graph, build_california_precip_graph
 from graphs.vegetation import build_ndvi_graph, build_evi_graph
-from graphs.correlations import build_correlation_heatmap, build_drought_line_graph, build_drought_heatmap
+from graphs.correlations import (
+    build_correlation_heatmap,
+    build_drought_line_graph,
+    build_drought_heatmap,
+    build_fire_severity_timeline
+)
+from maps.fire_stack import load_fire_stack
+from maps.ndvi import available_years, ndvi_change_png
+from maps.wildfire_map import cumulative_overlay
+
+# Options of the satellite NDVI map dropdown ('veg-map-year')
+VEG_MAP_YEAR_OPTIONS = [
+    {'label': '2001', 'value': '2001'},
+    {'label': '2022', 'value': '2022'},
+    {'label': 'Comparison', 'value': 'compare'}
+]
+
+# Years selectable on the California bubble chart slider ('year-slider')
+FIRE_SLIDER_YEARS = range(2001, 2023)
+
+# Text of the 'info-panel' below the bubble chart before any bubble is clicked
+INFO_PANEL_DEFAULT = "Click on any bubble in the chart above to see detailed information."
+
+# Style of a job_status component while its background job runs (hidden otherwise)
+JOB_STATUS_STYLE = {'textAlign': 'center', 'marginTop': '8px'}
+
+# Defaults of the scenario sliders ('scenario-drought-shift', 'scenario-ndvi-pct')
+SCENARIO_DEFAULTS = (1.0, -10)
+
+# Figures of the section skeletons, each filled by its own 'section-graph' callback:
+# name -> build(data_manager, year_range)
+SECTION_FIGURES = {
+    'ga-temperature': lambda dm, yr: build_georgia_temperature_graph(dm.get_ga_temperature(yr)),
+    'ca-temperature': lambda dm, yr: build_california_temperature_graph(dm.get_ca_temperature(yr)),
+    'ga-precipitation': lambda dm, yr: build_georgia_precip_graph(dm.get_ga_precipitation(yr)),
+    'ca-precipitation': lambda dm, yr: build_california_precip_graph(dm.get_ca_precipitation(yr)),
+    'ndvi': lambda dm, yr: build_ndvi_graph(dm.get_vegetation_data(yr)),
+    'evi': lambda dm, yr: build_evi_graph(dm.get_vegetation_data(yr)),
+    'drought-line-chart': lambda dm, yr: build_drought_line_graph(dm.get_drought_data(yr)),
+    'drought-heatmap': lambda dm, yr: build_drought_heatmap(dm.get_drought_data(yr)),
+    'correlation-heatmap': lambda dm, yr: build_correlation_heatmap(dm.get_fire_model_data(yr)),
+}
+
+
+def section_graph(name) -> dcc.Graph:
+    """
+    Create an empty placeholder graph for one of SECTION_FIGURES.
+    
+    Args:
+        name: Key in SECTION_FIGURES
+        
+    Returns:
+        dcc.Graph: Graph with a pattern-matching id, filled by its own callback
+    """
+    return dcc.Graph(id={'type': 'section-graph', 'name': name}, config={'displayModeBar': False})
+
+
+def job_status(prefix) -> html.Div:
+    """
+    Create the progress bar, status line and cancel button of a background callback.
+    
+    Hidden until the callback's job runs (see components.callbacks.register_callbacks).
+    
+    Args:
+        prefix: Id prefix; the children are '<prefix>-progress', '<prefix>-status' and '<prefix>-cancel'
+        
+    Returns:
+        html.Div: Job status component with id '<prefix>-job'
+    """
+    return html.Div([
+        html.Progress(id=f'{prefix}-progress', value='0', max='1', style={'width': '50%', 'verticalAlign': 'middle'}),
+        html.Span(id=f'{prefix}-status', style={'margin': '0 10px', 'fontSize': '14px', 'color': '#333'}),
+        html.Button(
+            "Cancel",
+            id=f'{prefix}-cancel',
+            n_clicks=0,
+            style={
+                'backgroundColor': '#e0e0e0',
+                'color': '#222',
+                'fontFamily': 'Arial, sans-serif',
+                'borderRadius': '8px',
+                'border': '1px solid #bbb',
+                'padding': '2px 12px'
+            }
+        ),
+    ], id=f'{prefix}-job', style={**JOB_STATUS_STYLE, 'display': 'none'})
 
 
 def create_historical_trends_section(data_manager) -> html.Div:
     """
-    Create the historical trends section with temperature and precipitation graphs.
+    Create the skeleton of the historical trends section with temperature and precipitation graphs.
     
     Args:
         data_manager: DataManager instance containing all datasets
@@ -23,10 +115,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
     Returns:
         html.Div: Historical trends section component
     """
-    df_ga = data_manager.get_ga_temperature()
-    df_ca = data_manager.get_ca_temperature()
-    df_ga_precip = data_manager.get_ga_precipitation()
-    df_ca_precip = data_manager.get_ca_precipitation()
+    state_codes = data_manager.get_state_codes()
     
     return html.Div([
         html.Div([
@@ -41,7 +130,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
             html.H3("Georgia Temperature", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_georgia_temperature_graph(df_ga), config={'displayModeBar': False}),
+                    section_graph('ga-temperature'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -60,7 +149,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
             html.H3("California Temperature", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_california_temperature_graph(df_ca), config={'displayModeBar': False}),
+                    section_graph('ca-temperature'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -79,7 +168,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
             html.H3("Georgia Precipitation", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_georgia_precip_graph(df_ga_precip), config={'displayModeBar': False}),
+                    section_graph('ga-precipitation'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -98,7 +187,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
             html.H3("California Precipitation", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_california_precip_graph(df_ca_precip), config={'displayModeBar': False}),
+                    section_graph('ca-precipitation'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -113,6 +202,47 @@ def create_historical_trends_section(data_manager) -> html.Div:
                    style={"display": "block", "textAlign": "center", "marginBottom": "20px", "fontSize": "14px", "color": "#1a73e8"})
         ], className="graph-card"),
 
+        # Multi-state comparison block
+        html.Div([
+            html.H3("State Comparison", className="graph-title"),
+            dcc.Dropdown(
+                id="state-selector",
+                options=[
+                    {'label': data_manager.get_state_name(code), 'value': code}
+                    for code in state_codes
+                ],
+                value=state_codes,
+                multi=True,
+                style={'width': '400px', 'margin': '0 auto 10px', 'color': '#000000'}
+            ),
+            dcc.RadioItems(
+                id="comparison-variable",
+                options=[
+                    {'label': ' Temperature', 'value': 'temperature'},
+                    {'label': ' Precipitation', 'value': 'precipitation'}
+                ],
+                value='temperature',
+                inline=True,
+                style={'textAlign': 'center', 'marginBottom': '10px', 'color': '#000000'},
+                inputStyle={'marginLeft': '15px'}
+            ),
+            dcc.Loading(
+                html.Div(
+                    dcc.Graph(id="state-comparison-graph", config={'displayModeBar': False}),
+                    className="graph-container"
+                ),
+                type="circle"
+            ),
+            html.P(
+                "Overlay the yearly average temperature or precipitation of any combination of states to compare their long-term trends.",
+                className="graph-subtitle"
+            ),
+            html.A("View dataset (NOAA Climate Data)", 
+                   href="https://www.ncei.noaa.gov/access/monitoring/climate-at-a-glance/statewide/time-series", 
+                   target="_blank", 
+                   style={"display": "block", "textAlign": "center", "marginBottom": "20px", "fontSize": "14px", "color": "#1a73e8"})
+        ], className="graph-card"),
+
         # Navigation back to top
         html.Div([
             html.A("↑ Back to Top", href="#", style={
@@ -131,7 +261,7 @@ def create_historical_trends_section(data_manager) -> html.Div:
 
 def create_vegetation_section(data_manager) -> html.Div:
     """
-    Create the vegetation indices section with NDVI and EVI graphs.
+    Create the skeleton of the vegetation indices section with NDVI and EVI graphs.
     
     Args:
         data_manager: DataManager instance containing all datasets
@@ -139,8 +269,6 @@ def create_vegetation_section(data_manager) -> html.Div:
     Returns:
         html.Div: Vegetation indices section component
     """
-    veg_df = data_manager.get_vegetation_data()
-    
     return html.Div([
         html.Div([
             html.H2("🌿 Vegetation Indices", className="graph-title"),
@@ -154,7 +282,7 @@ def create_vegetation_section(data_manager) -> html.Div:
             html.H3("NDVI Line Chart", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_ndvi_graph(veg_df), config={'displayModeBar': False}),
+                    section_graph('ndvi'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -173,7 +301,7 @@ def create_vegetation_section(data_manager) -> html.Div:
             html.H3("EVI Line Chart", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_evi_graph(veg_df), config={'displayModeBar': False}),
+                    section_graph('evi'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -193,11 +321,7 @@ def create_vegetation_section(data_manager) -> html.Div:
             html.H3("Satellite Vegetation Comparison", className="graph-title"),
             dcc.Dropdown(
                 id="veg-map-year",
-                options=[
-                    {'label': '2001', 'value': '2001'},
-                    {'label': '2022', 'value': '2022'},
-                    {'label': 'Comparison', 'value': 'compare'}
-                ],
+                options=VEG_MAP_YEAR_OPTIONS,
                 value='2001',
                 clearable=False,
                 style={'width': '300px', 'margin': '0 auto 20px', 'color': '#000000'}
@@ -223,7 +347,7 @@ def create_vegetation_section(data_manager) -> html.Div:
 
 def create_correlations_section(data_manager) -> html.Div:
     """
-    Create the climate correlations section with various correlation visualizations.
+    Create the skeleton of the climate correlations section with various correlation visualizations.
     
     Args:
         data_manager: DataManager instance containing all datasets
@@ -231,9 +355,6 @@ def create_correlations_section(data_manager) -> html.Div:
     Returns:
         html.Div: Climate correlations section component
     """
-    drought_df = data_manager.get_drought_data()
-    ml_df = data_manager.get_fire_model_data()
-    
     return html.Div([
         html.Div([
             html.H2("📈 Climate Correlations", className="graph-title"),
@@ -247,11 +368,7 @@ def create_correlations_section(data_manager) -> html.Div:
             html.H3("Drought Severity Over Time (GA vs CA)", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(
-                        id='drought-line-chart',
-                        figure=build_drought_line_graph(drought_df),
-                        config={'displayModeBar': False}
-                    ),
+                    section_graph('drought-line-chart'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -271,11 +388,11 @@ def create_correlations_section(data_manager) -> html.Div:
             html.H3("NDVI, Drought, and Fires (California Only)", className="graph-title"),
             dcc.Slider(
                 id='year-slider',
-                min=2001,
-                max=2022,
+                min=FIRE_SLIDER_YEARS[0],
+                max=FIRE_SLIDER_YEARS[-1],
                 step=1,
                 value=2010,
-                marks={year: str(year) for year in range(2001, 2023)},
+                marks={year: str(year) for year in FIRE_SLIDER_YEARS},
             ),
             html.Button(
                 "Show All Years",
@@ -310,14 +427,14 @@ def create_correlations_section(data_manager) -> html.Div:
                    href="https://data.ca.gov/dataset/california-fire-perimeters-all/resource/b7dd3a39-2163-4a68-9c1a-98ef25d13147", 
                    target="_blank", 
                    style={"display": "block", "textAlign": "center", "marginBottom": "20px", "fontSize": "14px", "color": "#1a73e8"}),
-            html.Div(id='info-panel', style={'textAlign': 'center', 'marginTop': '10px', 'fontSize': '14px', 'color': '#333'})
+            html.Div(INFO_PANEL_DEFAULT, id='info-panel', style={'textAlign': 'center', 'marginTop': '10px', 'fontSize': '14px', 'color': '#333'})
         ], className="graph-card"),
 
         html.Div([
             html.H3("Drought Severity Heatmap", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_drought_heatmap(drought_df), config={'displayModeBar': False}),
+                    section_graph('drought-heatmap'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -336,7 +453,7 @@ def create_correlations_section(data_manager) -> html.Div:
             html.H3("Climate Feature Correlation Matrix", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(figure=build_correlation_heatmap(ml_df), config={'displayModeBar': False}),
+                    section_graph('correlation-heatmap'),
                     className="graph-container"
                 ),
                 type="circle"
@@ -355,7 +472,12 @@ def create_correlations_section(data_manager) -> html.Div:
             html.H3("Fire Severity Bubble Timeline (California)", className="graph-title"),
             dcc.Loading(
                 html.Div(
-                    dcc.Graph(id='fire-severity-bubble', config={'displayModeBar': False}),
+                    # Independent of every control: built with the skeleton, highlighted by Patch on bubble clicks
+                    dcc.Graph(
+                        id='fire-severity-bubble',
+                        figure=build_fire_severity_timeline(data_manager.get_california_fire_data()),
+                        config={'displayModeBar': False}
+                    ),
                     className="graph-container"
                 ),
                 type="circle"
@@ -372,19 +494,9 @@ def create_correlations_section(data_manager) -> html.Div:
 
         html.Div([
             html.H3("California Wildfire Frequency Map (2001–2022)", className="graph-title"),
-            html.Iframe(
-                srcDoc=open("assets/california_fire_map.html", "r").read(),
-                width="100%",
-                height="600",
-                style={
-                    'border': 'none',
-                    'borderRadius': '12px',
-                    'marginTop': '20px',
-                    'boxShadow': '0 4px 16px rgba(0,0,0,0.08)'
-                }
-            ),
+            create_fire_frequency_map(),
             html.P(
-                "This interactive map shows cumulative wildfire frequency in California from 2001 to 2022.",
+                "This interactive map shows wildfire frequency in California from 2001 to 2022.",
                 style={
                     'textAlign': 'center',
                     'fontFamily': 'Arial, sans-serif',
@@ -458,4 +570,309 @@ Map.addLayer(burned, {min: 0, max: 366, palette: ['ffffff', 'ff0000']}, "Burned
                 "fontWeight": "bold"
             })
         ])
-    ], className="section-light") 
\ No newline at end of file
+    ], className="section-light")
+
+
+def create_scenario_section(data_manager) -> html.Div:
+    """
+    Create the fire scenario simulator section.
+    
+    Users shift drought severity and NDVI and see the distribution of projected
+    California fire counts from a Monte Carlo simulation (models.scenario).
+    The chart itself is filled in by the scenario callback.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        
+    Returns:
+        html.Div: Fire scenario section component
+    """
+    drought_default, ndvi_default = SCENARIO_DEFAULTS
+    return html.Div([
+        html.Div([
+            html.H2("🎲 Fire Scenarios", className="graph-title"),
+            html.P(
+                "What if droughts got worse or vegetation thinned out? Shift drought severity and NDVI to see how the distribution of projected yearly fire counts in California changes.",
+                className="graph-subtitle"
+            ),
+        ], style={"marginBottom": "10px", "marginTop": "-70px"}),
+
+        html.Div([
+            html.H3("Projected Fires Under a What-If Scenario", className="graph-title"),
+            html.Label("Drought severity change (index points)", style={'fontWeight': 'bold', 'color': '#000000'}),
+            dcc.Slider(
+                id='scenario-drought-shift',
+                min=-2,
+                max=2,
+                step=0.1,
+                value=drought_default,
+                marks={v: f"{v:+g}" for v in (-2, -1.5, -1, -0.5, 0, 0.5, 1, 1.5, 2)},
+            ),
+            html.Label("NDVI change (%)", style={'fontWeight': 'bold', 'color': '#000000'}),
+            dcc.Slider(
+                id='scenario-ndvi-pct',
+                min=-30,
+                max=30,
+                step=1,
+                value=ndvi_default,
+                marks={v: f"{v:+d}%" for v in range(-30, 31, 10)},
+            ),
+            html.Div(id='scenario-summary',
+                     style={'textAlign': 'center', 'fontSize': '18px', 'marginTop': '10px', 'fontWeight': 'bold', 'color': '#d62728'}),
+            dcc.Loading(
+                html.Div(
+                    dcc.Graph(id='scenario-histogram', config={'displayModeBar': False}),
+                    className="graph-container"
+                ),
+                type="circle"
+            ),
+            html.P(
+                "Each scenario draws 100,000 simulated years: historical California drought and NDVI values are resampled with the chosen shifts applied, then passed through a log-linear fire-count model fitted to the 2001–2020 fire data, including its coefficient uncertainty and year-to-year noise. Grey bars show the unchanged baseline; dashed lines mark the medians.",
+                className="graph-subtitle"
+            ),
+        ], className="graph-card"),
+    ], className="section-light")
+
+def create_veg_map_display(year) -> html.Div:
+    """
+    Create the satellite NDVI map display for the selected year.
+    
+    Args:
+        year: Selected year ('2001', '2022', or 'compare')
+        
+    Returns:
+        html.Div: NDVI colour key followed by the California and Georgia maps
+    """
+    if year == "compare" and ndvi_change_states():
+        # Computed change map from ingested NDVI rasters replaces the screenshot pair
+        return create_ndvi_change_display()
+    if year == "2001":
+        return html.Div([
+            # Accessible, text-based NDVI color legend
+            html.Div([
+                html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
+                html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
+                html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
+                html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
+            ], style={"marginBottom": "20px"}),
+            html.Div([
+                html.H4("California (2001)", style={"textAlign": "center", "color": "#000000"}),
+                html.Img(src="/static/2001_NVDI_CA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
+                html.Pre("""// GEE NDVI for California (2001)
+var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
+  .filterDate("2001-01-01", "2001-12-31")
+  .select("NDVI")
+  .mean()
+  .clip(ee.FeatureCollection("TIGER/2018/States")
+         .filter(ee.Filter.eq("NAME", "California")));
+Map.centerObject(ndvi, 6);
+Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2001");""",
+                    style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ], style={"marginBottom": "20px"}),
+            html.Div([
+                html.H4("Georgia (2001)", style={"textAlign": "center", "color": "#000000"}),
+                html.Img(src="/static/2001_NVDI_GA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
+                html.Pre("""// GEE NDVI for Georgia (2001)
+var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
+  .filterDate("2001-01-01", "2001-12-31")
+  .select("NDVI")
+  .mean()
+  .clip(ee.FeatureCollection("TIGER/2018/States")
+         .filter(ee.Filter.eq("NAME", "Georgia")));
+Map.centerObject(ndvi, 6);
+Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2001");""",
+                    style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ])
+        ])
+    elif year == "2022":
+        return html.Div([
+            # Accessible, text-based NDVI color legend
+            html.Div([
+                html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
+                html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
+                html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
+                html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
+            ], style={"marginBottom": "20px"}),
+            html.Div([
+                html.H4("California (2022)", style={"textAlign": "center", "color": "#000000"}),
+                html.Img(src="/static/2022_NVDI_CA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
+                html.Pre("""// GEE NDVI for California (2022)
+var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
+  .filterDate("2022-01-01", "2022-12-31")
+  .select("NDVI")
+  .mean()
+  .clip(ee.FeatureCollection("TIGER/2018/States")
+         .filter(ee.Filter.eq("NAME", "California")));
+Map.centerObject(ndvi, 6);
+Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2022");""",
+                    style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ], style={"marginBottom": "20px"}),
+            html.Div([
+                html.H4("Georgia (2022)", style={"textAlign": "center", "color": "#000000"}),
+                html.Img(src="/static/2022_NVDI_GA_Map.png", style={"width": "100%", "borderRadius": "12px"}),
+                html.Pre("""// GEE NDVI for Georgia (2022)
+var ndvi = ee.ImageCollection("MODIS/006/MOD13A2")
+  .filterDate("2022-01-01", "2022-12-31")
+  .select("NDVI")
+  .mean()
+  .clip(ee.FeatureCollection("TIGER/2018/States")
+         .filter(ee.Filter.eq("NAME", "Georgia")));
+Map.centerObject(ndvi, 6);
+Map.addLayer(ndvi, {min: 0, max: 8000, palette: ['ffffff', 'ffff00', '00aa00']}, "NDVI 2022");""",
+                    style={"backgroundColor": "#f4f4f4", "padding": "10px", "borderRadius": "8px", "fontSize": "13px", "overflowX": "auto", "color": "#000000"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ])
+        ])
+    else:  # Comparison view
+        return html.Div([
+            # Accessible, text-based NDVI color legend
+            html.Div([
+                html.H4("NDVI Color Key", style={"textAlign": "center", "color": "#000000", "marginBottom": "10px"}),
+                html.P("🟩 Green: Healthy/Dense Vegetation (NDVI > 0.6)", style={"textAlign": "center", "margin": "2px", "color": "#006400"}),
+                html.P("🟨 Yellow: Moderate Vegetation (NDVI ≈ 0.4–0.6)", style={"textAlign": "center", "margin": "2px", "color": "#DAA520"}),
+                html.P("⬜ White: Low or No Vegetation (NDVI < 0.2)", style={"textAlign": "center", "margin": "2px", "color": "#555555"}),
+            ], style={"marginBottom": "20px"}),
+            html.Div([
+                html.H4("California: 2001 vs 2022", style={"textAlign": "center", "color": "#000000"}),
+                html.Div([
+                    html.Div([
+                        html.Img(
+                            src="/static/2001_NVDI_CA_Map.png",
+                            style={"width": "100%", "borderRadius": "12px", "height": "350px"}
+                        ),
+                    ], style={"width": "49%", "marginRight": "2%"}),
+                    html.Div([
+                        html.Img(
+                            src="/static/2022_NVDI_CA_Map.png",
+                            style={"width": "100%", "borderRadius": "12px", "height": "350px"}
+                        ),
+                    ], style={"width": "49%"})
+                ], style={"display": "flex", "justifyContent": "space-between", "marginBottom": "20px"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ]),
+            html.Div([
+                html.H4("Georgia: 2001 vs 2022", style={"textAlign": "center", "color": "#000000"}),
+                html.Div([
+                    html.Div([
+                        html.Img(
+                            src="/static/2001_NVDI_GA_Map.png",
+                            style={"width": "100%", "borderRadius": "12px", "height": "350px"}
+                        ),
+                    ], style={"width": "49%", "marginRight": "2%"}),
+                    html.Div([
+                        html.Img(
+                            src="/static/2022_NVDI_GA_Map.png",
+                            style={"width": "100%", "borderRadius": "12px", "height": "350px"}
+                        ),
+                    ], style={"width": "49%"})
+                ], style={"display": "flex", "justifyContent": "space-between"}),
+                html.A("View dataset (MODIS Vegetation NDVI)", href="https://lpdaac.usgs.gov/products/mod13a2v006/", target="_blank", style={"display": "block", "textAlign": "center", "marginBottom": "10px", "fontSize": "13px", "color": "#1a73e8"})
+            ])
+        ])
+
+
+def fire_frame_url(stack, year) -> str:
+    """URL of one year's fire overlay, versioned by the stack's content hash."""
+    return f"/api/raster/fire/{year}.png?v={stack.tag[:12]}"
+
+
+def create_fire_frequency_map() -> html.Div:
+    """
+    Create the California fire-frequency map.
+    
+    A Leaflet map with the cumulative 2001–2022 overlay, or, with an ingested
+    per-year fire stack (see maps.fire_stack), the overlay of the year picked
+    on the 'fire-map-year' slider. Polygons drawn with the map's draw tool are
+    summarized in 'fire-zonal-stats'.
+    
+    Returns:
+        html.Div: Fire-frequency map component
+    """
+    stack = load_fire_stack()
+    if stack is None:
+        url, bounds = cumulative_overlay()
+    else:
+        url, bounds = fire_frame_url(stack, stack.years[-1]), stack.bounds
+    children = [
+        dl.Map([
+            dl.TileLayer(),
+            dl.ImageOverlay(id='fire-frequency-overlay', url=url, bounds=bounds, opacity=0.7),
+            dl.FeatureGroup(dl.EditControl(
+                id='fire-map-draw',
+                position='topleft',
+                draw={'polygon': True, 'rectangle': True, 'polyline': False,
+                      'circle': False, 'circlemarker': False, 'marker': False}
+            ))
+        ], center=[37.3, -119.3], zoom=6, style={
+            'height': '600px',
+            'borderRadius': '12px',
+            'marginTop': '20px',
+            'boxShadow': '0 4px 16px rgba(0,0,0,0.08)'
+        })
+    ]
+    if stack is not None:
+        years = stack.years
+        children.append(dcc.Slider(
+            id='fire-map-year',
+            min=years[0],
+            max=years[-1],
+            step=1,
+            value=years[-1],
+            marks={str(year): str(year) for year in years[::3] + [years[-1]]},
+            tooltip={"placement": "bottom", "always_visible": False}
+        ))
+    children.append(html.Div(
+        "Draw a polygon or rectangle on the map to summarize fire frequency inside it.",
+        id='fire-zonal-stats',
+        style={'textAlign': 'center', 'marginTop': '10px', 'fontSize': '14px', 'color': '#333'}
+    ))
+    children.append(job_status('fire-zonal'))
+    return html.Div(children)
+
+
+def ndvi_change_states() -> list:
+    """State codes with NDVI rasters for at least two years (see maps.ndvi)."""
+    return sorted(state for state, years in available_years().items() if len(years) >= 2)
+
+
+def ndvi_change_url(state, year_from, year_to) -> str:
+    """URL of the computed NDVI change overlay between two years."""
+    return f"/api/raster/ndvi/{state}/{year_from}/{year_to}.png"
+
+
+def create_ndvi_change_display() -> html.Div:
+    """
+    Create the computed NDVI change map for any two years with NDVI rasters.
+    
+    Returns:
+        html.Div: State and year pickers above a Leaflet map of the NDVI difference
+    """
+    years_by_state = available_years()
+    state = ndvi_change_states()[0]
+    years = years_by_state[state]
+    all_years = sorted({y for values in years_by_state.values() for y in values})
+    _, bounds = ndvi_change_png(state, years[0], years[-1])
+    dropdown_style = {'width': '160px', 'color': '#000000'}
+    return html.Div([
+        html.Div([
+            dcc.Dropdown(id='ndvi-change-state', options=ndvi_change_states(), value=state,
+                         clearable=False, style=dropdown_style),
+            dcc.Dropdown(id='ndvi-change-from', options=all_years, value=years[0],
+                         clearable=False, style=dropdown_style),
+            dcc.Dropdown(id='ndvi-change-to', options=all_years, value=years[-1],
+                         clearable=False, style=dropdown_style),
+        ], style={'display': 'flex', 'gap': '10px', 'justifyContent': 'center', 'marginBottom': '10px'}),
+        dl.Map([
+            dl.TileLayer(),
+            dl.ImageOverlay(id='ndvi-change-overlay', url=ndvi_change_url(state, years[0], years[-1]),
+                            bounds=bounds, opacity=0.8)
+        ], bounds=bounds, style={'height': '500px', 'borderRadius': '12px'}),
+        html.P(f"NDVI change {years[0]}–{years[-1]}: 🟫 brown = vegetation loss, ⬜ white = no change, "
+               f"🟩 green = gain (saturates at ±0.3).",
+               id='ndvi-change-caption',
+               style={"textAlign": "center", "marginTop": "10px", "color": "#000000"}),
+        job_status('ndvi-change')
+    ])
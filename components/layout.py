@@ -7,19 +7,25 @@ including header, navigation buttons, data stores, dynamic content area, and foo
 
 from dash import html, dcc
 from components.footer import get_footer
+from data.data_manager import DEFAULT_YEAR_RANGE
 
 
-def get_main_layout():
+def get_main_layout(data_manager=None):
     """
     Constructs and returns the main layout of the Dash application.
 
     The layout includes a header, navigation buttons for different views,
-    hidden stores for managing state, a dynamic content area that updates
-    based on user interaction, and a footer.
+    a global year-range control shared by every tab, hidden stores for
+    managing state, a dynamic content area that updates based on user
+    interaction, and a footer.
+
+    Args:
+        data_manager: DataManager used to size the year-range control
 
     Returns:
         html.Div: The root Div containing the entire app layout.
     """
+    year_min, year_max = data_manager.get_year_bounds() if data_manager else DEFAULT_YEAR_RANGE
     return html.Div([
         # Header section
         html.Div([
@@ -34,8 +40,23 @@ def get_main_layout():
             html.Button("🌍 Historical Trends", id="btn-trends", n_clicks=0, className="nav-btn"),
             html.Button("🌿 Vegetation Indices", id="btn-veg", n_clicks=0, className="nav-btn"),
             html.Button("📈 Climate Correlations", id="btn-correlations", n_clicks=0, className="nav-btn"),
+            html.Button("🎲 Fire Scenarios", id="btn-scenario", n_clicks=0, className="nav-btn"),
         ], className="nav-btn-container"),
 
+        # Global year range applied to every figure on every tab
+        html.Div([
+            dcc.RangeSlider(
+                id='year-range',
+                min=year_min,
+                max=year_max,
+                step=1,
+                value=[max(year_min, DEFAULT_YEAR_RANGE[0]), min(year_max, DEFAULT_YEAR_RANGE[1])],
+                marks={year: str(year) for year in range(year_min, year_max + 1) if year % 5 == 0},
+                allowCross=False,
+                tooltip={'placement': 'bottom'},
+            )
+        ], style={'maxWidth': '900px', 'margin': '0 auto 20px'}),
+
         # Hidden stores to keep track of active tab and selected years for different visualizations
         dcc.Store(id='active-tab', data='trends'),
         dcc.Store(id='bubble-year-store', data=None),
@@ -4,12 +4,105 @@ Data management module for the wildfire climate change visualization dashboard.
 This module handles loading, caching, and providing access to all datasets
 used throughout the application, including temperature, precipitation,
 vegetation, drought, and fire data.
+
+The offline build (`python -m tools.build`) saves every loaded dataset,
+including the fire-risk levels, as a columnar Parquet snapshot. A
+DataManager loads that snapshot instead of parsing the CSVs and rating the
+fire data again, as long as it was built from the current source files.
+
+Configuration is read from environment variables:
+- DATA_SNAPSHOT_DIR: Directory of the prebuilt snapshot (default 'build/data').
 """
 
+import glob
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, Any, Optional
-from loader import ClimateDataLoader
+from typing import Dict, Any, List, Optional, Tuple
+from loader import ClimateDataLoader, SERIES_FILES
+from models.fire_risk import score_fire_risk
+
+
+# Inclusive (start_year, end_year) filter; None means the full history
+YearRange = Optional[Tuple[int, int]]
+
+# Year range shown when the dashboard first loads
+DEFAULT_YEAR_RANGE = (1980, 2022)
+
+# Directory of the prebuilt dataset snapshot written by tools.build
+SNAPSHOT_DIR = os.environ.get("DATA_SNAPSHOT_DIR", "build/data")
+SNAPSHOT_INDEX = "index.json"
+# Code that shapes the loaded frames; a snapshot built by other code is stale
+LOADING_CODE = ('loader.py', os.path.join('data', 'data_manager.py'), os.path.join('models', 'fire_risk.py'))
+
+# Compact in-memory dtype of every known column, applied when a dataset is
+# loaded: float32 values match the float32 typed arrays the graphs emit, the
+# few distinct state names become categoricals and years fit in int16.
+# Columns not listed keep the dtype pandas inferred.
+COLUMN_DTYPES = {
+    'Year': np.int16,
+    # Month of a NOAA series row (the last month of its 12-month period)
+    'Month': np.int8,
+    'State': 'category',
+    'AvgTemperature': np.float32,
+    'AvgPrecip': np.float32,
+    'NDVI': np.float32,
+    'EVI': np.float32,
+    'DroughtSeverity': np.float32,
+    # Statewide yearly fire counts can exceed the int16 range
+    'FireCount': np.int32,
+}
+
+
+def _sort_by_year(df: pd.DataFrame) -> pd.DataFrame:
+    """Sort a dataset by 'Year' (stable, so per-state order within a year is kept)."""
+    return df.sort_values('Year', kind='stable', ignore_index=True)
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the columns of a loaded frame to their COLUMN_DTYPES."""
+    columns = {col: dtype for col, dtype in COLUMN_DTYPES.items() if col in df.columns}
+    return df.astype(columns) if columns else df
+
+
+def _fire_risk_rows(vegetation: pd.DataFrame, drought: pd.DataFrame, fire_model: pd.DataFrame) -> pd.DataFrame:
+    """Every (state, year) row with vegetation or drought data, plus the observed fire count where there is one."""
+    rows = vegetation.merge(drought, on=['Year', 'State'], how='outer')
+    rows = rows.merge(fire_model[['Year', 'State', 'FireCount']], on=['Year', 'State'], how='left')
+    # Fire counts are only observed for some states, so they stay float32 with NaN gaps
+    return _sort_by_year(_compact(rows.drop(columns='FireCount')).assign(FireCount=rows['FireCount'].astype(np.float32)))
+
+
+def _fingerprint(frames: Dict[str, pd.DataFrame]) -> str:
+    """Content hash of a set of frames, identical in every process that loaded the same data."""
+    digest = hashlib.sha1()
+    for key in sorted(frames):
+        df = frames[key]
+        digest.update(key.encode('utf-8'))
+        digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+        if not df.empty:
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def source_files() -> List[str]:
+    """Every file the loaded datasets derive from: the CSVs under data/ and the loading code."""
+    return sorted(glob.glob(os.path.join('data', '*', '*.csv'))) + list(LOADING_CODE)
+
+
+def sources_fingerprint(paths: Optional[List[str]] = None) -> str:
+    """Content hash of the source files (names and bytes), used to validate a snapshot."""
+    digest = hashlib.sha1()
+    for path in paths if paths is not None else source_files():
+        digest.update(path.encode('utf-8'))
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'missing')
+    return digest.hexdigest()[:16]
 
 
 class DataManager:
@@ -20,35 +113,83 @@ class DataManager:
     dashboard, with lazy loading and caching for performance optimization.
     """
     
-    def __init__(self):
-        """Initialize the data manager and climate data loader."""
+    def __init__(self, snapshot_dir: Optional[str] = SNAPSHOT_DIR):
+        """
+        Initialize the data manager and climate data loader.
+        
+        Args:
+            snapshot_dir: Directory of a prebuilt snapshot to load when current, or None to always parse the sources
+        """
+        self._snapshot_dir = snapshot_dir
         self._loader = ClimateDataLoader()
         self._cache: Dict[str, pd.DataFrame] = {}
+        # State-indexed store: state code -> variable -> DataFrame (shared with _cache)
+        self._states: Dict[str, Dict[str, pd.DataFrame]] = {}
+        self._state_info: Dict[str, Tuple[str, str]] = {}
+        # Sorted 'Year' column of every cached dataset, used for searchsorted range slices
+        self._year_index: Dict[str, np.ndarray] = {}
+        # Incremented on every (re)load so derived caches can key on it
+        self.version = 0
+        # Content hash of the loaded data; caches shared between worker processes
+        # key on it, since per-process version counters are not comparable
+        self.data_tag = ''
         self._load_all_data()
     
     def _load_all_data(self):
         """Load all datasets into cache on initialization."""
+        self.version += 1
+        if not self._load_snapshot():
+            self._load_sources()
+        
+        # Precompute the sorted year offsets of every dataset
+        self._year_index = {
+            key: df['Year'].to_numpy() for key, df in self._cache.items() if 'Year' in df.columns
+        }
+        self.data_tag = _fingerprint(self._cache)
+    
+    def _load_sources(self):
+        """Parse every dataset from its source files."""
         try:
-            # Load temperature data
-            self._cache['ga_temperature'] = self._loader.load_ga_temperature()
-            self._cache['ca_temperature'] = self._loader.load_ca_temperature()
-            
-            # Load precipitation data
-            self._cache['ga_precipitation'] = self._loader.load_ga_precipitation()
-            self._cache['ca_precipitation'] = self._loader.load_ca_precipitation()
+            # Load temperature and precipitation series for every state found under data/,
+            # indexed by state code and also exposed as '<code>_<variable>' cache keys
+            self._state_info = {}
+            self._states = {}
+            for code, (name, directory) in self._loader.discover_states().items():
+                # One unreadable state is skipped rather than failing every dataset
+                try:
+                    series = {variable: _compact(self._loader.load_state_series(directory, code, variable))
+                              for variable in SERIES_FILES}
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Skipping state {code}: cannot load its series ({type(e).__name__}: {e})")
+                    continue
+                self._state_info[code] = (name, directory)
+                self._states[code] = series
+                for variable, df in series.items():
+                    self._cache[f'{code.lower()}_{variable}'] = df
             
             # Load vegetation data
-            self._cache['vegetation'] = pd.read_csv("data/vegetation/Vegetation_Index_California_Georgia.csv")
+            self._cache['vegetation'] = _compact(_sort_by_year(pd.read_csv("data/vegetation/Vegetation_Index_California_Georgia.csv")))
             
             # Load drought data
-            self._cache['drought'] = pd.read_csv("data/drought/Drought_Severity_California_Georgia.csv")
+            self._cache['drought'] = _compact(_sort_by_year(pd.read_csv("data/drought/Drought_Severity_California_Georgia.csv")))
             
             # Load fire model data
-            self._cache['fire_model'] = pd.read_csv("data/california/Fire_Model_California.csv")
+            fire_model = _compact(_sort_by_year(pd.read_csv("data/california/Fire_Model_California.csv")))
+            self._cache['fire_model'] = fire_model
+            
+            # Rate every (state, year) row once with the badge rules; the bubble
+            # chart and its badge read the California rows
+            fire_risk = score_fire_risk(_fire_risk_rows(self._cache['vegetation'], self._cache['drought'], fire_model))
+            self._cache['fire_risk'] = fire_risk
+            california = fire_model[fire_model["State"] == "California"]
+            self._cache['california_fire'] = _compact(
+                california.merge(fire_risk[['Year', 'State', 'RiskLevel']], on=['Year', 'State'], how='left')
+            )
             
         except Exception as e:
             print(f"Error loading data: {e}")
             # Initialize with empty DataFrames if loading fails
+            self._states = {}
             self._cache = {
                 'ga_temperature': pd.DataFrame(),
                 'ca_temperature': pd.DataFrame(),
@@ -56,43 +197,156 @@ class DataManager:
                 'ca_precipitation': pd.DataFrame(),
                 'vegetation': pd.DataFrame(),
                 'drought': pd.DataFrame(),
-                'fire_model': pd.DataFrame()
+                'fire_model': pd.DataFrame(),
+                'fire_risk': pd.DataFrame(),
+                'california_fire': pd.DataFrame()
             }
     
-    def get_ga_temperature(self) -> pd.DataFrame:
-        """Get Georgia temperature data."""
-        return self._cache.get('ga_temperature', pd.DataFrame())
+    def _load_snapshot(self) -> bool:
+        """
+        Load every dataset from the prebuilt snapshot.
+        
+        Returns:
+            bool: False when there is no snapshot or it was built from other source files
+        """
+        if not self._snapshot_dir:
+            return False
+        try:
+            with open(os.path.join(self._snapshot_dir, SNAPSHOT_INDEX)) as f:
+                index = json.load(f)
+            if index['sources'] != sources_fingerprint():
+                print(f"Data snapshot in {self._snapshot_dir} is stale; loading the source files")
+                return False
+            cache = {key: pd.read_parquet(os.path.join(self._snapshot_dir, f"{key}.parquet"))
+                     for key in index['datasets']}
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, ImportError) as e:
+            print(f"Error loading data snapshot: {e}")
+            return False
+        self._cache = cache
+        self._state_info = {code: tuple(info) for code, info in index['states'].items()}
+        self._states = {
+            code: {variable: cache[f'{code.lower()}_{variable}'] for variable in SERIES_FILES}
+            for code in self._state_info
+        }
+        return True
+    
+    def save_snapshot(self, directory: str = SNAPSHOT_DIR) -> List[str]:
+        """
+        Write every loaded dataset as a Parquet snapshot for later DataManager instances.
+        
+        Args:
+            directory: Output directory
+            
+        Returns:
+            list: Paths of the written files, the index last
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for key, df in self._cache.items():
+            path = os.path.join(directory, f"{key}.parquet")
+            df.to_parquet(path)
+            paths.append(path)
+        # The index is written last and renamed into place, so a reader never sees a partial snapshot
+        index = {
+            'sources': sources_fingerprint(),
+            'data_tag': self.data_tag,
+            'datasets': list(self._cache),
+            'states': {code: list(info) for code, info in self._state_info.items()},
+        }
+        path = os.path.join(directory, SNAPSHOT_INDEX)
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+        return paths + [path]
+    
+    def slice_years(self, key: str, year_range: YearRange = None) -> pd.DataFrame:
+        """
+        Get a cached dataset restricted to an inclusive year range.
+        
+        Datasets are kept sorted by year, so the range is located with two
+        O(log n) binary searches and returned as a positional slice of the
+        cached frame rather than a boolean-mask copy.
+        
+        Args:
+            key: Cache key of the dataset (e.g. 'ga_temperature', 'drought')
+            year_range: (start_year, end_year), or None for every year
+            
+        Returns:
+            pd.DataFrame: Rows whose 'Year' lies within the range
+        """
+        df = self._cache.get(key)
+        if df is None:
+            return pd.DataFrame()
+        years = self._year_index.get(key)
+        if year_range is None or years is None:
+            return df
+        start, end = year_range
+        lo = years.searchsorted(start, side='left')
+        hi = years.searchsorted(end, side='right')
+        return df.iloc[lo:hi]
+    
+    def get_year_bounds(self) -> Tuple[int, int]:
+        """Get the earliest and latest year across all loaded datasets."""
+        spans = [(int(years[0]), int(years[-1])) for years in self._year_index.values() if len(years)]
+        if not spans:
+            return (1980, 2022)
+        return (min(lo for lo, _ in spans), max(hi for _, hi in spans))
+    
+    def get_ga_temperature(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get Georgia temperature data, optionally restricted to a year range."""
+        return self.slice_years('ga_temperature', year_range)
+    
+    def get_ca_temperature(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get California temperature data, optionally restricted to a year range."""
+        return self.slice_years('ca_temperature', year_range)
+    
+    def get_ga_precipitation(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get Georgia precipitation data, optionally restricted to a year range."""
+        return self.slice_years('ga_precipitation', year_range)
+    
+    def get_ca_precipitation(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get California precipitation data, optionally restricted to a year range."""
+        return self.slice_years('ca_precipitation', year_range)
+    
+    def get_dataset_names(self) -> List[str]:
+        """Get the cache keys of every loaded dataset (valid keys for slice_years)."""
+        return list(self._cache)
+    
+    def get_state_codes(self) -> List[str]:
+        """Get the codes of all states with loaded climate series, sorted."""
+        return sorted(self._states)
     
-    def get_ca_temperature(self) -> pd.DataFrame:
-        """Get California temperature data."""
-        return self._cache.get('ca_temperature', pd.DataFrame())
+    def get_state_name(self, code: str) -> str:
+        """Get the display name for a state code."""
+        return self._state_info.get(code, (code, ''))[0]
     
-    def get_ga_precipitation(self) -> pd.DataFrame:
-        """Get Georgia precipitation data."""
-        return self._cache.get('ga_precipitation', pd.DataFrame())
+    def get_state_series(self, code: str, variable: str, year_range: YearRange = None) -> pd.DataFrame:
+        """Get one state's 'temperature' or 'precipitation' series by state code."""
+        if variable not in self._states.get(code, {}):
+            return pd.DataFrame()
+        return self.slice_years(f'{code.lower()}_{variable}', year_range)
     
-    def get_ca_precipitation(self) -> pd.DataFrame:
-        """Get California precipitation data."""
-        return self._cache.get('ca_precipitation', pd.DataFrame())
+    def get_vegetation_data(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get vegetation indices data, optionally restricted to a year range."""
+        return self.slice_years('vegetation', year_range)
     
-    def get_vegetation_data(self) -> pd.DataFrame:
-        """Get vegetation indices data."""
-        return self._cache.get('vegetation', pd.DataFrame())
+    def get_drought_data(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get drought severity data, optionally restricted to a year range."""
+        return self.slice_years('drought', year_range)
     
-    def get_drought_data(self) -> pd.DataFrame:
-        """Get drought severity data."""
-        return self._cache.get('drought', pd.DataFrame())
+    def get_fire_model_data(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get fire model data for California, optionally restricted to a year range."""
+        return self.slice_years('fire_model', year_range)
     
-    def get_fire_model_data(self) -> pd.DataFrame:
-        """Get fire model data for California."""
-        return self._cache.get('fire_model', pd.DataFrame())
+    def get_fire_risk_data(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get the fire-risk levels of every (state, year) row, optionally restricted to a year range."""
+        return self.slice_years('fire_risk', year_range)
     
-    def get_california_fire_data(self) -> pd.DataFrame:
-        """Get California-specific fire data."""
-        fire_data = self.get_fire_model_data()
-        if not fire_data.empty:
-            return fire_data[fire_data["State"] == "California"]
-        return pd.DataFrame()
+    def get_california_fire_data(self, year_range: YearRange = None) -> pd.DataFrame:
+        """Get California-specific fire data, optionally restricted to a year range."""
+        return self.slice_years('california_fire', year_range)
     
     def reload_data(self):
         """Reload all datasets from source files."""
@@ -100,12 +354,13 @@ class DataManager:
         self._load_all_data()
     
     def get_data_summary(self) -> Dict[str, Any]:
-        """Get a summary of all loaded datasets."""
+        """Get a summary of all loaded datasets, including their in-memory size in bytes."""
         summary = {}
         for key, df in self._cache.items():
             summary[key] = {
                 'rows': len(df),
                 'columns': list(df.columns) if not df.empty else [],
-                'loaded': not df.empty
+                'loaded': not df.empty,
+                'memory_bytes': int(df.memory_usage(deep=True).sum())
             }
         return summary 
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Module for the multi-state climate comparison chart.
+
+This module overlays the yearly temperature or precipitation series of any subset of
+states in a single figure. Series are read from the DataManager's state-indexed store,
+so adding a state only requires dropping its NOAA CSV files under data/.
+
+One figure is built per selection and memoized in an LRU cache keyed by the sorted
+state set, the variable, the year range and the DataManager data version.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+from graphs.figure_template import MAX_POINTS_PER_TRACE, WEBGL_THRESHOLD, decimate_indices, encode_figure
+
+# Value column and axis title for each comparable variable
+COMPARISON_VARIABLES = {
+    'temperature': ('AvgTemperature', 'Temperature (°F)'),
+    'precipitation': ('AvgPrecip', 'Precipitation (inches)'),
+}
+
+# Number of distinct selections kept in the figure cache
+COMPARISON_CACHE_SIZE = 128
+
+def build_state_comparison_graph(data_manager, states, variable='temperature', year_range=None):
+    """
+    Builds a line chart overlaying yearly averages for the selected states.
+
+    Parameters:
+    - data_manager: DataManager instance with the state-indexed climate store.
+    - states: Iterable of state codes (e.g. ['CA', 'GA']); order and duplicates are ignored.
+    - variable: 'temperature' or 'precipitation'.
+    - year_range: Optional inclusive (start_year, end_year) tuple.
+
+    Returns:
+    - A Plotly figure dict with one binary-encoded line per state.
+    """
+    key = tuple(sorted(set(states or ())))
+    year_range = tuple(year_range) if year_range else None
+    return _comparison_figure(data_manager, data_manager.version, key, variable, year_range)
+
+@lru_cache(maxsize=COMPARISON_CACHE_SIZE)
+def _comparison_figure(data_manager, version, states, variable, year_range):
+    """Build the comparison figure for a normalized selection (memoized)."""
+    column, axis_title = COMPARISON_VARIABLES[variable]
+    series = []
+    for code in states:
+        df = data_manager.get_state_series(code, variable, year_range)
+        if df.empty:
+            continue
+        # Collapse the monthly 12-month-period rows into one value per year
+        yearly = df.groupby('Year', sort=True)[column].mean()
+        years = yearly.index.to_numpy()
+        values = yearly.to_numpy(dtype=np.float32)
+        keep = decimate_indices(values, MAX_POINTS_PER_TRACE)
+        series.append((data_manager.get_state_name(code), years[keep], values[keep]))
+
+    # Switch to WebGL once the overlay gets dense
+    trace_type = go.Scattergl if sum(len(v) for _, _, v in series) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure([
+        trace_type(
+            x=years,
+            y=values,
+            mode='lines+markers',
+            name=name,
+            hovertemplate=f'{name}<br>Year: %{{x}}<br>{axis_title}: %{{y:.2f}}<extra></extra>'
+        )
+        for name, years, values in series
+    ])
+    fig.update_layout(
+        xaxis_title='Year',
+        yaxis_title=axis_title,
+        hovermode='x unified',
+        template='plotly_white',
+        legend=dict(orientation='h', yanchor='bottom', y=-0.25, x=0.5, xanchor='center')
+    )
+    return encode_figure(fig.to_plotly_json())
@@ -1,12 +1,57 @@
 """Module for generating correlation-based visualizations related to drought, vegetation, and wildfire patterns.
 
-This module uses Plotly Express and pandas to create interactive visualizations that help analyze
+This module uses Plotly graph objects and pandas to create interactive visualizations that help analyze
 the relationships and trends among drought severity, vegetation indices, and wildfire occurrences.
+
+Charts served on every request are validated once through plotly.graph_objects and reused as
+FigureTemplate skeletons, with only their data arrays filled in per call. Plotly Express is
+deliberately not imported, since loading it dominates the dashboard's startup time.
 """
 
-import plotly.express as px
+import plotly.graph_objects as go
+from plotly.colors import sequential
+from graphs.figure_template import FigureTemplate, add_grouped_lines, group_traces
 
-def build_drought_line_graph(df):
+# Colour scale used for fire counts in the California bubble chart
+FIRE_COLOR_SCALE = [
+    "#FFFFCC", "#FFEDA0", "#FED976", "#FEB24C", "#FD8D3C",
+    "#FC4E2A", "#E31A1C", "#BD0026", "#800026"
+]
+
+# Plotly Express default maximum marker size, used to derive marker.sizeref
+_PX_MAX_SIZE = 20
+
+def _heatmap_figure(x, y, z, colorscale, color_title, **trace_kwargs):
+    """Heatmap with square cells, rows top-down and a shared colour axis, like px.imshow."""
+    fig = go.Figure(go.Heatmap(x=x, y=y, z=z, coloraxis='coloraxis', name='0', **trace_kwargs))
+    fig.update_layout(
+        xaxis=dict(scaleanchor='y', constrain='domain'),
+        yaxis=dict(autorange='reversed', constrain='domain'),
+        coloraxis=dict(colorscale=colorscale, colorbar=dict(title=dict(text=color_title))),
+        margin=dict(t=60)
+    )
+    return fig
+
+def _bubble_figure(x, y, size, color, colorscale, color_title, customdata, hovertemplate):
+    """Single-trace bubble scatter with area-scaled markers and a colour bar, like px.scatter(size=, color=)."""
+    fig = go.Figure(go.Scatter(
+        x=x, y=y, mode='markers', name='', showlegend=False,
+        marker=dict(size=size, sizemode='area', sizeref=_bubble_sizeref(size), color=color,
+                    coloraxis='coloraxis', symbol='circle'),
+        customdata=customdata, hovertemplate=hovertemplate
+    ))
+    fig.update_layout(
+        coloraxis=dict(colorscale=colorscale, colorbar=dict(title=dict(text=color_title))),
+        legend=dict(itemsizing='constant', tracegroupgap=0)
+    )
+    return fig
+
+def _bubble_sizeref(sizes):
+    """Reproduce Plotly Express' area sizeref so filled-in bubbles scale like the original."""
+    peak = float(sizes.max()) if len(sizes) else 0.0
+    return 2.0 * peak / (_PX_MAX_SIZE ** 2) if peak > 0 else 1.0
+
+def _build_drought_line_figure(df):
     """
     Creates a line graph showing drought severity over time for different states.
 
@@ -17,15 +62,12 @@ def build_drought_line_graph(df):
     plotly.graph_objs._figure.Figure: An interactive line graph figure.
     """
     # Line plot shows trends in drought severity by state over the years
-    fig = px.line(
-        df,
-        x='Year',
-        y='DroughtSeverity',
-        color='State',
-        title=None,
-        labels={'DroughtSeverity': 'Drought Severity Index', 'Year': 'Year'},
-        markers=True
+    fig = go.Figure()
+    add_grouped_lines(
+        fig, df, 'State', 'Year', 'DroughtSeverity',
+        hovertemplate='State=%{fullData.name}<br>Year=%{x}<br>Drought Severity Index=%{y}<extra></extra>'
     )
+    fig.update_layout(xaxis_title='Year', yaxis_title='Drought Severity Index')
     # Customize legend orientation and font styles for clarity and aesthetics
     fig.update_layout(
         legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center'),
@@ -34,7 +76,7 @@ def build_drought_line_graph(df):
     )
     return fig
 
-def build_drought_heatmap(df):
+def _build_drought_heatmap_figure(df):
     """
     Generates a heatmap visualizing drought severity across states and years.
 
@@ -47,12 +89,12 @@ def build_drought_heatmap(df):
     # Pivot the DataFrame to structure data with states as rows and years as columns
     drought_pivot = df.pivot(index='State', columns='Year', values='DroughtSeverity')
     # Heatmap communicates spatial-temporal variation in drought severity
-    fig = px.imshow(
-        drought_pivot,
-        color_continuous_scale='YlOrRd',
-        title=None,
-        labels=dict(color="Drought Severity")
+    fig = _heatmap_figure(
+        drought_pivot.columns, drought_pivot.index, drought_pivot.to_numpy(),
+        sequential.YlOrRd, "Drought Severity",
+        hovertemplate='Year: %{x}<br>State: %{y}<br>Drought Severity: %{z}<extra></extra>'
     )
+    fig.update_layout(xaxis_title='Year', yaxis_title='State')
     # Set font and title styling for readability
     fig.update_layout(
         title_font=dict(family="Arial, sans-serif", size=24, color="#000000"),
@@ -60,7 +102,7 @@ def build_drought_heatmap(df):
     )
     return fig
 
-def build_correlation_heatmap(df):
+def _build_correlation_heatmap_figure(df):
     """
     Creates a heatmap of the correlation matrix among NDVI, EVI, Drought Severity, and Fire Count.
 
@@ -73,12 +115,11 @@ def build_correlation_heatmap(df):
     # Calculate correlation matrix for the selected variables
     corr_matrix = df[['NDVI', 'EVI', 'DroughtSeverity', 'FireCount']].corr()
     # Heatmap visualizes the strength and direction of correlations between variables
-    fig = px.imshow(
-        corr_matrix,
-        text_auto=True,
-        title=None,
-        color_continuous_scale='RdBu',
-        labels=dict(color="Correlation")
+    fig = _heatmap_figure(
+        corr_matrix.columns, corr_matrix.index, corr_matrix.to_numpy(),
+        sequential.RdBu, "Correlation",
+        texttemplate='%{z}',
+        hovertemplate='x: %{x}<br>y: %{y}<br>Correlation: %{z}<extra></extra>'
     )
     # Apply font and title styling for consistency and clarity
     fig.update_layout(
@@ -87,6 +128,144 @@ def build_correlation_heatmap(df):
     )
     return fig
 
+_DROUGHT_LINE_TEMPLATE = FigureTemplate(_build_drought_line_figure)
+_DROUGHT_HEATMAP_TEMPLATE = FigureTemplate(_build_drought_heatmap_figure)
+_CORRELATION_TEMPLATE = FigureTemplate(_build_correlation_heatmap_figure)
+
+def build_drought_line_graph(df):
+    """
+    Creates a line graph showing drought severity over time for different states.
+
+    Parameters:
+    df (pandas.DataFrame): DataFrame containing columns 'Year', 'DroughtSeverity', and 'State'.
+
+    Returns:
+    dict: Plotly figure dict with binary-encoded data arrays.
+    """
+    traces = group_traces(df, 'State', {'x': 'Year', 'y': 'DroughtSeverity'})
+    return _DROUGHT_LINE_TEMPLATE.render(df, traces)
+
+def build_drought_heatmap(df):
+    """
+    Generates a heatmap visualizing drought severity across states and years.
+
+    Parameters:
+    df (pandas.DataFrame): DataFrame containing columns 'State', 'Year', and 'DroughtSeverity'.
+
+    Returns:
+    dict: Plotly figure dict with the 2-D severity grid binary-encoded.
+    """
+    drought_pivot = df.pivot(index='State', columns='Year', values='DroughtSeverity')
+    return _DROUGHT_HEATMAP_TEMPLATE.render(df, [{
+        'x': drought_pivot.columns.to_numpy(),
+        'y': drought_pivot.index.to_numpy(),
+        'z': drought_pivot.to_numpy(),
+    }])
+
+def build_correlation_heatmap(df):
+    """
+    Creates a heatmap of the correlation matrix among NDVI, EVI, Drought Severity, and Fire Count.
+
+    Parameters:
+    df (pandas.DataFrame): DataFrame containing columns 'NDVI', 'EVI', 'DroughtSeverity', and 'FireCount'.
+
+    Returns:
+    dict: Plotly figure dict with the correlation matrix binary-encoded.
+    """
+    corr_matrix = df[['NDVI', 'EVI', 'DroughtSeverity', 'FireCount']].corr()
+    return _CORRELATION_TEMPLATE.render(df, [{
+        'x': corr_matrix.columns.to_numpy(),
+        'y': corr_matrix.index.to_numpy(),
+        'z': corr_matrix.to_numpy(),
+    }])
+
+def _build_fire_bubble_figure(df):
+    """
+    Builds the California NDVI vs. drought bubble chart with plotly.graph_objects.
+
+    Used once to create the template skeleton for build_fire_bubble_chart.
+    """
+    fig = _bubble_figure(
+        df["NDVI"], df["DroughtSeverity"], df["FireCount"], df["FireCount"],
+        FIRE_COLOR_SCALE, "Fires Occurred", df[["Year", "State"]].to_numpy(),
+        "NDVI (Vegetation Health)=%{x}<br>Drought Severity Index=%{y}<br>Fires Occurred=%{marker.size}"
+        "<br>Year=%{customdata[0]}<br>State=%{customdata[1]}<extra></extra>"
+    )
+    fig.update_layout(
+        margin=dict(l=40, r=40, t=40, b=40),
+        xaxis=dict(title='NDVI (Vegetation Health)', range=[0.2, 1.0]),
+        yaxis=dict(title='Drought Severity Index', range=[0, 4]),
+        title_font=dict(family="Arial, sans-serif", size=24, color="#000000"),
+        font=dict(family="Arial, sans-serif", color="#000000")
+    )
+    return fig
+
+def _build_fire_timeline_figure(df):
+    """
+    Builds the California fire severity bubble timeline with plotly.graph_objects.
+
+    Used once to create the template skeleton for build_fire_severity_timeline.
+    """
+    fig = _bubble_figure(
+        df["Year"], df["DroughtSeverity"], df["FireCount"], df["NDVI"],
+        sequential.YlGn, "NDVI (Vegetation Health)", df[["FireCount", "NDVI"]].to_numpy(),
+        "Year=%{x}<br>Drought Index=%{y}<br>Fires=%{marker.size}"
+        "<br>NDVI (Vegetation Health)=%{marker.color:.2f}<extra></extra>"
+    )
+    # Bubbles outside 'selectedpoints' (the year clicked in the bubble chart) are dimmed
+    fig.update_traces(unselected=dict(marker=dict(opacity=0.25)))
+    fig.update_layout(
+        margin=dict(l=40, r=40, t=40, b=40),
+        xaxis_title='Year',
+        yaxis_title='Drought Index',
+        title_font=dict(family="Arial, sans-serif", size=22),
+        font=dict(family="Arial, sans-serif")
+    )
+    return fig
+
+_FIRE_BUBBLE_TEMPLATE = FigureTemplate(_build_fire_bubble_figure)
+_FIRE_TIMELINE_TEMPLATE = FigureTemplate(_build_fire_timeline_figure)
+
+def build_fire_bubble_chart(df):
+    """
+    Builds the California bubble chart of NDVI vs. drought severity, sized and coloured by fire count.
+
+    Parameters:
+    df (pandas.DataFrame): DataFrame containing 'NDVI', 'DroughtSeverity', 'FireCount', 'Year' and 'State'.
+
+    Returns:
+    dict: Plotly figure dict with binary-encoded data arrays.
+    """
+    fire_count = df['FireCount'].to_numpy()
+    return _FIRE_BUBBLE_TEMPLATE.render(df, [{
+        'x': df['NDVI'].to_numpy(),
+        'y': df['DroughtSeverity'].to_numpy(),
+        'marker.size': fire_count,
+        'marker.color': fire_count,
+        'marker.sizeref': _bubble_sizeref(fire_count),
+        'customdata': df[['Year', 'State']].to_numpy(),
+    }])
+
+def build_fire_severity_timeline(df):
+    """
+    Builds the California fire severity timeline: drought by year, sized by fire count and coloured by NDVI.
+
+    Parameters:
+    df (pandas.DataFrame): DataFrame containing 'Year', 'DroughtSeverity', 'FireCount' and 'NDVI'.
+
+    Returns:
+    dict: Plotly figure dict with binary-encoded data arrays.
+    """
+    fire_count = df['FireCount'].to_numpy()
+    return _FIRE_TIMELINE_TEMPLATE.render(df, [{
+        'x': df['Year'].to_numpy(),
+        'y': df['DroughtSeverity'].to_numpy(),
+        'marker.size': fire_count,
+        'marker.color': df['NDVI'].to_numpy(),
+        'marker.sizeref': _bubble_sizeref(fire_count),
+        'customdata': df[['FireCount', 'NDVI']].to_numpy(),
+    }])
+
 def build_bubble_chart(df):
     """
     Constructs a bubble chart showing the relationship between NDVI and drought severity,
@@ -99,25 +278,11 @@ def build_bubble_chart(df):
     plotly.graph_objs._figure.Figure: An interactive scatter plot figure with bubbles.
     """
     # Scatter plot with bubble size and color encoding fire occurrence intensity
-    fig_bubble = px.scatter(
-        df,
-        x='NDVI',
-        y='DroughtSeverity',
-        size='FireCount',
-        color='FireCount',
-        color_continuous_scale='YlOrRd',
-        title=None,
-        labels={
-            'NDVI': 'NDVI (Vegetation Health)',
-            'DroughtSeverity': 'Drought Severity Index',
-            'FireCount': 'Fire Occurrence'
-        },
-        hover_data={
-            'Year': True,
-            'NDVI': ':.2f',
-            'DroughtSeverity': ':.2f',
-            'FireCount': True
-        }
+    fig_bubble = _bubble_figure(
+        df['NDVI'], df['DroughtSeverity'], df['FireCount'], df['FireCount'],
+        sequential.YlOrRd, 'Fire Occurrence', df[['Year']].to_numpy(),
+        'NDVI (Vegetation Health)=%{x:.2f}<br>Drought Severity Index=%{y:.2f}'
+        '<br>Fire Occurrence=%{marker.size}<br>Year=%{customdata[0]}<extra></extra>'
     )
     # Configure layout with axis ranges, grid styling, margins, and font settings for better visualization
     fig_bubble.update_layout(
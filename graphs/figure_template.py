@@ -0,0 +1,343 @@
+"""
+Pre-validated figure templates with binary-encoded data arrays.
+
+Building a figure through Plotly Express validates every property of every
+trace, which is wasted work for charts whose structure never changes between
+requests. A FigureTemplate runs the validating builder once, keeps the result
+as a plain dict skeleton with the data arrays removed, and afterwards only
+fills in new arrays. NumPy arrays are encoded with Plotly's typed-array
+format ({'dtype': ..., 'bdata': <base64>}), so serialization cost is bounded
+by payload size instead of by walking millions of Python floats.
+
+Dense scatter/line charts are kept interactive in two steps: traces longer than
+PLOT_MAX_POINTS_PER_TRACE are decimated server-side with a min/max bucket
+reduction, and scatter traces whose own point count still exceeds
+PLOT_WEBGL_THRESHOLD switch to WebGL ('scattergl'). The decision is per trace,
+so derived overlays (trend, mean, moving average) sharing a chart's x values do
+not push a modest chart into WebGL.
+Both limits are read from environment variables of the same name.
+"""
+
+import base64
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from plotly.colors import qualitative
+
+# Trace attributes holding per-point data; everything else is structure.
+DATA_KEYS = ("x", "y", "z", "text", "customdata", "hovertext", "marker.size", "marker.color", "marker.sizeref")
+
+# Render-mode limits for scatter/line traces
+WEBGL_THRESHOLD = int(os.environ.get("PLOT_WEBGL_THRESHOLD", "2000"))
+MAX_POINTS_PER_TRACE = int(os.environ.get("PLOT_MAX_POINTS_PER_TRACE", "4000"))
+
+# Trace types subject to decimation and the SVG/WebGL switch
+_SCATTER_TYPES = ("scatter", "scattergl")
+
+# Per-point attributes sliced together when a trace is decimated
+_POINT_KEYS = ("x", "y", "text", "customdata", "hovertext", "marker.size", "marker.color")
+
+# NumPy dtypes supported by plotly.js typed-array decoding.
+_DTYPE_CODES = {
+    np.dtype("float64"): "f8",
+    np.dtype("float32"): "f4",
+    np.dtype("int32"): "i4",
+    np.dtype("uint32"): "u4",
+    np.dtype("int16"): "i2",
+    np.dtype("uint16"): "u2",
+    np.dtype("int8"): "i1",
+    np.dtype("uint8"): "u1",
+}
+
+
+def encode_array(values: Any, allow_2d: bool = False) -> Any:
+    """
+    Encode a numeric array in Plotly's base64 typed-array format.
+
+    64-bit integers are narrowed to int32 when they fit (plotly.js has no int64
+    typed array) and booleans become uint8. Non-numeric data such as strings or
+    mixed object columns is returned as a plain list.
+
+    Args:
+        values: Array-like data for a single trace attribute
+        allow_2d: Whether to binary-encode 2-D arrays (used for heatmap 'z')
+
+    Returns:
+        dict or list: Typed-array spec, or a JSON-friendly list fallback
+    """
+    arr = np.asarray(values)
+    if arr.ndim == 0:
+        return arr.item()
+    if arr.ndim > 2 or (arr.ndim == 2 and not allow_2d):
+        return arr.tolist()
+    if arr.dtype.kind == "b":
+        arr = arr.astype(np.uint8)
+    elif arr.dtype.kind in "iu" and arr.dtype.itemsize == 8:
+        if arr.size == 0 or (arr.min() >= np.iinfo(np.int32).min and arr.max() <= np.iinfo(np.int32).max):
+            arr = arr.astype(np.int32)
+        else:
+            arr = arr.astype(np.float64)
+    code = _DTYPE_CODES.get(arr.dtype.newbyteorder("="))
+    if code is None:
+        return arr.tolist()
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    spec = {"dtype": code, "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+    if arr.ndim == 2:
+        spec["shape"] = f"{arr.shape[0]},{arr.shape[1]}"
+    return spec
+
+
+def _get_path(trace: Dict, path: str) -> Any:
+    node: Any = trace
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def _set_path(trace: Dict, path: str, value: Any):
+    """Set a dotted attribute, copying intermediate dicts so skeletons stay untouched."""
+    parts = path.split(".")
+    node = trace
+    for part in parts[:-1]:
+        child = dict(node.get(part) or {})
+        node[part] = child
+        node = child
+    node[parts[-1]] = value
+
+
+def _pop_path(trace: Dict, path: str):
+    parts = path.split(".")
+    node = trace
+    for part in parts[:-1]:
+        if not isinstance(node.get(part), dict):
+            return
+        node[part] = dict(node[part])
+        node = node[part]
+    node.pop(parts[-1], None)
+
+
+def _encode_value(path: str, value: Any) -> Any:
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    return encode_array(value, allow_2d=(path == "z"))
+
+
+def encode_figure(fig_dict: Dict) -> Dict:
+    """
+    Binary-encode the data arrays of an already built figure dict.
+
+    Args:
+        fig_dict: Figure as returned by go.Figure.to_plotly_json()
+
+    Returns:
+        dict: Figure dict whose data arrays use typed-array encoding
+    """
+    data = []
+    for trace in fig_dict.get("data", []):
+        trace = dict(trace)
+        for path in DATA_KEYS:
+            value = _get_path(trace, path)
+            if value is not None:
+                _set_path(trace, path, _encode_value(path, value))
+        data.append(trace)
+    return {"data": data, "layout": fig_dict.get("layout", {})}
+
+
+def decimate_indices(y: Any, max_points: int) -> np.ndarray:
+    """
+    Pick point indices that preserve the visual envelope of a long series.
+
+    The series is split into ``max_points // 2`` equal buckets and the minimum and
+    maximum of each bucket are kept, plus the first and last points. This is fully
+    vectorized and keeps peaks and troughs that uniform striding would drop.
+
+    Args:
+        y: 1-D numeric series
+        max_points: Upper bound on the number of returned indices (approximately)
+
+    Returns:
+        np.ndarray: Sorted unique indices into ``y``
+    """
+    values = np.asarray(y, dtype=np.float64)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max(max_points // 2, 1)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = values
+    grid = padded.reshape(buckets, size)
+    nan = np.isnan(grid)
+    offsets = np.arange(buckets) * size
+    lows = np.where(nan, np.inf, grid).argmin(axis=1) + offsets
+    highs = np.where(nan, -np.inf, grid).argmax(axis=1) + offsets
+    indices = np.concatenate(([0, n - 1], lows, highs))
+    return np.unique(indices[indices < n])
+
+
+def _decimate_trace(arrays: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+    """Decimate every per-point attribute of a trace mapping with the same indices."""
+    y = arrays.get("y")
+    if y is None or isinstance(y, (str, dict)) or np.ndim(y) != 1 or len(y) <= max_points:
+        return arrays
+    keep = decimate_indices(y, max_points)
+    n = len(y)
+    decimated = dict(arrays)
+    for path in _POINT_KEYS:
+        value = arrays.get(path)
+        if value is not None and not isinstance(value, (str, int, float)) and len(value) == n:
+            decimated[path] = np.asarray(value)[keep]
+    return decimated
+
+
+def _point_count(arrays: Dict[str, Any]) -> int:
+    y = arrays.get("y")
+    return len(y) if y is not None and np.ndim(y) == 1 else 0
+
+
+def linear_trend(x: Any, y: Any) -> np.ndarray:
+    """
+    Evaluate a least-squares line through (x, y) at every x.
+
+    Returns NaNs when fewer than two points are available (e.g. a narrow year
+    range), where np.polyfit would fail.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 2 or np.ptp(x) == 0:
+        return np.full(len(x), np.nan)
+    return np.poly1d(np.polyfit(x, y, 1))(x)
+
+
+def add_grouped_lines(fig, df, group_col: str, x: str, y: str, **trace_kwargs):
+    """
+    Add one 'lines+markers' trace per group, styled like px.line(color=..., markers=True).
+
+    Groups are added in order of first appearance and coloured from Plotly's default
+    qualitative palette, matching Plotly Express without importing it.
+
+    Args:
+        fig: plotly.graph_objects.Figure to add traces to
+        df: Long-format DataFrame
+        group_col: Column whose values become separate traces (e.g. 'State')
+        x: Column for the x axis
+        y: Column for the y axis
+        **trace_kwargs: Extra go.Scatter properties shared by every trace (e.g. hovertemplate)
+    """
+    palette = qualitative.Plotly
+    for i, (name, group) in enumerate(df.groupby(group_col, sort=False, observed=True)):
+        fig.add_scatter(
+            x=group[x],
+            y=group[y],
+            mode='lines+markers',
+            name=name,
+            legendgroup=name,
+            showlegend=True,
+            line=dict(color=palette[i % len(palette)], dash='solid'),
+            marker=dict(symbol='circle'),
+            **trace_kwargs
+        )
+    fig.update_layout(legend=dict(title=dict(text=group_col), tracegroupgap=0), margin=dict(t=60))
+
+
+def group_traces(df, group_col: str, columns: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Split a long-format DataFrame into one trace mapping per group.
+
+    Groups are emitted in order of first appearance, which is how Plotly Express
+    orders colour groups, so they line up with the skeleton traces.
+
+    Args:
+        df: Long-format DataFrame
+        group_col: Column whose values become separate traces (e.g. 'State')
+        columns: Mapping of trace attribute path to source column
+
+    Returns:
+        list: Trace mappings suitable for FigureTemplate.render
+    """
+    traces = []
+    for name, group in df.groupby(group_col, sort=False, observed=True):
+        trace: Dict[str, Any] = {"name": name, "legendgroup": name}
+        for path, column in columns.items():
+            trace[path] = group[column].to_numpy()
+        traces.append(trace)
+    return traces
+
+
+class FigureTemplate:
+    """
+    A chart type whose structure is validated once and reused as a dict skeleton.
+
+    The builder is a regular Plotly figure function taking a DataFrame. It runs on
+    the first render only; later renders copy each skeleton trace shallowly and
+    insert the supplied data arrays. Scatter traces are decimated and switched to
+    WebGL according to the module-level limits. The skeleton layout is shared
+    between renders and must be treated as read-only.
+    """
+
+    def __init__(self, build_figure: Callable[..., Any]):
+        """Initialize the template with its validating figure builder."""
+        self._build_figure = build_figure
+        self._skeleton: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def skeleton(self, df, *args) -> Dict:
+        """Return the cached skeleton, building it from ``df`` on first use."""
+        if self._skeleton is None:
+            with self._lock:
+                if self._skeleton is None:
+                    fig_dict = self._build_figure(df, *args).to_plotly_json()
+                    data = []
+                    for trace in fig_dict.get("data", []):
+                        trace = dict(trace)
+                        for path in DATA_KEYS:
+                            _pop_path(trace, path)
+                        data.append(trace)
+                    self._skeleton = {"data": data, "layout": fig_dict.get("layout", {})}
+        return self._skeleton
+
+    def render(self, df, traces: List[Dict[str, Any]], *args) -> Dict:
+        """
+        Fill the skeleton with per-request data arrays.
+
+        Args:
+            df: Source DataFrame, used to build the skeleton on first call and as
+                a fallback when the trace count does not match the skeleton
+            traces: One mapping per skeleton trace of dotted attribute path
+                (e.g. 'x', 'marker.size') to array or scalar
+            *args: Extra arguments forwarded to the builder
+
+        Returns:
+            dict: Plotly figure dict ready for dcc.Graph
+        """
+        if len(df) == 0:
+            # Nothing in range: keep the chart's axes and styling but draw no traces
+            try:
+                # Avoid caching a skeleton built from no data (it may lack colour groups)
+                layout = (self._skeleton or self._build_figure(df, *args).to_plotly_json())["layout"]
+            except (TypeError, ValueError, KeyError):
+                # Some builders (e.g. polynomial fits) cannot run on empty data
+                layout = {}
+            return {"data": [], "layout": layout}
+        skeleton = self.skeleton(df, *args)
+        if len(traces) != len(skeleton["data"]):
+            # Data-dependent structure (e.g. a different set of colour groups)
+            return encode_figure(self._build_figure(df, *args).to_plotly_json())
+        traces = [
+            _decimate_trace(arrays, MAX_POINTS_PER_TRACE) if trace.get("type") in _SCATTER_TYPES else arrays
+            for trace, arrays in zip(skeleton["data"], traces)
+        ]
+        data = []
+        for skel_trace, arrays in zip(skeleton["data"], traces):
+            trace = dict(skel_trace)
+            if trace.get("type") in _SCATTER_TYPES:
+                # Plotly Express picks its own render mode; override it from the trace's point count
+                trace["type"] = "scattergl" if _point_count(arrays) > WEBGL_THRESHOLD else "scatter"
+            for path, value in arrays.items():
+                _set_path(trace, path, _encode_value(path, value))
+            data.append(trace)
+        return {"data": data, "layout": skeleton["layout"]}
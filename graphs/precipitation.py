@@ -1,15 +1,53 @@
 """Module for visualizing precipitation trends for Georgia and California using scatter plots with trendlines.
 
 This module provides functions to build precipitation graphs for Georgia and California based on input data.
-It uses NumPy for polynomial fitting and Plotly Express for interactive plotting.
+It uses NumPy for polynomial fitting and Plotly graph objects for interactive plotting.
+The figure is built and validated once as a FigureTemplate skeleton; later calls only fill in data arrays,
+emitted as float32 typed arrays ('f4' bdata) to keep long series compact.
 
 Libraries used:
 - NumPy
-- Plotly Express
+- Plotly graph objects
 """
 
 import numpy as np
-import plotly.express as px
+import plotly.graph_objects as go
+from graphs.figure_template import FigureTemplate, linear_trend
+
+def _build_precip_figure(df):
+    """
+    Build the full, validated precipitation figure with plotly.graph_objects.
+
+    Used once to create the template skeleton. Parameters and traces match
+    build_georgia_precip_graph.
+    """
+    # Scatter points styled like a single-colour Plotly Express scatter
+    fig = go.Figure()
+    fig.add_scatter(x=df['Year'], y=df['AvgPrecip'], mode='markers', name='', showlegend=False,
+                    marker=dict(color='#636efa', opacity=0.85),
+                    hovertemplate='Year=%{x}<br>AvgPrecip=%{y}<extra></extra>')
+    # Calculate the coefficients of a linear polynomial (degree 1) fit to the data
+    z = np.polyfit(df['Year'], df['AvgPrecip'], 1)
+    trend = np.poly1d(z)
+    # Add a line trace representing the trendline based on the polynomial fit
+    fig.add_scatter(x=df['Year'], y=trend(df['Year']), mode='lines', name='Trendline', line=dict(color='green', width=2))
+    # Configure the layout with axis titles and a clean white template
+    fig.update_layout(xaxis_title='Year', yaxis_title='Precipitation (inches)', template='plotly_white',
+                      legend=dict(tracegroupgap=0), margin=dict(t=60))
+    return fig
+
+_PRECIP_TEMPLATE = FigureTemplate(_build_precip_figure)
+
+def _render_precip_graph(df):
+    """Compute the precipitation trace arrays and fill them into the shared template."""
+    years = df['Year'].to_numpy()
+    precip = df['AvgPrecip'].to_numpy(dtype=np.float32)
+    # Linear trendline over the same years, fitted in float64 and emitted as float32
+    trend = linear_trend(years, precip).astype(np.float32)
+    return _PRECIP_TEMPLATE.render(df, [
+        {'x': years, 'y': precip},
+        {'x': years, 'y': trend},
+    ])
 
 def build_georgia_precip_graph(df):
     """
@@ -25,17 +63,9 @@ def build_georgia_precip_graph(df):
     - A green trendline showing the linear fit of precipitation over years.
 
     Returns:
-    - A Plotly Figure object with the precipitation scatter and trendline.
+    - A Plotly figure dict with the precipitation scatter and trendline (float32 typed arrays).
     """
-    fig = px.scatter(df, x='Year', y='AvgPrecip', opacity=0.85)
-    # Calculate the coefficients of a linear polynomial (degree 1) fit to the data
-    z = np.polyfit(df['Year'], df['AvgPrecip'], 1)
-    trend = np.poly1d(z)
-    # Add a line trace representing the trendline based on the polynomial fit
-    fig.add_scatter(x=df['Year'], y=trend(df['Year']), mode='lines', name='Trendline', line=dict(color='green', width=2))
-    # Configure the layout with axis titles and a clean white template
-    fig.update_layout(xaxis_title='Year', yaxis_title='Precipitation (inches)', template='plotly_white')
-    return fig
+    return _render_precip_graph(df)
 
 def build_california_precip_graph(df):
     """
@@ -51,14 +81,6 @@ def build_california_precip_graph(df):
     - A green trendline showing the linear fit of precipitation over years.
 
     Returns:
-    - A Plotly Figure object with the precipitation scatter and trendline.
+    - A Plotly figure dict with the precipitation scatter and trendline (float32 typed arrays).
     """
-    fig = px.scatter(df, x='Year', y='AvgPrecip', opacity=0.85)
-    # Calculate the coefficients of a linear polynomial (degree 1) fit to the data
-    z = np.polyfit(df['Year'], df['AvgPrecip'], 1)
-    trend = np.poly1d(z)
-    # Add a line trace representing the trendline based on the polynomial fit
-    fig.add_scatter(x=df['Year'], y=trend(df['Year']), mode='lines', name='Trendline', line=dict(color='green', width=2))
-    # Configure the layout with axis titles and a clean white template
-    fig.update_layout(xaxis_title='Year', yaxis_title='Precipitation (inches)', template='plotly_white')
-    return fig
\ No newline at end of file
+    return _render_precip_graph(df)
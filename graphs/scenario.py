@@ -0,0 +1,75 @@
+"""Module for the Monte Carlo fire-count scenario chart.
+
+Plots the distribution of simulated yearly fire counts for a drought/NDVI
+scenario against the no-change baseline, as overlaid histograms on shared
+bins with the medians marked. Simulation results come from models.scenario.
+
+The chart is validated once through plotly.graph_objects and reused as a
+FigureTemplate skeleton, so each slider move only fills in the bar heights.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from graphs.figure_template import FigureTemplate
+
+# (summary key, legend name, colour) of the two distributions
+_SERIES = (('baseline', 'Historical baseline', '#9e9e9e'), ('scenario', 'Scenario', '#e4572e'))
+
+def _build_scenario_figure(df):
+    """
+    Build the full, validated scenario figure from a per-bin frame.
+
+    Used once to create the template skeleton. ``df`` has one row per histogram
+    bin with columns 'Fires' (bin centre), 'baseline' and 'scenario' (share of draws, %).
+    """
+    fig = go.Figure()
+    for key, name, color in _SERIES:
+        fig.add_bar(
+            x=df['Fires'], y=df[key], name=name, marker=dict(color=color), opacity=0.6,
+            hovertemplate=f'{name}<br>Fires: %{{x:.0f}}<br>Share of draws: %{{y:.2f}}%<extra></extra>'
+        )
+    for key, name, color in _SERIES:
+        # Median marker: a vertical dashed segment spanning the bars
+        fig.add_scatter(
+            x=[0, 0], y=[0, 1], mode='lines', name=f'{name} median', showlegend=False,
+            line=dict(color=color, dash='dash'),
+            hovertemplate=f'{name} median: %{{x:.0f}} fires<extra></extra>'
+        )
+    fig.update_layout(
+        barmode='overlay',
+        bargap=0,
+        xaxis_title='Projected fires per year',
+        yaxis_title='Share of simulations (%)',
+        template='plotly_white',
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, x=0.5, xanchor='center'),
+        margin=dict(l=40, r=40, t=40, b=40),
+        font=dict(family="Arial, sans-serif", color="#000000")
+    )
+    return fig
+
+_SCENARIO_TEMPLATE = FigureTemplate(_build_scenario_figure)
+
+def build_scenario_histogram(result):
+    """
+    Builds the baseline vs. scenario fire-count distribution chart.
+
+    Parameters:
+    - result: Output of models.scenario.run_scenario, or None when no fire data is loaded.
+
+    Returns:
+    - A Plotly figure dict with binary-encoded histogram bars.
+    """
+    if result is None:
+        return _SCENARIO_TEMPLATE.render(pd.DataFrame(), [])
+    edges = result['baseline']['edges']
+    bins = {'Fires': ((edges[:-1] + edges[1:]) / 2).astype(np.float32)}
+    for key, _, _ in _SERIES:
+        counts = result[key]['counts']
+        bins[key] = (100.0 * counts / max(int(counts.sum()), 1)).astype(np.float32)
+    df = pd.DataFrame(bins)
+    top = float(max(df['baseline'].max(), df['scenario'].max()))
+    bars = [{'x': df['Fires'].to_numpy(), 'y': df[key].to_numpy()} for key, _, _ in _SERIES]
+    medians = [{'x': np.full(2, result[key]['p50'], dtype=np.float32), 'y': np.array([0, top], dtype=np.float32)}
+               for key, _, _ in _SERIES]
+    return _SCENARIO_TEMPLATE.render(df, bars + medians)
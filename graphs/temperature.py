@@ -1,34 +1,33 @@
 """
 temperature.py
 
-This module provides functions to visualize temperature trends for Georgia and California using Plotly Express and NumPy.
+This module provides functions to visualize temperature trends for Georgia and California using Plotly and NumPy.
 It includes scatter plots of average temperatures over years, trendlines, overall mean temperature lines, and 10-year moving averages.
 
+The chart structure is validated once through plotly.graph_objects and then reused as a
+FigureTemplate skeleton; each call only computes and fills in the data arrays,
+which are emitted as float32 typed arrays to keep long series compact.
+
 Technologies used:
-- Plotly Express for interactive plotting
+- Plotly graph objects for interactive plotting (Plotly Express is not imported, to keep startup fast)
 - NumPy for polynomial fitting and numerical operations
 """
 
 import numpy as np
-import plotly.express as px
+import plotly.graph_objects as go
+from graphs.figure_template import FigureTemplate, linear_trend
 
-def build_georgia_temperature_graph(df):
+def _build_temperature_figure(df):
     """
-    Build a temperature trend graph for Georgia.
-
-    Parameters:
-    df (DataFrame): Must include columns 'Year' and 'AvgTemperature'.
-
-    The graph includes:
-    - Scatter points representing average temperature per year.
-    - A green trendline showing the linear fit of temperature over years.
-    - A red dashed line representing the overall average temperature.
-    - An orange line showing the 10-year moving average of temperatures.
+    Build the full, validated temperature figure with plotly.graph_objects.
 
-    Returns:
-    fig (plotly.graph_objs._figure.Figure): The constructed Plotly figure object.
+    Used once to create the template skeleton. Parameters and traces match
+    build_georgia_temperature_graph.
     """
-    fig = px.scatter(df, x='Year', y='AvgTemperature', opacity=0.85)
+    # Scatter points styled like a single-colour Plotly Express scatter
+    fig = go.Figure()
+    fig.add_scatter(x=df['Year'], y=df['AvgTemperature'], mode='markers', name='', showlegend=False,
+                    marker=dict(color='#636efa', opacity=0.85))
 
     # Calculate linear trendline coefficients (slope and intercept)
     z = np.polyfit(df['Year'], df['AvgTemperature'], 1)
@@ -41,21 +40,49 @@ def build_georgia_temperature_graph(df):
     # Add mean temperature line
     fig.add_scatter(x=df['Year'], y=[mean]*len(df), mode='lines', name='Overall Avg', line=dict(color='red', dash='dash'))
 
-    # Compute 10-year simple moving average (rolling mean)
-    df['SMA_10'] = df['AvgTemperature'].rolling(window=10).mean()
+    # Compute 10-year simple moving average (rolling mean) without mutating the input frame
+    sma_10 = df['AvgTemperature'].rolling(window=10).mean()
     # Add moving average line
-    fig.add_scatter(x=df['Year'], y=df['SMA_10'], mode='lines', name='10-Year Moving Avg', line=dict(color='orange'))
+    fig.add_scatter(x=df['Year'], y=sma_10, mode='lines', name='10-Year Moving Avg', line=dict(color='orange'))
 
     # Customize hover info to show year and temperature with two decimals
     fig.update_traces(hovertemplate='Year: %{x}<br>Temperature: %{y:.2f}°F')
     # Update layout with axis titles, unified hovermode, and white template
-    fig.update_layout(xaxis_title='Year', yaxis_title='Temperature (°F)', hovermode='x unified', template='plotly_white')
+    fig.update_layout(xaxis_title='Year', yaxis_title='Temperature (°F)', hovermode='x unified', template='plotly_white',
+                      legend=dict(tracegroupgap=0), margin=dict(t=60))
 
     return fig
 
-def build_california_temperature_graph(df):
+_TEMPERATURE_TEMPLATE = FigureTemplate(_build_temperature_figure)
+
+def _moving_average(values, window):
+    """Simple moving average with NaN for the first ``window - 1`` points, like pandas rolling().mean()."""
+    sma = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        sma[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return sma
+
+def _render_temperature_graph(df):
+    """Compute the temperature trace arrays and fill them into the shared template."""
+    years = df['Year'].to_numpy()
+    temps = df['AvgTemperature'].to_numpy(dtype=np.float32)
+    # Linear trendline, overall mean and 10-year moving average, computed in
+    # float64 and emitted as float32 typed arrays like the raw series
+    temps64 = temps.astype(np.float64)
+    trend = linear_trend(years, temps64).astype(np.float32)
+    mean = np.full(len(temps), temps64.mean() if len(temps) else np.nan, dtype=np.float32)
+    sma_10 = _moving_average(temps64, 10).astype(np.float32)
+    return _TEMPERATURE_TEMPLATE.render(df, [
+        {'x': years, 'y': temps},
+        {'x': years, 'y': trend},
+        {'x': years, 'y': mean},
+        {'x': years, 'y': sma_10},
+    ])
+
+def build_georgia_temperature_graph(df):
     """
-    Build a temperature trend graph for California.
+    Build a temperature trend graph for Georgia.
 
     Parameters:
     df (DataFrame): Must include columns 'Year' and 'AvgTemperature'.
@@ -67,29 +94,24 @@ def build_california_temperature_graph(df):
     - An orange line showing the 10-year moving average of temperatures.
 
     Returns:
-    fig (plotly.graph_objs._figure.Figure): The constructed Plotly figure object.
+    dict: Plotly figure dict with float32 typed-array ('f4' bdata) traces.
     """
-    fig = px.scatter(df, x='Year', y='AvgTemperature', opacity=0.85)
-
-    # Calculate linear trendline coefficients (slope and intercept)
-    z = np.polyfit(df['Year'], df['AvgTemperature'], 1)
-    trend = np.poly1d(z)
-    # Add trendline to the figure
-    fig.add_scatter(x=df['Year'], y=trend(df['Year']), mode='lines', name='Trendline', line=dict(color='green', width=2))
+    return _render_temperature_graph(df)
 
-    # Calculate overall mean temperature
-    mean = df['AvgTemperature'].mean()
-    # Add mean temperature line
-    fig.add_scatter(x=df['Year'], y=[mean]*len(df), mode='lines', name='Overall Avg', line=dict(color='red', dash='dash'))
+def build_california_temperature_graph(df):
+    """
+    Build a temperature trend graph for California.
 
-    # Compute 10-year simple moving average (rolling mean)
-    df['SMA_10'] = df['AvgTemperature'].rolling(window=10).mean()
-    # Add moving average line
-    fig.add_scatter(x=df['Year'], y=df['SMA_10'], mode='lines', name='10-Year Moving Avg', line=dict(color='orange'))
+    Parameters:
+    df (DataFrame): Must include columns 'Year' and 'AvgTemperature'.
 
-    # Customize hover info to show year and temperature with two decimals
-    fig.update_traces(hovertemplate='Year: %{x}<br>Temperature: %{y:.2f}°F')
-    # Update layout with axis titles, unified hovermode, and white template
-    fig.update_layout(xaxis_title='Year', yaxis_title='Temperature (°F)', hovermode='x unified', template='plotly_white')
+    The graph includes:
+    - Scatter points representing average temperature per year.
+    - A green trendline showing the linear fit of temperature over years.
+    - A red dashed line representing the overall average temperature.
+    - An orange line showing the 10-year moving average of temperatures.
 
-    return fig
\ No newline at end of file
+    Returns:
+    dict: Plotly figure dict with float32 typed-array ('f4' bdata) traces.
+    """
+    return _render_temperature_graph(df)
@@ -3,11 +3,14 @@
 This module provides functions to visualize vegetation trends over time.
 - build_ndvi_graph: Visualizes the Normalized Difference Vegetation Index (NDVI) trends by state.
 - build_evi_graph: Visualizes the Enhanced Vegetation Index (EVI) trends by state.
+
+Both charts are validated once through plotly.graph_objects and reused as FigureTemplate skeletons.
 """
 
-import plotly.express as px
+import plotly.graph_objects as go
+from graphs.figure_template import FigureTemplate, add_grouped_lines, group_traces
 
-def build_ndvi_graph(df):
+def _build_ndvi_figure(df):
     """
     Builds a line graph showing NDVI trends over years for different states.
 
@@ -20,20 +23,14 @@ def build_ndvi_graph(df):
     The graph uses distinct colors for each state and includes markers on data points.
     The layout includes a horizontally oriented legend below the graph.
     """
-    fig = px.line(
-        df,
-        x='Year',  # X-axis represents years
-        y='NDVI',  # Y-axis represents NDVI values
-        color='State',  # Lines colored by state
-        title=None,
-        labels={'NDVI': 'Normalized Difference Vegetation Index', 'Year': 'Year'},
-        markers=True  # Show markers on data points
-    )
-    # Customize hover information to show year, NDVI value formatted to 2 decimals, and state
-    fig.update_traces(
-        hovertemplate='Year: %{x}<br>NDVI: %{y:.2f}<br>State: %{customdata[0]}',
-        customdata=df[['State']]  # Pass state information for hovertemplate
+    fig = go.Figure()
+    # One line per state (coloured like px.line) with markers on data points;
+    # hover shows year, NDVI value formatted to 2 decimals, and state
+    add_grouped_lines(
+        fig, df, 'State', 'Year', 'NDVI',
+        hovertemplate='Year: %{x}<br>NDVI: %{y:.2f}<br>State: %{fullData.name}'
     )
+    fig.update_layout(xaxis_title='Year', yaxis_title='Normalized Difference Vegetation Index')
     # Configure legend to be horizontal below the plot and set font styles
     fig.update_layout(
         legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center'),
@@ -42,7 +39,7 @@ def build_ndvi_graph(df):
     )
     return fig
 
-def build_evi_graph(df):
+def _build_evi_figure(df):
     """
     Builds a line graph showing EVI trends over years for different states.
 
@@ -55,24 +52,49 @@ def build_evi_graph(df):
     The graph uses distinct colors for each state and includes markers on data points.
     The layout includes a horizontally oriented legend below the graph.
     """
-    fig = px.line(
-        df,
-        x='Year',  # X-axis represents years
-        y='EVI',  # Y-axis represents EVI values
-        color='State',  # Lines colored by state
-        title=None,
-        labels={'EVI': 'Enhanced Vegetation Index', 'Year': 'Year'},
-        markers=True  # Show markers on data points
-    )
-    # Customize hover information to show year, EVI value formatted to 2 decimals, and state
-    fig.update_traces(
-        hovertemplate='Year: %{x}<br>EVI: %{y:.2f}<br>State: %{customdata[0]}',
-        customdata=df[['State']]  # Pass state information for hovertemplate
+    fig = go.Figure()
+    # One line per state (coloured like px.line) with markers on data points;
+    # hover shows year, EVI value formatted to 2 decimals, and state
+    add_grouped_lines(
+        fig, df, 'State', 'Year', 'EVI',
+        hovertemplate='Year: %{x}<br>EVI: %{y:.2f}<br>State: %{fullData.name}'
     )
+    fig.update_layout(xaxis_title='Year', yaxis_title='Enhanced Vegetation Index')
     # Configure legend to be horizontal below the plot and set font styles
     fig.update_layout(
         legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center'),
         title_font=dict(family="Arial, sans-serif", size=24, color="#000000"),
         font=dict(family="Arial, sans-serif", color="#000000")
     )
-    return fig
\ No newline at end of file
+    return fig
+
+_NDVI_TEMPLATE = FigureTemplate(_build_ndvi_figure)
+_EVI_TEMPLATE = FigureTemplate(_build_evi_figure)
+
+def _render_index_graph(template, df, column):
+    """Fill one line per state into the given index template."""
+    return template.render(df, group_traces(df, 'State', {'x': 'Year', 'y': column}))
+
+def build_ndvi_graph(df):
+    """
+    Builds a line graph showing NDVI trends over years for different states.
+
+    Parameters:
+    - df: DataFrame expected to have columns 'Year', 'NDVI', and 'State'.
+
+    Returns:
+    - A Plotly figure dict (binary-encoded arrays) visualizing NDVI trends.
+    """
+    return _render_index_graph(_NDVI_TEMPLATE, df, 'NDVI')
+
+def build_evi_graph(df):
+    """
+    Builds a line graph showing EVI trends over years for different states.
+
+    Parameters:
+    - df: DataFrame expected to have columns 'Year', 'EVI', and 'State'.
+
+    Returns:
+    - A Plotly figure dict (binary-encoded arrays) visualizing EVI trends.
+    """
+    return _render_index_graph(_EVI_TEMPLATE, df, 'EVI')
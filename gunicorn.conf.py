@@ -0,0 +1,68 @@
+"""
+Gunicorn configuration for the dashboard.
+
+By default every worker imports app.py and builds its own DataManager and Dash
+app. Setting GUNICORN_PRELOAD=1 enables preload mode instead:
+
+- the app, its data and precomputed figures are built once in the master
+  (preload_app, PRELOAD_FIGURES=1): the figure warm-up runs synchronously in
+  when_ready, before the workers fork;
+- the garbage collector is disabled while loading and gc.freeze() moves every
+  loaded object to the permanent generation right before the workers fork, so
+  collections in the workers never write to (and un-share) those pages;
+- the collector is re-enabled right after the freeze, so the long-lived master
+  and every worker (forked now or respawned later) collect their own,
+  later-allocated objects again.
+
+Otherwise each worker starts the figure warm-up in a background thread once it
+has loaded the app (post_worker_init). Importing app.py alone never starts it.
+
+Workers share one host-wide figure cache (SQLite in WAL mode, see
+utils/figure_cache.py) unless FIGURE_CACHE_BACKEND is set explicitly.
+
+Use `python -m tools.memory_report` to compare per-worker RSS/PSS/USS with and
+without preload mode. Worker count still comes from WEB_CONCURRENCY and the
+bind address from PORT, as gunicorn does by default.
+"""
+
+import gc
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0") == "1"
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+pidfile = os.environ.get("GUNICORN_PIDFILE") or None
+
+# Compute each figure once per host rather than once per worker
+os.environ.setdefault("FIGURE_CACHE_BACKEND", "sqlite")
+
+if preload_app:
+    os.environ.setdefault("PRELOAD_FIGURES", "1")
+    # Avoid freeing objects (and leaving holes in shared pages) while the app loads
+    gc.disable()
+
+
+def _precompute_in_master() -> bool:
+    from utils.preload import preload_enabled
+
+    return preload_app and preload_enabled()
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, just before workers are spawned."""
+    if _precompute_in_master():
+        from utils.warmup import install_warmup
+
+        app = server.app.wsgi()
+        install_warmup(app, app.extensions['data_manager'], background=False)
+    if preload_app:
+        gc.freeze()
+        gc.enable()
+        server.log.info("Preload mode: froze %d objects before fork", gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    """Runs in each worker after it has loaded the app."""
+    if not _precompute_in_master():
+        from utils.warmup import install_warmup
+
+        install_warmup(worker.wsgi, worker.wsgi.extensions['data_manager'])
@@ -9,103 +9,139 @@ expected are:
 - data/california/CA_Yearly_Avg_Precip.csv
 
 Each file contains monthly data which is processed to extract yearly averages,
-standardize column names, and filter data by year range.
+standardize column names, and sort by year. The full history is kept; year ranges
+are applied later as sorted-index slices (see DataManager.slice_years).
+
+Additional states are discovered from any data/<state>/<CODE>_Yearly_Avg_Temps.csv
+(and matching _Precip) files; the state name is read from the NOAA header line.
 """
 
+import glob
+import os
 import pandas as pd
+from typing import Dict, Tuple
+
+# File name suffix and standardized value column for each NOAA series
+SERIES_FILES = {
+    'temperature': ('Temps', 'AvgTemperature'),
+    'precipitation': ('Precip', 'AvgPrecip'),
+}
 
 class ClimateDataLoader:
     """Loader for climate time-series CSV data for Georgia and California.
 
     This class loads yearly average temperature and precipitation data from CSV files,
-    standardizes column names, converts date formats, extracts year information,
-    and filters the data to a specific year range.
+    standardizes column names, derives the year and month from the NOAA date and sorts the
+    rows by date. An optional start/end year trims the loaded history.
     """
 
-    def __init__(self):
-        self.start_year = 1980
-        self.end_year = 2022
+    def __init__(self, data_root='data', start_year=None, end_year=None):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.data_root = data_root
+
+    def discover_states(self) -> Dict[str, Tuple[str, str]]:
+        """Find every state with a complete set of NOAA series files under the data root.
+
+        A state directory missing one of the SERIES_FILES is skipped with a warning.
+
+        Returns:
+            dict: Mapping of state code (e.g. 'GA') to (state name, directory).
+        """
+        states = {}
+        pattern = os.path.join(self.data_root, '*', '*_Yearly_Avg_Temps.csv')
+        for path in sorted(glob.glob(pattern)):
+            code = os.path.basename(path).split('_')[0].upper()
+            # Same file names as load_state_series opens
+            missing = [suffix for suffix, _ in SERIES_FILES.values()
+                       if not os.path.exists(os.path.join(os.path.dirname(path), f'{code}_Yearly_Avg_{suffix}.csv'))]
+            if missing:
+                print(f"Skipping state {code}: no {', '.join(missing)} series in {os.path.dirname(path)}")
+                continue
+            with open(path) as f:
+                # NOAA header looks like '#  Georgia 12-Month Period Average Temperature'
+                header = f.readline()
+            name = header.lstrip('#').strip().split(' 12-Month')[0] or code
+            states[code] = (name, os.path.dirname(path))
+        return states
+
+    def load_state_series(self, directory, code, variable):
+        """Load one NOAA series for any state.
+
+        Args:
+            directory: Directory holding the state's CSV files.
+            code: Two-letter state code used as the file name prefix.
+            variable: 'temperature' or 'precipitation'.
+
+        Returns:
+            pd.DataFrame: Date-sorted DataFrame with 'Year', 'Month' and the standardized value column.
+        """
+        suffix, column = SERIES_FILES[variable]
+        return self._load_series(os.path.join(directory, f'{code}_Yearly_Avg_{suffix}.csv'), column)
+
+    def _load_series(self, path, column):
+        """Read a NOAA CSV, split 'Date' into 'Year' and 'Month', rename 'Value' to ``column`` and sort by date.
+
+        Each row is the 12-month period ending in its month, so 'Month' tells
+        apart the rows of one year; the parsed 'Date' itself is not kept.
+        """
+        # Read CSV, ignoring lines starting with '#' as comments
+        df = pd.read_csv(path, comment='#')
+        # Parse 'Date' column to datetime using format YYYYMM
+        date = pd.to_datetime(df['Date'], format='%Y%m')
+        # Keep the year and month of the parsed 'Date' and the value under its standardized name
+        df = pd.DataFrame({'Year': date.dt.year, 'Month': date.dt.month, column: df['Value']})
+        # Keep rows sorted by date so year ranges can be taken as contiguous slices
+        df = df.sort_values(['Year', 'Month'], kind='stable', ignore_index=True)
+        years = df['Year'].to_numpy()
+        lo = 0 if self.start_year is None else years.searchsorted(self.start_year, side='left')
+        hi = len(df) if self.end_year is None else years.searchsorted(self.end_year, side='right')
+        return df.iloc[lo:hi]
 
     def load_ga_temperature(self):
         """Load Georgia yearly average temperature data.
 
         Reads 'data/georgia/GA_Yearly_Avg_Temps.csv', ignoring commented lines.
-        Converts 'Date' from string format '%Y%m' to datetime, extracts year,
-        renames 'Value' column to 'AvgTemperature', and filters by year range.
+        Converts 'Date' from string format '%Y%m' to datetime, extracts year and month,
+        renames 'Value' column to 'AvgTemperature', and sorts by year.
 
         Returns:
-            pd.DataFrame: Filtered DataFrame with columns including 'Year' and 'AvgTemperature'.
+            pd.DataFrame: Year-sorted DataFrame with columns including 'Year' and 'AvgTemperature'.
         """
-        # Read CSV, ignoring lines starting with '#' as comments
-        df = pd.read_csv('data/georgia/GA_Yearly_Avg_Temps.csv', comment='#')
-        # Parse 'Date' column to datetime using format YYYYMM
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y%m')
-        # Extract year from the parsed 'Date'
-        df['Year'] = df['Date'].dt.year
-        # Rename 'Value' column to 'AvgTemperature' for clarity
-        df['AvgTemperature'] = df['Value']
-        # Filter rows to include only those within the specified year range
-        return df[(df['Year'] >= self.start_year) & (df['Year'] <= self.end_year)]
+        return self._load_series('data/georgia/GA_Yearly_Avg_Temps.csv', 'AvgTemperature')
 
     def load_ga_precipitation(self):
         """Load Georgia yearly average precipitation data.
 
         Reads 'data/georgia/GA_Yearly_Avg_Precip.csv', ignoring commented lines.
-        Converts 'Date' from string format '%Y%m' to datetime, extracts year,
-        renames 'Value' column to 'AvgPrecip', and filters by year range.
+        Converts 'Date' from string format '%Y%m' to datetime, extracts year and month,
+        renames 'Value' column to 'AvgPrecip', and sorts by year.
 
         Returns:
-            pd.DataFrame: Filtered DataFrame with columns including 'Year' and 'AvgPrecip'.
+            pd.DataFrame: Year-sorted DataFrame with columns including 'Year' and 'AvgPrecip'.
         """
-        # Read CSV, ignoring lines starting with '#' as comments
-        df = pd.read_csv('data/georgia/GA_Yearly_Avg_Precip.csv', comment='#')
-        # Parse 'Date' column to datetime using format YYYYMM
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y%m')
-        # Extract year from the parsed 'Date'
-        df['Year'] = df['Date'].dt.year
-        # Rename 'Value' column to 'AvgPrecip' for clarity
-        df['AvgPrecip'] = df['Value']
-        # Filter rows to include only those within the specified year range
-        return df[(df['Year'] >= self.start_year) & (df['Year'] <= self.end_year)]
+        return self._load_series('data/georgia/GA_Yearly_Avg_Precip.csv', 'AvgPrecip')
 
     def load_ca_temperature(self):
         """Load California yearly average temperature data.
 
         Reads 'data/california/CA_Yearly_Avg_Temps.csv', ignoring commented lines.
-        Converts 'Date' from string format '%Y%m' to datetime, extracts year,
-        renames 'Value' column to 'AvgTemperature', and filters by year range.
+        Converts 'Date' from string format '%Y%m' to datetime, extracts year and month,
+        renames 'Value' column to 'AvgTemperature', and sorts by year.
 
         Returns:
-            pd.DataFrame: Filtered DataFrame with columns including 'Year' and 'AvgTemperature'.
+            pd.DataFrame: Year-sorted DataFrame with columns including 'Year' and 'AvgTemperature'.
         """
-        # Read CSV, ignoring lines starting with '#' as comments
-        df = pd.read_csv('data/california/CA_Yearly_Avg_Temps.csv', comment='#')
-        # Parse 'Date' column to datetime using format YYYYMM
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y%m')
-        # Extract year from the parsed 'Date'
-        df['Year'] = df['Date'].dt.year
-        # Rename 'Value' column to 'AvgTemperature' for clarity
-        df['AvgTemperature'] = df['Value']
-        # Filter rows to include only those within the specified year range
-        return df[(df['Year'] >= self.start_year) & (df['Year'] <= self.end_year)]
+        return self._load_series('data/california/CA_Yearly_Avg_Temps.csv', 'AvgTemperature')
 
     def load_ca_precipitation(self):
         """Load California yearly average precipitation data.
 
         Reads 'data/california/CA_Yearly_Avg_Precip.csv', ignoring commented lines.
-        Converts 'Date' from string format '%Y%m' to datetime, extracts year,
-        renames 'Value' column to 'AvgPrecip', and filters by year range.
+        Converts 'Date' from string format '%Y%m' to datetime, extracts year and month,
+        renames 'Value' column to 'AvgPrecip', and sorts by year.
 
         Returns:
-            pd.DataFrame: Filtered DataFrame with columns including 'Year' and 'AvgPrecip'.
+            pd.DataFrame: Year-sorted DataFrame with columns including 'Year' and 'AvgPrecip'.
         """
-        # Read CSV, ignoring lines starting with '#' as comments
-        df = pd.read_csv('data/california/CA_Yearly_Avg_Precip.csv', comment='#')
-        # Parse 'Date' column to datetime using format YYYYMM
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y%m')
-        # Extract year from the parsed 'Date'
-        df['Year'] = df['Date'].dt.year
-        # Rename 'Value' column to 'AvgPrecip' for clarity
-        df['AvgPrecip'] = df['Value']
-        # Filter rows to include only those within the specified year range
-        return df[(df['Year'] >= self.start_year) & (df['Year'] <= self.end_year)]
\ No newline at end of file
+        return self._load_series('data/california/CA_Yearly_Avg_Precip.csv', 'AvgPrecip')
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Per-year fire-frequency raster stack.
+
+Per-year fire rasters are warped to Web Mercator (see maps.reproject) and
+ingested once into a single uint8 (year × row × col) array saved as a
+memory-mappable .npy file, next to a JSON sidecar holding the years, the
+georeferencing and the overlay bounds derived from it. At runtime the stack
+is opened with mmap_mode='r', so one year's plane is a zero-copy view backed
+by the OS page cache. A plane is colourized through a 256-entry RGBA lookup
+table (written as the palette of an indexed PNG, so the pixels are never
+expanded to RGBA) and the encoded overlay frames are memoized per year.
+
+Configuration is read from environment variables:
+- FIRE_STACK_DIR: Directory of the ingested stack (default 'data/california/fire_stack').
+
+rasterio is only needed for ingestion and Pillow only for encoding frames;
+both are imported lazily.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+from affine import Affine
+
+STACK_DIR = os.environ.get("FIRE_STACK_DIR", "data/california/fire_stack")
+FRAMES_FILE = "frames.npy"
+META_FILE = "meta.json"
+
+
+def fire_lut(vmax: int) -> np.ndarray:
+    """
+    Build the RGBA lookup table used to colourize stack planes.
+
+    Index 0 (no fire) is fully transparent; 1..vmax follow matplotlib's
+    'gist_heat' ramp so frames match the original static overlay.
+
+    Args:
+        vmax: Value mapped to the top of the colour ramp
+
+    Returns:
+        np.ndarray: (256, 4) uint8 table
+    """
+    x = np.clip(np.arange(256, dtype=np.float64) / max(int(vmax), 1), 0.0, 1.0)
+    rgb = np.stack([np.clip(1.5 * x, 0, 1), np.clip(2 * x - 1, 0, 1), np.clip(4 * x - 3, 0, 1)], axis=1)
+    lut = np.empty((256, 4), dtype=np.uint8)
+    lut[:, :3] = np.round(rgb * 255)
+    lut[:, 3] = 200
+    lut[0] = 0
+    return lut
+
+
+def _to_uint8(band: np.ndarray, nodata) -> np.ndarray:
+    """Convert one raster band to fire counts in 0..255 (0 for nodata, NaN and non-positive)."""
+    values = np.asarray(band, dtype=np.float64)
+    invalid = ~np.isfinite(values) | (values <= 0)
+    if nodata is not None:
+        invalid |= values == nodata
+    values = np.where(invalid, 0, np.clip(np.round(values), 1, 255))
+    return values.astype(np.uint8)
+
+
+def encode_overlay_png(plane: np.ndarray, lut: np.ndarray) -> bytes:
+    """
+    Colourize a uint8 plane through an RGBA lookup table and encode it as PNG.
+
+    The plane is handed to Pillow as an indexed image whose palette and
+    transparency are the LUT, so colourizing costs no per-pixel work.
+    """
+    from PIL import Image
+
+    plane = np.ascontiguousarray(plane)
+    image = Image.frombuffer('P', (plane.shape[1], plane.shape[0]), plane, 'raw', 'P', 0, 1)
+    image.putpalette(lut[:, :3].tobytes())
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', transparency=lut[:, 3].tobytes())
+    return buffer.getvalue()
+
+
+def ingest_fire_rasters(paths_by_year: Dict[int, str], out_dir: str = STACK_DIR) -> Dict:
+    """
+    Ingest per-year fire rasters into a memory-mappable uint8 stack.
+
+    Each raster is first warped to Web Mercator with nearest-neighbour
+    resampling (cached per source file), and every warped raster must share
+    the first one's grid. Planes are written one year at a time, so the whole
+    stack is never held in memory.
+
+    Args:
+        paths_by_year: Mapping of year -> GeoTIFF path (band 1 is read)
+        out_dir: Output directory for frames.npy and meta.json
+
+    Returns:
+        dict: The written metadata
+    """
+    import rasterio
+
+    from maps.reproject import overlay_bounds, warp_to_web_mercator
+
+    if not paths_by_year:
+        raise ValueError("No rasters to ingest")
+    years = sorted(paths_by_year)
+    os.makedirs(out_dir, exist_ok=True)
+    digest = hashlib.sha1()
+    frames = None
+    reference = None
+    vmax = 0
+    for index, year in enumerate(years):
+        path = paths_by_year[year]
+        with rasterio.open(warp_to_web_mercator(path, 'categorical')) as src:
+            grid = (src.height, src.width, tuple(src.transform)[:6], src.crs.to_wkt())
+            if reference is None:
+                reference = grid
+                frames = np.lib.format.open_memmap(
+                    os.path.join(out_dir, FRAMES_FILE), mode='w+', dtype=np.uint8,
+                    shape=(len(years), src.height, src.width)
+                )
+            elif grid != reference:
+                raise ValueError(f"{path} does not share the grid of {paths_by_year[years[0]]}")
+            plane = _to_uint8(src.read(1), src.nodata)
+        frames[index] = plane
+        vmax = max(vmax, int(plane.max()))
+        digest.update(f"{year}:".encode("utf-8"))
+        digest.update(plane.tobytes())
+        print(f"Ingested {year} from {path}")
+    frames.flush()
+    del frames
+
+    height, width, transform, crs = reference
+    meta = {
+        "years": years,
+        "height": height,
+        "width": width,
+        "transform": list(transform),
+        "crs": crs,
+        "bounds": overlay_bounds(rasterio.Affine(*transform), width, height, crs),
+        "vmax": vmax,
+        "tag": digest.hexdigest(),
+    }
+    with open(os.path.join(out_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class FireStack:
+    """
+    Read-only view of an ingested fire stack.
+    """
+
+    def __init__(self, directory: str = STACK_DIR):
+        """Open the stack's metadata and memory-map its frames."""
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.frames = np.load(os.path.join(directory, FRAMES_FILE), mmap_mode='r')
+        self.years: List[int] = [int(year) for year in self.meta["years"]]
+        self.tag: str = self.meta["tag"]
+        self.lut = fire_lut(self.meta["vmax"])
+        a, b, c, d, e, f = self.meta["transform"]
+        self.transform = Affine(a, b, c, d, e, f)
+        self._index = {year: i for i, year in enumerate(self.years)}
+        self._lock = threading.Lock()
+        self._png: Dict[int, bytes] = {}
+
+    @property
+    def bounds(self) -> List[List[float]]:
+        """Overlay bounds [[south, west], [north, east]], derived from the transform at ingest."""
+        return self.meta["bounds"]
+
+    def plane(self, year: int) -> np.ndarray:
+        """Return one year's (row × col) uint8 plane as a zero-copy view of the memmap."""
+        try:
+            return self.frames[self._index[year]]
+        except KeyError:
+            raise KeyError(f"No fire raster for {year}; available {self.years[0]}–{self.years[-1]}")
+
+    def frame_png(self, year: int) -> bytes:
+        """Return one year's colourized overlay as PNG bytes (memoized per year)."""
+        png = self._png.get(year)
+        if png is not None:
+            return png
+        png = encode_overlay_png(self.plane(year), self.lut)
+        with self._lock:
+            self._png[year] = png
+        return png
+
+
+@lru_cache(maxsize=None)
+def load_fire_stack(directory: str = STACK_DIR) -> Optional[FireStack]:
+    """
+    Open the ingested fire stack once per process.
+
+    Returns:
+        FireStack or None: None when no stack has been ingested
+    """
+    if not os.path.exists(os.path.join(directory, META_FILE)):
+        print(f"No fire raster stack in {directory}; run 'python -m tools.ingest_fire_rasters' to build it.")
+        return None
+    try:
+        return FireStack(directory)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error opening fire raster stack in {directory}: {e}")
+        return None
@@ -0,0 +1,217 @@
+"""
+NDVI/EVI raster ingestion and computed vegetation change maps.
+
+Annual vegetation-index GeoTIFFs (e.g. MODIS MOD13A2 yearly means exported
+from Google Earth Engine) are stored as <STATE>_<INDEX>_<YEAR>.tif, such as
+CA_NDVI_2001.tif, in NDVI_RASTER_DIR. From them:
+
+- statewide_mean reads a raster block by block (one internal tile at a
+  time), so a statewide mean never loads the whole raster; vegetation_table
+  turns those means into the rows of Vegetation_Index_California_Georgia.csv.
+- ndvi_change_png renders the NDVI difference between any two years. Both
+  rasters are warped to Web Mercator once (maps.reproject, bilinear), the
+  difference is streamed block by block into a uint8 index grid and encoded
+  through a diverging lookup table; the PNG is cached on disk keyed by the
+  content hashes of both sources, so a year pair is only computed once.
+
+Configuration is read from environment variables:
+- NDVI_RASTER_DIR: Directory of the vegetation-index rasters (default 'data/vegetation/rasters').
+- NDVI_CACHE_DIR: Directory of rendered change maps (default 'data/cache/ndvi').
+
+rasterio is imported lazily.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from maps.fire_stack import encode_overlay_png
+from maps.reproject import overlay_bounds, source_hash, warp_to_web_mercator
+
+RASTER_DIR = os.environ.get("NDVI_RASTER_DIR", "data/vegetation/rasters")
+CACHE_DIR = os.environ.get("NDVI_CACHE_DIR", "data/cache/ndvi")
+
+INDICES = ('NDVI', 'EVI')
+_FILE_NAME = re.compile(r'^([A-Za-z]{2})_(NDVI|EVI)_(\d{4})\.tif{1,2}$', re.IGNORECASE)
+
+# MODIS stores vegetation indices as integers scaled by 10000
+MODIS_SCALE = 0.0001
+# Physically valid index range; anything outside is treated as fill
+VALID_RANGE = (-0.2, 1.0)
+# NDVI change at which the diverging colour ramp saturates
+CHANGE_LIMIT = 0.3
+
+
+def discover_rasters(directory: str = RASTER_DIR) -> Dict[Tuple[str, str, int], str]:
+    """
+    Find the vegetation-index rasters in a directory.
+
+    Returns:
+        dict: (state code, index, year) -> path
+    """
+    if not os.path.isdir(directory):
+        return {}
+    rasters = {}
+    for name in sorted(os.listdir(directory)):
+        match = _FILE_NAME.match(name)
+        if match:
+            rasters[(match.group(1).upper(), match.group(2).upper(), int(match.group(3)))] = os.path.join(directory, name)
+    return rasters
+
+
+@lru_cache(maxsize=None)
+def available_years(directory: str = RASTER_DIR) -> Dict[str, List[int]]:
+    """Return the NDVI raster years available per state code (scanned once per process)."""
+    years: Dict[str, List[int]] = {}
+    for state, index, year in discover_rasters(directory):
+        if index == 'NDVI':
+            years.setdefault(state, []).append(year)
+    return {state: sorted(values) for state, values in years.items()}
+
+
+def _scaled(values: np.ma.MaskedArray, scale: float) -> np.ma.MaskedArray:
+    """Apply the index scale factor and mask values outside VALID_RANGE."""
+    values = values.astype(np.float64) * scale
+    return np.ma.masked_outside(np.ma.masked_invalid(values), *VALID_RANGE)
+
+
+def _scale_of(src) -> float:
+    """Scale factor of band 1: the file's own, else MODIS' for integer data."""
+    if src.scales and src.scales[0] not in (None, 1.0):
+        return float(src.scales[0])
+    return MODIS_SCALE if np.dtype(src.dtypes[0]).kind in 'iu' else 1.0
+
+
+def statewide_mean(path: str) -> float:
+    """
+    Mean of a vegetation-index raster over its valid pixels, read block by block.
+
+    Args:
+        path: GeoTIFF path (band 1 is read)
+
+    Returns:
+        float: Mean index value, NaN when no pixel is valid
+    """
+    import rasterio
+
+    total, count = 0.0, 0
+    with rasterio.open(path) as src:
+        scale = _scale_of(src)
+        for _, window in src.block_windows(1):
+            values = _scaled(src.read(1, window=window, masked=True), scale)
+            total += float(values.sum()) if values.count() else 0.0
+            count += int(values.count())
+    return total / count if count else float('nan')
+
+
+def vegetation_table(rasters: Dict[Tuple[str, str, int], str], state_names: Dict[str, str]) -> pd.DataFrame:
+    """
+    Compute statewide NDVI/EVI means for every (state, year) with rasters.
+
+    Args:
+        rasters: Output of discover_rasters
+        state_names: State code -> full name as used in the CSV's 'State' column
+
+    Returns:
+        pd.DataFrame: Year, State, NDVI, EVI rows (missing indices are NaN)
+    """
+    rows: Dict[Tuple[int, str], Dict] = {}
+    for (state, index, year), path in sorted(rasters.items()):
+        row = rows.setdefault((year, state), {'Year': year, 'State': state_names.get(state, state)})
+        row[index] = round(statewide_mean(path), 2)
+        print(f"{state} {index} {year}: {row[index]}")
+    return pd.DataFrame(list(rows.values()), columns=['Year', 'State', *INDICES])
+
+
+def change_lut() -> np.ndarray:
+    """
+    Diverging RGBA lookup table for NDVI change.
+
+    Index 0 is transparent (no data); 1..255 run from brown (loss of
+    -CHANGE_LIMIT or more) through white (no change) to green (gain).
+    """
+    anchors = np.array([[140, 81, 10], [247, 247, 247], [1, 102, 94]], dtype=np.float64)
+    x = np.linspace(0.0, 2.0, 255)
+    lower = np.floor(x).clip(0, 1).astype(int)
+    t = (x - lower)[:, None]
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    lut[1:, :3] = np.round(anchors[lower] * (1 - t) + anchors[lower + 1] * t)
+    lut[1:, 3] = 210
+    return lut
+
+
+def _change_index(change: np.ma.MaskedArray) -> np.ndarray:
+    """Map an NDVI change block to LUT indices 1..255 (0 where masked)."""
+    scaled = np.clip(change.filled(0.0) / CHANGE_LIMIT, -1.0, 1.0)
+    index = np.round((scaled + 1.0) * 127.0).astype(np.uint8) + 1
+    index[np.ma.getmaskarray(change)] = 0
+    return index
+
+
+def change_cache_paths(state: str, year_from: int, year_to: int, path_from: str, path_to: str,
+                       cache_dir: str = CACHE_DIR) -> Tuple[str, str]:
+    """Return the (PNG, metadata JSON) cache paths of a change map, keyed by both sources' content hashes."""
+    key = f"{state}-{year_from}-{year_to}-{source_hash(path_from)[:12]}-{source_hash(path_to)[:12]}"
+    return os.path.join(cache_dir, f"{key}.png"), os.path.join(cache_dir, f"{key}.json")
+
+
+@lru_cache(maxsize=32)
+def ndvi_change_png(state: str, year_from: int, year_to: int, directory: str = RASTER_DIR,
+                    cache_dir: str = CACHE_DIR) -> Tuple[bytes, List[List[float]]]:
+    """
+    Render the NDVI change between two years as a transparent PNG overlay.
+
+    Cached on disk across processes and in memory per process.
+
+    Args:
+        state: State code
+        year_from: Earlier year
+        year_to: Later year
+        directory: Directory of the vegetation-index rasters
+        cache_dir: Directory of rendered change maps
+
+    Returns:
+        tuple: (PNG bytes, overlay bounds [[south, west], [north, east]])
+    """
+    import rasterio
+
+    rasters = discover_rasters(directory)
+    try:
+        path_from, path_to = rasters[(state, 'NDVI', year_from)], rasters[(state, 'NDVI', year_to)]
+    except KeyError:
+        raise LookupError(f"No NDVI rasters for {state} {year_from} and {year_to}")
+
+    png_path, meta_path = change_cache_paths(state, year_from, year_to, path_from, path_to, cache_dir)
+    if os.path.exists(png_path) and os.path.exists(meta_path):
+        with open(png_path, 'rb') as f, open(meta_path) as m:
+            return f.read(), json.load(m)['bounds']
+
+    # Scale factors come from the sources; the warped copies do not carry them
+    with rasterio.open(path_from) as src_from, rasterio.open(path_to) as src_to:
+        scale_from, scale_to = _scale_of(src_from), _scale_of(src_to)
+    with rasterio.open(warp_to_web_mercator(path_from, 'continuous')) as src_from, \
+            rasterio.open(warp_to_web_mercator(path_to, 'continuous')) as src_to:
+        if (src_from.shape, src_from.transform) != (src_to.shape, src_to.transform):
+            raise ValueError(f"{path_from} and {path_to} are not on the same grid")
+        index = np.zeros(src_from.shape, dtype=np.uint8)
+        for _, window in src_from.block_windows(1):
+            change = (_scaled(src_to.read(1, window=window, masked=True), scale_to)
+                      - _scaled(src_from.read(1, window=window, masked=True), scale_from))
+            rows, cols = window.toslices()
+            index[rows, cols] = _change_index(change)
+        bounds = overlay_bounds(src_from.transform, src_from.width, src_from.height, src_from.crs)
+
+    png = encode_overlay_png(index, change_lut())
+    os.makedirs(cache_dir, exist_ok=True)
+    # Renamed into place (metadata first), so readers only see complete files
+    for path, content in ((meta_path, json.dumps({'bounds': bounds}).encode('utf-8')), (png_path, png)):
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'wb') as f:
+            f.write(content)
+        os.replace(partial, path)
+    return png, bounds
@@ -0,0 +1,113 @@
+"""
+Cached reprojection of source rasters to Web Mercator.
+
+Leaflet and folium draw image overlays on a Web Mercator (EPSG:3857) map, so
+an overlay cut from a raster in any other CRS is stretched out of place.
+warp_to_web_mercator warps a source raster to EPSG:3857 once, with nearest
+neighbour resampling for categorical data (fire counts, classes) and bilinear
+for continuous fields (NDVI, temperature), and stores the result as a tiled
+GeoTIFF keyed by the source file's content hash and the resampling kind.
+Later calls, from any process, reuse the cached file; a changed source gets a
+new hash and is warped again.
+
+Overlay bounds are always derived from the raster's own affine transform and
+CRS (overlay_bounds), never typed in by hand.
+
+Configuration is read from environment variables:
+- REPROJECT_CACHE_DIR: Directory of warped rasters (default 'data/cache/reprojected').
+
+rasterio is imported lazily.
+"""
+
+import hashlib
+import os
+from typing import List
+
+CACHE_DIR = os.environ.get("REPROJECT_CACHE_DIR", "data/cache/reprojected")
+WEB_MERCATOR = "EPSG:3857"
+
+# Resampling method name for each kind of raster data
+RESAMPLING = {
+    'categorical': 'nearest',
+    'continuous': 'bilinear',
+}
+
+
+def source_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-1 hex digest of a file's content."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def overlay_bounds(transform, width: int, height: int, crs) -> List[List[float]]:
+    """
+    Compute Leaflet overlay bounds from a raster's affine transform.
+
+    Args:
+        transform: Affine transform of the raster grid
+        width: Raster width in pixels
+        height: Raster height in pixels
+        crs: CRS of the transform
+
+    Returns:
+        list: [[south, west], [north, east]] in degrees
+    """
+    from rasterio.transform import array_bounds
+    from rasterio.warp import transform_bounds
+
+    west, south, east, north = array_bounds(height, width, transform)
+    west, south, east, north = transform_bounds(crs, "EPSG:4326", west, south, east, north)
+    return [[south, west], [north, east]]
+
+
+def warp_to_web_mercator(path: str, kind: str = 'continuous', cache_dir: str = CACHE_DIR) -> str:
+    """
+    Warp band 1 of a raster to Web Mercator, reusing a cached result.
+
+    Args:
+        path: Source GeoTIFF path
+        kind: 'categorical' (nearest neighbour) or 'continuous' (bilinear)
+        cache_dir: Directory of warped rasters
+
+    Returns:
+        str: Path of the warped GeoTIFF
+    """
+    import numpy as np
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.warp import calculate_default_transform, reproject
+
+    if kind not in RESAMPLING:
+        raise ValueError(f"kind must be one of {sorted(RESAMPLING)}")
+    stem = os.path.splitext(os.path.basename(path))[0]
+    target = os.path.join(cache_dir, f"{stem}-{source_hash(path)[:16]}-{kind}.tif")
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with rasterio.open(path) as src:
+        if src.crs is None:
+            raise ValueError(f"{path} has no CRS")
+        transform, width, height = calculate_default_transform(
+            src.crs, WEB_MERCATOR, src.width, src.height, *src.bounds
+        )
+        nodata = src.nodata if src.nodata is not None else (np.nan if np.dtype(src.dtypes[0]).kind == 'f' else 0)
+        profile = src.profile.copy()
+        profile.update(crs=WEB_MERCATOR, transform=transform, width=width, height=height, count=1,
+                       nodata=nodata, driver='GTiff', tiled=True, blockxsize=256, blockysize=256, compress='lzw')
+        # Written under a temporary name and renamed, so concurrent readers never see a partial file
+        partial = f"{target}.{os.getpid()}.tmp"
+        with rasterio.open(partial, 'w', **profile) as dst:
+            reproject(
+                source=rasterio.band(src, 1),
+                destination=rasterio.band(dst, 1),
+                src_nodata=src.nodata,
+                dst_nodata=nodata,
+                resampling=getattr(Resampling, RESAMPLING[kind])
+            )
+    os.replace(partial, target)
+    print(f"Reprojected {path} to {WEB_MERCATOR} ({RESAMPLING[kind]}) -> {target}")
+    return target
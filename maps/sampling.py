@@ -0,0 +1,121 @@
+"""
+Vectorized point sampling of georeferenced rasters.
+
+sample_grid converts a batch of lat/lon points to pixel indices with one
+inverse-affine product over NumPy arrays and gathers the values with a single
+fancy-indexing read, so hundreds of points cost about as much as one.
+
+RasterSampler serves a GeoTIFF's band 1 from a memory-mapped .npy copy that
+is materialized once per source file (keyed by its content hash), so a
+request never opens the GeoTIFF; the fire stack (maps.fire_stack) is sampled
+through the same function on its memory-mapped planes.
+
+Configuration is read from environment variables:
+- RASTER_CACHE_DIR: Directory of the .npy raster copies (default 'data/cache/rasters').
+
+rasterio is imported lazily, and only to open a source once or to convert
+lat/lon to a CRS other than WGS 84.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from maps.reproject import source_hash
+
+CACHE_DIR = os.environ.get("RASTER_CACHE_DIR", "data/cache/rasters")
+
+# State code -> fire-frequency GeoTIFF sampled by /api/raster/sample
+STATE_FIRE_RASTERS = {
+    'CA': "data/california/California_FireFrequency_2001_2022.tif",
+}
+
+
+def _is_wgs84(crs) -> bool:
+    from rasterio.crs import CRS
+
+    return CRS.from_user_input(crs) == CRS.from_epsg(4326)
+
+
+def sample_grid(grid: np.ndarray, transform, crs, lats: np.ndarray, lons: np.ndarray,
+                nodata=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read grid values at many lat/lon points at once.
+
+    Args:
+        grid: 2-D (row × col) array, typically a memmap
+        transform: Affine transform of the grid
+        crs: CRS of the transform
+        lats: Latitudes in degrees
+        lons: Longitudes in degrees
+        nodata: Grid value treated as missing
+
+    Returns:
+        tuple: (values as float64 with NaN for missing or outside points, inside mask)
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    if crs is None or _is_wgs84(crs):
+        xs, ys = lons, lats
+    else:
+        from rasterio.warp import transform as transform_points
+
+        xs, ys = (np.asarray(v) for v in transform_points("EPSG:4326", crs, lons, lats))
+    # Inverse affine for the whole batch: (col, row) = ~transform * (x, y)
+    inverse = ~transform
+    cols = np.floor(inverse.a * xs + inverse.b * ys + inverse.c).astype(np.int64)
+    rows = np.floor(inverse.d * xs + inverse.e * ys + inverse.f).astype(np.int64)
+    inside = (rows >= 0) & (rows < grid.shape[0]) & (cols >= 0) & (cols < grid.shape[1])
+
+    values = np.full(lats.shape, np.nan)
+    values[inside] = grid[rows[inside], cols[inside]]
+    if nodata is not None and not np.isnan(nodata):
+        values[values == nodata] = np.nan
+    return values, inside
+
+
+class RasterSampler:
+    """
+    Samples band 1 of a GeoTIFF from a memory-mapped copy.
+    """
+
+    def __init__(self, path: str, cache_dir: str = CACHE_DIR):
+        """Memory-map the raster, materializing the .npy copy on first use."""
+        import rasterio
+
+        self.path = path
+        self.tag = source_hash(path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        target = self.cache_path = os.path.join(cache_dir, f"{stem}-{self.tag[:16]}.npy")
+        with rasterio.open(path) as src:
+            self.transform = src.transform
+            self.crs = src.crs
+            self.nodata = src.nodata
+            if not os.path.exists(target):
+                os.makedirs(cache_dir, exist_ok=True)
+                partial = f"{target}.{os.getpid()}.tmp.npy"
+                np.save(partial, src.read(1))
+                os.replace(partial, target)
+        self.grid = np.load(target, mmap_mode='r')
+
+    def sample(self, lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (values, inside mask) at the given points; see sample_grid."""
+        return sample_grid(self.grid, self.transform, self.crs, lats, lons, self.nodata)
+
+
+@lru_cache(maxsize=None)
+def load_sampler(path: str) -> Optional[RasterSampler]:
+    """Open a RasterSampler once per process; None when the raster cannot be read."""
+    try:
+        return RasterSampler(path)
+    except (OSError, ValueError) as e:
+        print(f"Error opening raster {path} for sampling: {e}")
+        return None
+
+
+def fire_samplers() -> Dict[str, RasterSampler]:
+    """Return the readable fire-frequency samplers by state code."""
+    samplers = {code: load_sampler(path) for code, path in STATE_FIRE_RASTERS.items()}
+    return {code: sampler for code, sampler in samplers.items() if sampler is not None}
@@ -1,45 +1,96 @@
-""" 
-This module generates a wildfire frequency map for California using raster data.
-It utilizes rasterio for reading GeoTIFF files, matplotlib for creating image overlays,
+"""
+This module generates wildfire frequency maps from fire-frequency rasters.
+It utilizes rasterio for reading GeoTIFF files, Pillow for writing image overlays,
 and folium for generating interactive HTML maps with overlays.
 
+Each raster is warped to Web Mercator once (maps.reproject, cached by source
+hash) so its pixels line up with the map tiles, and its overlay bounds come
+from the warped raster's affine transform. Several rasters (e.g. one per
+state) can share one map.
+
 Output:
-- A transparent PNG overlay representing fire frequency
-- An interactive HTML map with the overlay
+- A transparent PNG overlay per raster representing fire frequency
+- An interactive HTML map with the overlays
+
+rasterio and folium are imported inside the functions so that importing
+this module stays cheap for the web app.
 """
 
-import rasterio
-import numpy as np
-import matplotlib.pyplot as plt
-import folium
-
-def generate_wildfire_map():
-    # Load and read raster data
-    with rasterio.open("data/california/California_FireFrequency_2001_2022.tif") as src:
-        data = src.read(1)
-
-    # Normalize and clean data
-    normed_data = data.astype(float)
-    # Replace non-positive values with NaN to ignore them in normalization
-    normed_data[normed_data <= 0] = np.nan
-    normed_data = normed_data / np.nanmax(normed_data)
-
-    # Create and save PNG overlay
-    plt.figure(figsize=(8, 10), dpi=300)
-    # Use 'gist_heat' colormap to represent fire frequency intensity
-    plt.imshow(normed_data, cmap='gist_heat', interpolation='nearest', vmin=0, vmax=1)
-    plt.axis('off')
-    plt.savefig("assets/maps/California_FireFrequency_Overlay.png", bbox_inches='tight', pad_inches=0, transparent=True)
-    plt.close()
-
-    # Create and save Folium map
-    wildfire_map = folium.Map(location=[36.5, -119], zoom_start=6)
-    # Add image overlay with bounds matching California's geographic extent
-    folium.raster_layers.ImageOverlay(
-        image='assets/maps/California_FireFrequency_Overlay.png',
-        bounds=[[32.0, -124.4], [42.1, -114.1]],
-        opacity=0.6,  # Set overlay transparency
-        name='Fire Frequency'
-    ).add_to(wildfire_map)
+import os
+from functools import lru_cache
+
+from maps.fire_stack import _to_uint8, encode_overlay_png, fire_lut
+from maps.reproject import overlay_bounds, warp_to_web_mercator
+
+# Overlay layer name -> fire-frequency GeoTIFF
+FIRE_RASTERS = {
+    'California Fire Frequency': "data/california/California_FireFrequency_2001_2022.tif",
+}
+
+def overlay_filename(path):
+    """File name of the PNG overlay generated for a raster."""
+    return os.path.splitext(os.path.basename(path))[0] + "_Overlay.png"
+
+@lru_cache(maxsize=None)
+def cumulative_overlay(name='California Fire Frequency'):
+    """
+    Locates the generated overlay of one FIRE_RASTERS layer for the dashboard map.
+
+    Parameters:
+    - name: Layer name in FIRE_RASTERS.
+
+    Returns:
+    - (url, bounds) of the overlay under /static, with bounds from the warped raster.
+    """
+    import rasterio
+
+    with rasterio.open(warp_to_web_mercator(FIRE_RASTERS[name], 'categorical')) as src:
+        bounds = overlay_bounds(src.transform, src.width, src.height, src.crs)
+    return f"/static/{overlay_filename(FIRE_RASTERS[name])}", bounds
+
+def generate_wildfire_map(rasters=None, overlay_dir="static", html_path="assets/california_fire_map.html"):
+    """
+    Generates the interactive fire-frequency map.
+
+    Parameters:
+    - rasters: Mapping of layer name -> GeoTIFF path (default FIRE_RASTERS).
+    - overlay_dir: Directory the PNG overlays are written to.
+    - html_path: Output path of the folium map.
+
+    Returns:
+    - The path of the written HTML map.
+    """
+    import rasterio
+    import folium
+
+    rasters = rasters or FIRE_RASTERS
+    layers = []
+    for name, path in rasters.items():
+        # Fire counts are categorical: nearest-neighbour warp keeps them exact
+        with rasterio.open(warp_to_web_mercator(path, 'categorical')) as src:
+            counts = _to_uint8(src.read(1), src.nodata)
+            bounds = overlay_bounds(src.transform, src.width, src.height, src.crs)
+
+        # Create and save PNG overlay, one pixel per warped raster cell
+        overlay_path = os.path.join(overlay_dir, overlay_filename(path))
+        with open(overlay_path, "wb") as f:
+            f.write(encode_overlay_png(counts, fire_lut(int(counts.max()))))
+        layers.append((name, overlay_path, bounds))
+
+    # Center the map on the union of all overlays
+    south = min(b[0][0] for _, _, b in layers)
+    west = min(b[0][1] for _, _, b in layers)
+    north = max(b[1][0] for _, _, b in layers)
+    east = max(b[1][1] for _, _, b in layers)
+    wildfire_map = folium.Map(location=[(south + north) / 2, (west + east) / 2], zoom_start=6)
+    for name, overlay_path, bounds in layers:
+        folium.raster_layers.ImageOverlay(
+            image=overlay_path,
+            bounds=bounds,
+            opacity=0.6,  # Set overlay transparency
+            name=name
+        ).add_to(wildfire_map)
+    wildfire_map.fit_bounds([[south, west], [north, east]])
     folium.LayerControl().add_to(wildfire_map)
-    wildfire_map.save("assets/maps/california_fire_map.html")
\ No newline at end of file
+    wildfire_map.save(html_path)
+    return html_path
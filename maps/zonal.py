@@ -0,0 +1,190 @@
+"""
+Zonal statistics of fire frequency inside user-drawn polygons.
+
+A GeoJSON polygon (lon/lat) is transformed to the raster's CRS, its bounding
+box is turned into a pixel window, and only that window of the memory-mapped
+raster (see maps.sampling and maps.fire_stack) is read. The polygon is then
+rasterized against the window's own transform and the statistics are
+computed with NumPy masks, so the cost scales with the polygon's extent, not
+the raster's size.
+
+Results are stored in the shared figure cache keyed by the raster's content
+tag and a hash of the canonicalized geometry, so a repeated polygon is
+answered from the cache by any worker, and overlapping polygons re-read pages
+the OS already holds.
+
+rasterio is imported lazily.
+"""
+
+import hashlib
+import json
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from maps.fire_stack import load_fire_stack
+from maps.sampling import STATE_FIRE_RASTERS, load_sampler
+from utils.figure_cache import figure_cache
+
+POLYGON_TYPES = ('Polygon', 'MultiPolygon')
+# Decimal places kept when canonicalizing coordinates (~1 cm)
+COORDINATE_PRECISION = 7
+
+
+def _is_position(value: Any) -> bool:
+    """Whether a value is a [lon, lat] (or [lon, lat, z]) position of finite numbers."""
+    return (isinstance(value, list) and len(value) in (2, 3)
+            and all(isinstance(c, (int, float)) and not isinstance(c, bool) and math.isfinite(c) for c in value))
+
+
+def _check_polygon(rings: Any):
+    """Raise ValueError unless ``rings`` are Polygon coordinates: rings of at least 4 positions."""
+    if not isinstance(rings, list) or not rings:
+        raise ValueError("Polygon coordinates must be a non-empty list of rings")
+    for ring in rings:
+        if not isinstance(ring, list) or len(ring) < 4 or not all(_is_position(p) for p in ring):
+            raise ValueError("Each polygon ring must be a list of at least 4 [lon, lat] number pairs")
+
+
+def _geometry(value: Dict) -> Dict:
+    """Extract a Polygon/MultiPolygon geometry from a geometry, Feature or FeatureCollection."""
+    if not isinstance(value, dict):
+        raise ValueError("Expected a GeoJSON object")
+    if value.get('type') == 'FeatureCollection':
+        features = value.get('features')
+        if not isinstance(features, list):
+            raise ValueError("'features' must be a list")
+        polygons = [_geometry(feature) for feature in features
+                    if isinstance(feature, dict) and isinstance(feature.get('geometry'), dict)
+                    and feature['geometry'].get('type') in POLYGON_TYPES]
+        if not polygons:
+            raise ValueError("No polygon in the feature collection")
+        if len(polygons) == 1:
+            return polygons[0]
+        coordinates = []
+        for polygon in polygons:
+            coordinates += [polygon['coordinates']] if polygon['type'] == 'Polygon' else polygon['coordinates']
+        return {'type': 'MultiPolygon', 'coordinates': coordinates}
+    if value.get('type') == 'Feature':
+        return _geometry(value.get('geometry') or {})
+    if value.get('type') not in POLYGON_TYPES:
+        raise ValueError(f"Geometry type must be one of {POLYGON_TYPES}")
+    coordinates = value.get('coordinates')
+    if value['type'] == 'Polygon':
+        _check_polygon(coordinates)
+    else:
+        if not isinstance(coordinates, list) or not coordinates:
+            raise ValueError("MultiPolygon coordinates must be a non-empty list of polygons")
+        for polygon in coordinates:
+            _check_polygon(polygon)
+    return {'type': value['type'], 'coordinates': coordinates}
+
+
+def geometry_hash(geometry: Dict) -> str:
+    """Return the SHA-1 of a geometry's canonical JSON (rounded coordinates, sorted keys)."""
+    def canonical(coordinates):
+        if isinstance(coordinates, (list, tuple)) and coordinates and isinstance(coordinates[0], (int, float)):
+            return [round(float(c), COORDINATE_PRECISION) for c in coordinates]
+        return [canonical(c) for c in coordinates]
+
+    text = json.dumps({'type': geometry['type'], 'coordinates': canonical(geometry['coordinates'])},
+                      sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def grid_zonal_stats(grid: np.ndarray, transform, crs, geometry: Dict, nodata=None) -> Dict[str, Any]:
+    """
+    Compute fire-frequency statistics of a grid inside a polygon.
+
+    Args:
+        grid: 2-D (row × col) array, typically a memmap
+        transform: Affine transform of the grid
+        crs: CRS of the transform
+        geometry: GeoJSON Polygon/MultiPolygon in lon/lat
+        nodata: Grid value treated as missing
+
+    Returns:
+        dict: cells (pixels inside the polygon), count (pixels with at least one
+        fire), burned_fraction, mean and max (over burned pixels) and histogram
+        ({fire frequency: pixels})
+    """
+    from rasterio.crs import CRS
+    from rasterio.features import geometry_mask
+    from rasterio.transform import Affine
+    from rasterio.warp import transform_geom
+
+    if crs is not None and CRS.from_user_input(crs) != CRS.from_epsg(4326):
+        geometry = transform_geom("EPSG:4326", crs, geometry)
+
+    # Pixel window of the polygon's bounding box, clipped to the grid
+    points = np.array([p for ring in _rings(geometry) for p in ring], dtype=np.float64)
+    inverse = ~transform
+    cols = inverse.a * points[:, 0] + inverse.b * points[:, 1] + inverse.c
+    rows = inverse.d * points[:, 0] + inverse.e * points[:, 1] + inverse.f
+    row0, row1 = max(int(np.floor(rows.min())), 0), min(int(np.ceil(rows.max())), grid.shape[0])
+    col0, col1 = max(int(np.floor(cols.min())), 0), min(int(np.ceil(cols.max())), grid.shape[1])
+    empty = {'cells': 0, 'count': 0, 'burned_fraction': 0.0, 'mean': None, 'max': None, 'histogram': {}}
+    if row0 >= row1 or col0 >= col1:
+        return empty
+
+    window = np.asarray(grid[row0:row1, col0:col1], dtype=np.float64)
+    inside = geometry_mask([geometry], out_shape=window.shape,
+                           transform=transform * Affine.translation(col0, row0), invert=True)
+    cells = int(inside.sum())
+    if cells == 0:
+        return empty
+    values = window[inside]
+    burned = np.isfinite(values) & (values > 0)
+    if nodata is not None and not np.isnan(nodata):
+        burned &= values != nodata
+    counts = np.round(values[burned]).astype(np.int64)
+    if counts.size == 0:
+        return {**empty, 'cells': cells}
+    histogram = np.bincount(counts)
+    return {
+        'cells': cells,
+        'count': int(counts.size),
+        'burned_fraction': counts.size / cells,
+        'mean': float(counts.mean()),
+        'max': int(counts.max()),
+        'histogram': {str(v): int(n) for v, n in enumerate(histogram) if v > 0 and n},
+    }
+
+
+def _rings(geometry: Dict):
+    """Yield every linear ring of a Polygon/MultiPolygon."""
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    for polygon in polygons:
+        yield from polygon
+
+
+def zonal_stats(value: Dict, state: str = 'CA', year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fire-frequency statistics inside a drawn polygon (cached by geometry hash).
+
+    Args:
+        value: GeoJSON geometry, Feature or FeatureCollection in lon/lat
+        state: State code of the cumulative fire raster (see maps.sampling.STATE_FIRE_RASTERS)
+        year: Optional year of the fire stack to use instead of the cumulative raster
+
+    Returns:
+        dict: See grid_zonal_stats
+    """
+    geometry = _geometry(value)
+    digest = geometry_hash(geometry)
+    if year is not None:
+        stack = load_fire_stack()
+        if stack is None or year not in stack.years:
+            raise LookupError(f"No fire raster for {year}")
+        return figure_cache.get_or_build(
+            ("zonal", stack.tag, year, digest),
+            lambda: grid_zonal_stats(stack.plane(year), stack.transform, stack.meta['crs'], geometry)
+        )
+    sampler = load_sampler(STATE_FIRE_RASTERS[state]) if state in STATE_FIRE_RASTERS else None
+    if sampler is None:
+        raise LookupError(f"No fire raster for {state}")
+    return figure_cache.get_or_build(
+        ("zonal", sampler.tag, digest),
+        lambda: grid_zonal_stats(sampler.grid, sampler.transform, sampler.crs, geometry, sampler.nodata)
+    )
@@ -0,0 +1,11 @@
+"""
+Models package for the wildfire climate change visualization dashboard.
+
+This package contains the fire-risk levels, precomputed once when the data is
+loaded, and the climate scenario model.
+"""
+
+from .fire_risk import risk_label, rule_levels, score_fire_risk
+from .scenario import run_scenario
+
+__all__ = ['risk_label', 'rule_levels', 'score_fire_risk', 'run_scenario']
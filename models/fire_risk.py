@@ -0,0 +1,84 @@
+"""
+Fire-risk levels for (state, year) rows.
+
+The levels follow the original badge rules on drought severity, NDVI and the
+observed fire count. They are precomputed once per (state, year) row when the
+data is loaded, so the fire-risk badge only summarizes the stored levels of
+the selected rows instead of re-deriving thresholds per request. Rows without
+a fire count have no level.
+"""
+
+import numpy as np
+import pandas as pd
+
+TARGET = 'FireCount'
+
+# Risk levels from least to most severe
+LEVELS = ['Low', 'Moderate', 'High']
+
+# Badge label for each risk level
+RISK_LABELS = {
+    'High': "🔥 High Risk",
+    'Moderate': "⚠️ Moderate Risk",
+    'Low': "✅ Low Risk",
+}
+
+
+def rule_levels(df: pd.DataFrame) -> pd.Categorical:
+    """
+    Risk level of every row from the original badge rules.
+
+    Args:
+        df: Frame containing DroughtSeverity, NDVI and (where observed) FireCount
+
+    Returns:
+        pd.Categorical: 'High', 'Moderate' or 'Low'; missing where the fire count is unknown
+    """
+    drought = df['DroughtSeverity'].to_numpy(dtype=np.float64)
+    ndvi = df['NDVI'].to_numpy(dtype=np.float64)
+    fires = df[TARGET].to_numpy(dtype=np.float64) if TARGET in df.columns else np.full(len(df), np.nan)
+    levels = np.select(
+        [(drought > 2.5) & (ndvi < 0.38) & (fires > 400), (drought > 1.5) & (ndvi < 0.5) & (fires > 200)],
+        ['High', 'Moderate'],
+        default='Low'
+    ).astype(object)
+    levels[np.isnan(fires)] = None
+    return pd.Categorical(levels, categories=LEVELS)
+
+
+def score_fire_risk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the precomputed RiskLevel column to a fire dataset.
+
+    Args:
+        df: Frame containing NDVI, DroughtSeverity and FireCount
+
+    Returns:
+        pd.DataFrame: Copy of ``df`` with the rule-based RiskLevel of every row
+    """
+    return df.assign(RiskLevel=rule_levels(df))
+
+
+def risk_label(df: pd.DataFrame) -> str:
+    """
+    Badge text for a scored selection of rows.
+
+    A single year shows its level. Several years show the most common level
+    (ties go to the more severe one) and the distribution of levels.
+
+    Args:
+        df: Rows scored by score_fire_risk
+
+    Returns:
+        str: e.g. '🔥 High Risk' or '⚠️ Moderate Risk · 18 Moderate, 2 Low of 20 years'
+    """
+    rated = df[df['RiskLevel'].notna()] if 'RiskLevel' in df.columns else df.iloc[0:0]
+    if rated.empty:
+        return RISK_LABELS['Low']
+    counts = rated['RiskLevel'].value_counts()
+    counts = counts[counts > 0]
+    level = max(counts.index, key=lambda name: (counts[name], LEVELS.index(name)))
+    if len(rated) == 1:
+        return RISK_LABELS[level]
+    distribution = ", ".join(f"{counts[name]} {name}" for name in reversed(LEVELS) if name in counts.index)
+    return f"{RISK_LABELS[level]} · {distribution} of {len(rated)} years"
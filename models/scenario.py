@@ -0,0 +1,153 @@
+"""
+Monte Carlo what-if simulation of fire counts under drought and NDVI shifts.
+
+A log-linear model, log(FireCount) = b0 + b1·DroughtSeverity + b2·NDVI + ε,
+is fitted by least squares to the fire-model dataset. A scenario shifts the
+drought index by a fixed amount and scales NDVI by a percentage, then
+projects fire counts with one vectorized NumPy pass over all draws:
+
+- historical (drought, NDVI) years are resampled with replacement,
+- coefficients are drawn from the fit's sampling distribution,
+- residual noise is drawn from the fit's residual spread.
+
+Slider positions are quantized (0.1 drought index, 1% NDVI) and each
+quantized scenario is simulated once with a fixed seed and memoized, so
+repeated or nearby interactions are served from cache.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DRAWS = 100_000
+DROUGHT_STEP = 0.1
+NDVI_STEP = 1.0
+HISTOGRAM_BINS = 60
+SCENARIO_CACHE_SIZE = 512
+_SEED = 20240601
+
+
+def fit_fire_count_model(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Fit the log-linear fire-count model by ordinary least squares.
+
+    Args:
+        df: Rows with DroughtSeverity, NDVI and a positive FireCount
+
+    Returns:
+        dict: 'coef' (3,), 'cov' (3, 3) coefficient covariance, 'sigma' residual std
+        and 'X' (n, 2) historical (drought, NDVI) rows
+    """
+    if not {'DroughtSeverity', 'NDVI', 'FireCount'}.issubset(df.columns):
+        return {'coef': np.zeros(3), 'cov': np.zeros((3, 3)), 'sigma': 0.0, 'X': np.empty((0, 2))}
+    df = df.dropna(subset=['DroughtSeverity', 'NDVI', 'FireCount'])
+    df = df[df['FireCount'] > 0]
+    features = df[['DroughtSeverity', 'NDVI']].to_numpy(dtype=np.float64)
+    X = np.column_stack([np.ones(len(features)), features])
+    y = np.log(df['FireCount'].to_numpy(dtype=np.float64))
+    if len(y) < X.shape[1]:
+        return {'coef': np.zeros(3), 'cov': np.zeros((3, 3)), 'sigma': 0.0, 'X': np.empty((0, 2))}
+    coef, _, rank, _ = np.linalg.lstsq(X, y, rcond=None)
+    dof = max(len(y) - X.shape[1], 1)
+    sigma2 = float(np.sum((y - X @ coef) ** 2) / dof)
+    cov = sigma2 * np.linalg.pinv(X.T @ X) if rank == X.shape[1] else np.zeros((3, 3))
+    return {'coef': coef, 'cov': cov, 'sigma': np.sqrt(sigma2), 'X': features}
+
+
+def quantize(drought_shift: float, ndvi_pct: float) -> Tuple[float, float]:
+    """Snap slider values to the simulation grid used as the memoization key."""
+    return (round(round(float(drought_shift or 0) / DROUGHT_STEP) * DROUGHT_STEP, 1),
+            round(round(float(ndvi_pct or 0) / NDVI_STEP) * NDVI_STEP, 1))
+
+
+def simulate(fit: Dict[str, np.ndarray], drought_shift: float, ndvi_pct: float,
+             draws: int = DEFAULT_DRAWS, seed: int = _SEED) -> np.ndarray:
+    """
+    Project fire counts for one scenario.
+
+    Args:
+        fit: Result of fit_fire_count_model
+        drought_shift: Added to every drought index (e.g. +1.0)
+        ndvi_pct: Percentage change applied to NDVI (e.g. -10 for −10%)
+        draws: Number of Monte Carlo draws
+        seed: Random seed, fixed so a scenario always yields the same sample
+
+    Returns:
+        np.ndarray: ``draws`` simulated fire counts (float32)
+    """
+    rng = np.random.default_rng(seed)
+    rows = fit['X'][rng.integers(0, len(fit['X']), draws)]
+    drought = rows[:, 0] + drought_shift
+    ndvi = rows[:, 1] * (1.0 + ndvi_pct / 100.0)
+    coef = rng.multivariate_normal(fit['coef'], fit['cov'], draws, method='cholesky') \
+        if np.any(fit['cov']) else np.broadcast_to(fit['coef'], (draws, 3))
+    log_fires = (coef[:, 0] + coef[:, 1] * drought + coef[:, 2] * ndvi
+                 + rng.normal(0.0, fit['sigma'], draws))
+    return np.exp(log_fires).astype(np.float32)
+
+
+def summarize(fires: np.ndarray, edges: Optional[np.ndarray] = None) -> Dict:
+    """Histogram and percentile summary of simulated fire counts."""
+    if edges is None:
+        edges = np.histogram_bin_edges(fires, bins=HISTOGRAM_BINS)
+    counts, edges = np.histogram(fires, bins=edges)
+    p5, p50, p95 = np.percentile(fires, [5, 50, 95])
+    return {
+        'counts': counts,
+        'edges': edges,
+        'mean': float(fires.mean()),
+        'p5': float(p5),
+        'p50': float(p50),
+        'p95': float(p95),
+    }
+
+
+@lru_cache(maxsize=8)
+def _fitted(data_manager, data_tag, year_range):
+    """Fit the model on the full history, resampling only the selected years (memoized)."""
+    fit = fit_fire_count_model(data_manager.get_fire_model_data())
+    if len(fit['X']):
+        selected = data_manager.get_fire_model_data(year_range).dropna(subset=['DroughtSeverity', 'NDVI'])
+        fit = dict(fit, X=selected[['DroughtSeverity', 'NDVI']].to_numpy(dtype=np.float64))
+    return fit
+
+
+@lru_cache(maxsize=8)
+def _baseline(data_manager, data_tag, year_range, draws):
+    """Simulated fire counts with no change, shared by every scenario (memoized)."""
+    return simulate(_fitted(data_manager, data_tag, year_range), 0.0, 0.0, draws)
+
+
+@lru_cache(maxsize=SCENARIO_CACHE_SIZE)
+def _scenario(data_manager, data_tag, year_range, drought_shift, ndvi_pct, draws):
+    """Simulate one quantized scenario next to the no-change baseline, on shared bins (memoized)."""
+    fit = _fitted(data_manager, data_tag, year_range)
+    if not len(fit['X']):
+        return None
+    # Same seed as the baseline (common random numbers), so differences come from the shift alone
+    baseline = _baseline(data_manager, data_tag, year_range, draws)
+    scenario = simulate(fit, drought_shift, ndvi_pct, draws)
+    edges = np.histogram_bin_edges(np.concatenate([baseline, scenario]), bins=HISTOGRAM_BINS)
+    return {'baseline': summarize(baseline, edges), 'scenario': summarize(scenario, edges)}
+
+
+def run_scenario(data_manager, drought_shift: float, ndvi_pct: float, year_range=None,
+                 draws: int = DEFAULT_DRAWS) -> Optional[Dict]:
+    """
+    Simulate projected fire counts for a drought/NDVI scenario.
+
+    Args:
+        data_manager: DataManager providing get_fire_model_data()
+        drought_shift: Change in drought severity index (quantized to 0.1)
+        ndvi_pct: Percentage change in NDVI (quantized to 1%)
+        year_range: Optional inclusive (start_year, end_year) of historical years to resample
+        draws: Number of Monte Carlo draws
+
+    Returns:
+        dict or None: {'baseline': summary, 'scenario': summary}, or None without fire data
+    """
+    drought_shift, ndvi_pct = quantize(drought_shift, ndvi_pct)
+    year_range = tuple(year_range) if year_range else None
+    return _scenario(data_manager, data_manager.data_tag, year_range, drought_shift, ndvi_pct, draws)
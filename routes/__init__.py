@@ -5,5 +5,9 @@ This package contains Flask route definitions and blueprints.
 """
 
 from .home import home_bp
+from .health import health_bp
+from .export import export_bp
+from .api import api_bp
+from .raster import raster_bp
 
-__all__ = ['home_bp'] 
\ No newline at end of file
+__all__ = ['home_bp', 'health_bp', 'export_bp', 'api_bp', 'raster_bp'] 
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Read-only JSON query API over the climate series.
+
+GET /api/v1/variables lists the queryable variables and their fields.
+GET /api/v1/series returns one page of a variable's rows:
+
+    /api/v1/series?variable=temperature&state=CA,GA&start=1990&end=2020
+    /api/v1/series?variable=drought&fields=Year,State,DroughtSeverity&limit=100
+    /api/v1/series?variable=vegetation&cursor=<next_cursor from the previous page>
+
+Filters (state, start, end; see routes.filters) are pushed down onto column
+arrays that are precomputed once per data version: each variable is stored
+as JSON-ready column lists plus NumPy year/state arrays for masking, so a
+request only computes a mask and slices lists. 'State' is always the state
+code, and temperature/precipitation rows (monthly 12-month periods) carry
+'Year' and 'Month'. Pagination uses an opaque cursor bound to the data version; a cursor
+from older data is rejected with 410.
+
+Every response carries a strong ETag derived from the data version and the
+normalized query, computed before any rows are touched, so a matching
+If-None-Match is answered with 304 without building the page.
+"""
+
+import base64
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, List
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from routes.filters import FilterError, parse_states, parse_year_range
+
+api_bp = Blueprint('api_bp', __name__, url_prefix='/api/v1')
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+# Queryable variables: per-state climate series, or a DataManager dataset key
+SERIES_VARIABLES = ('temperature', 'precipitation')
+DATASET_VARIABLES = {'drought': 'drought', 'vegetation': 'vegetation'}
+
+
+def _json_column(values: pd.Series) -> List:
+    """Convert a column to a JSON-ready list (ISO dates, shortest float32 reprs)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime('%Y-%m-%d').tolist()
+    if values.dtype == np.float32:
+        # float32 -> shortest decimal repr -> float64, so 58.3f is served as 58.3
+        return values.astype(str).astype(np.float64).tolist()
+    return values.tolist()
+
+
+@lru_cache(maxsize=4)
+def _columns(data_manager, data_tag) -> Dict[str, Dict]:
+    """
+    Build the column store of every variable for one data version (memoized).
+
+    Returns:
+        dict: variable -> {'columns': {field: list}, 'year': ndarray, 'state': ndarray}
+    """
+    codes_by_name = {data_manager.get_state_name(code): code for code in data_manager.get_state_codes()}
+    frames = {}
+    for variable in SERIES_VARIABLES:
+        parts = [data_manager.get_state_series(code, variable).assign(State=code)
+                 for code in data_manager.get_state_codes()]
+        frames[variable] = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    for variable, key in DATASET_VARIABLES.items():
+        df = data_manager.slice_years(key)
+        if 'State' in df.columns:
+            df = df.assign(State=df['State'].map(lambda name: codes_by_name.get(name, name)))
+        frames[variable] = df
+
+    store = {}
+    for variable, df in frames.items():
+        if df.empty:
+            store[variable] = {'columns': {}, 'year': np.empty(0, dtype=np.int64), 'state': np.empty(0, dtype=object)}
+            continue
+        store[variable] = {
+            'columns': {col: _json_column(df[col]) for col in df.columns},
+            'year': df['Year'].to_numpy(),
+            'state': df['State'].to_numpy(dtype=object),
+        }
+    return store
+
+
+def _encode_cursor(offset: int, data_tag: str) -> str:
+    raw = json.dumps({'o': offset, 't': data_tag}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, data_tag: str) -> int:
+    """Return the row offset of a cursor; raises FilterError (or LookupError for stale data)."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        offset, tag = int(payload['o']), payload['t']
+    except (ValueError, KeyError, TypeError):
+        raise FilterError("Invalid cursor")
+    if tag != data_tag:
+        raise LookupError("Cursor refers to an older data version; restart pagination")
+    if offset < 0:
+        raise FilterError("Invalid cursor")
+    return offset
+
+
+@api_bp.route("/variables")
+def list_variables():
+    """List the queryable variables with their fields and row counts."""
+    data_manager = current_app.extensions['data_manager']
+    store = _columns(data_manager, data_manager.data_tag)
+    return jsonify({
+        variable: {'fields': list(entry['columns']), 'rows': len(entry['year'])}
+        for variable, entry in store.items()
+    })
+
+
+@api_bp.route("/series")
+def series():
+    """Return one page of a variable's rows, filtered and projected."""
+    data_manager = current_app.extensions['data_manager']
+    args = request.args
+    data_tag = data_manager.data_tag
+    try:
+        variable = args.get('variable')
+        if variable not in SERIES_VARIABLES and variable not in DATASET_VARIABLES:
+            raise FilterError(f"'variable' must be one of {sorted(SERIES_VARIABLES + tuple(DATASET_VARIABLES))}")
+        year_range = parse_year_range(args, data_manager.get_year_bounds())
+        states = parse_states(args, data_manager)
+        try:
+            limit = min(max(int(args.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            raise FilterError("'limit' must be an integer")
+        offset = _decode_cursor(args['cursor'], data_tag) if args.get('cursor') else 0
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()] if args.get('fields') else None
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 410
+
+    # Strong validator over the data version and the normalized query, checked before any work
+    query = [variable, year_range, states, fields, offset, limit]
+    etag = hashlib.sha1(f"{data_tag}:{json.dumps(query)}".encode('utf-8')).hexdigest()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    entry = _columns(data_manager, data_tag)[variable]
+    columns = entry['columns']
+    fields = fields or list(columns)
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        return jsonify({'error': f"Unknown fields {unknown}; available: {list(columns)}"}), 400
+
+    mask = np.ones(len(entry['year']), dtype=bool)
+    if year_range is not None:
+        mask &= (entry['year'] >= year_range[0]) & (entry['year'] <= year_range[1])
+    if states is not None:
+        mask &= np.isin(entry['state'], states)
+    rows = np.flatnonzero(mask)
+    page = rows[offset:offset + limit].tolist()
+    selected = [columns[f] for f in fields]
+    data = [dict(zip(fields, values)) for values in zip(*([col[i] for i in page] for col in selected))] if page else []
+
+    next_cursor = _encode_cursor(offset + limit, data_tag) if offset + limit < len(rows) else None
+    response = jsonify({
+        'variable': variable,
+        'count': int(len(rows)),
+        'offset': offset,
+        'limit': limit,
+        'fields': fields,
+        'data': data,
+        'next_cursor': next_cursor,
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    if next_cursor:
+        response.headers['Link'] = f'<{request.base_url}?{_with_cursor(args, next_cursor)}>; rel="next"'
+    return response
+
+
+def _with_cursor(args, cursor: str) -> str:
+    """Query string of the current request with the cursor replaced."""
+    params = [(k, v) for k, v in args.items(multi=True) if k != 'cursor']
+    return urlencode(params + [('cursor', cursor)])
@@ -0,0 +1,138 @@
+"""
+Streaming bulk export of the dashboard datasets.
+
+GET /export/datasets lists the exportable DataManager datasets.
+GET /export streams a dataset or a filtered (state, variable, year-range)
+slice (see routes.filters) as CSV, NDJSON or Parquet:
+
+    /export?dataset=drought&format=csv
+    /export?variable=temperature&state=CA,GA&start=1990&end=2020&format=ndjson
+    /export?dataset=vegetation&state=California&format=parquet
+
+Climate series rows are monthly 12-month periods, identified by 'Year' and
+'Month' (the period's last month).
+
+Output is produced by generators chunk by chunk, so a full multi-state
+export never exists in memory as a whole. Responses are gzip-compressed on
+the fly when the client sends 'Accept-Encoding: gzip', or downloaded as a
+.gz file with gzip=1. Parquet output needs the optional pyarrow package.
+"""
+
+import io
+import zlib
+from typing import Iterable, Iterator
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from routes.filters import FilterError, filtered_chunks
+
+export_bp = Blueprint('export_bp', __name__, url_prefix='/export')
+
+# Content type and file extension of each export format
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _csv(chunks: Iterable) -> Iterator[bytes]:
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+
+def _shortest_float64(chunk):
+    """Widen float32 columns via their shortest repr, so 58.3f serializes as 58.3 rather than 58.2999992371."""
+    float32 = [col for col, dtype in chunk.dtypes.items() if dtype == 'float32']
+    return chunk.astype({col: str for col in float32}).astype({col: 'float64' for col in float32}) if float32 else chunk
+
+
+def _ndjson(chunks: Iterable) -> Iterator[bytes]:
+    for chunk in chunks:
+        if len(chunk):
+            yield _shortest_float64(chunk).to_json(orient='records', lines=True, date_format='iso').encode('utf-8')
+            yield b'\n'
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose buffered bytes are taken out after every row group."""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+def _parquet(chunks: Iterable) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink, writer = _Drain(), None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema, compression='snappy')
+        # One row group per chunk, flushed to the client as soon as it is written
+        writer.write_table(table)
+        yield sink.take()
+    if writer is not None:
+        writer.close()
+        yield sink.take()
+
+
+def _gzip(stream: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@export_bp.route("/datasets")
+def list_datasets():
+    """List every exportable dataset with its row count and columns."""
+    data_manager = current_app.extensions['data_manager']
+    return jsonify(data_manager.get_data_summary())
+
+
+@export_bp.route("")
+def export():
+    """Stream the requested dataset or slice in the requested format."""
+    data_manager = current_app.extensions['data_manager']
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({'error': f"Unknown format '{fmt}'; expected one of {sorted(FORMATS)}"}), 400
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return jsonify({'error': "Parquet export requires the pyarrow package"}), 501
+    try:
+        name, chunks = filtered_chunks(data_manager, request.args)
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+
+    mimetype, extension = FORMATS[fmt]
+    stream = {'csv': _csv, 'ndjson': _ndjson, 'parquet': _parquet}[fmt](chunks)
+    filename = f"{name}.{extension}"
+    headers = {'X-Content-Type-Options': 'nosniff'}
+    if request.args.get('gzip') == '1':
+        stream, mimetype, filename = _gzip(stream), 'application/gzip', filename + '.gz'
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        stream = _gzip(stream)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return Response(stream_with_context(stream), mimetype=mimetype, headers=headers)
@@ -0,0 +1,123 @@
+"""
+Request filter parsing shared by the data export and query API blueprints.
+
+Both blueprints read the same query parameters:
+- dataset: A DataManager dataset key (e.g. 'drought', 'ca_temperature'), or
+- variable: 'temperature' or 'precipitation' for the per-state climate series;
+- state: Comma-separated state codes or names (e.g. 'CA,GA' or 'California');
+- start / end: Inclusive year bounds.
+
+Filters are pushed down to the DataManager store: years are located by the
+sorted-index slice, and per-state series are read straight from the
+state-indexed store, so only the selected rows are ever touched.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from loader import SERIES_FILES
+
+
+class FilterError(ValueError):
+    """Raised for an invalid or unknown filter value; the message is safe to return to clients."""
+
+
+def parse_year_range(args, bounds: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Read 'start'/'end' query parameters into an inclusive year range.
+
+    Args:
+        args: Request query parameters (werkzeug MultiDict)
+        bounds: (first_year, last_year) used for a missing bound
+
+    Returns:
+        tuple or None: (start, end), or None when neither bound is given
+    """
+    if 'start' not in args and 'end' not in args:
+        return None
+    try:
+        start = int(args.get('start', bounds[0]))
+        end = int(args.get('end', bounds[1]))
+    except (TypeError, ValueError):
+        raise FilterError("'start' and 'end' must be years")
+    if start > end:
+        raise FilterError("'start' must not be after 'end'")
+    return (start, end)
+
+
+def parse_states(args, data_manager) -> Optional[List[str]]:
+    """
+    Read the 'state' query parameter into a list of state codes.
+
+    Args:
+        args: Request query parameters
+        data_manager: DataManager used to resolve state names to codes
+
+    Returns:
+        list or None: Sorted state codes, or None when no state filter is given
+    """
+    value = args.get('state')
+    if not value:
+        return None
+    by_name = {data_manager.get_state_name(code).lower(): code for code in data_manager.get_state_codes()}
+    codes = set()
+    for item in value.split(','):
+        item = item.strip()
+        code = item.upper() if item.upper() in data_manager.get_state_codes() else by_name.get(item.lower())
+        if code is None:
+            raise FilterError(f"Unknown state '{item}'")
+        codes.add(code)
+    return sorted(codes)
+
+
+def _chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield positional slices (views) of at most ``chunk_size`` rows."""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def filtered_chunks(data_manager, args, chunk_size: int = 5000) -> Tuple[str, Iterator[pd.DataFrame]]:
+    """
+    Resolve the request's filters into a name and a lazy stream of row chunks.
+
+    With 'variable', the selected states' series are streamed one after another,
+    each chunk tagged with a 'State' column. With 'dataset', the dataset is
+    streamed, optionally restricted to rows whose 'State' matches the state filter.
+
+    Args:
+        data_manager: DataManager instance containing all datasets
+        args: Request query parameters
+        chunk_size: Maximum rows per yielded chunk
+
+    Returns:
+        tuple: (export name, iterator of DataFrame chunks)
+    """
+    year_range = parse_year_range(args, data_manager.get_year_bounds())
+    states = parse_states(args, data_manager)
+    variable = args.get('variable')
+    dataset = args.get('dataset')
+
+    if variable:
+        if variable not in SERIES_FILES:
+            raise FilterError(f"Unknown variable '{variable}'; expected one of {sorted(SERIES_FILES)}")
+        codes = states or data_manager.get_state_codes()
+
+        def series_chunks():
+            for code in codes:
+                df = data_manager.get_state_series(code, variable, year_range)
+                for chunk in _chunks(df, chunk_size):
+                    yield chunk.assign(State=code)
+        return f"{variable}_{'_'.join(codes).lower()}", series_chunks()
+
+    if not dataset:
+        raise FilterError("Either 'dataset' or 'variable' is required")
+    if dataset not in data_manager.get_dataset_names():
+        raise FilterError(f"Unknown dataset '{dataset}'")
+    df = data_manager.slice_years(dataset, year_range)
+    if states is not None:
+        if 'State' not in df.columns:
+            raise FilterError(f"Dataset '{dataset}' has no 'State' column to filter on")
+        names = {data_manager.get_state_name(code) for code in states} | set(states)
+        df = df[df['State'].isin(names)]
+    return dataset, _chunks(df, chunk_size)
@@ -0,0 +1,12 @@
+from flask import Blueprint, current_app, jsonify
+
+health_bp = Blueprint('health_bp', __name__)
+
+@health_bp.route("/ready")
+def readiness():
+    """Report figure warm-up progress: 200 once every figure is cached, 503 while warming up."""
+    warmup = current_app.extensions.get("figure_warmup")
+    if warmup is None:
+        return jsonify({"state": "disabled"}), 200
+    status = warmup.status()
+    return jsonify(status), 200 if warmup.ready else 503
@@ -0,0 +1,182 @@
+"""
+Raster endpoints backing the fire-frequency map.
+
+GET /api/raster/fire/<year>.png serves one year of the ingested fire stack
+(see maps.fire_stack) as a colourized, transparent PNG overlay. Frames are
+encoded once per year and process, and carry a strong ETag derived from the
+stack's content hash so browsers revalidate with 304s.
+
+GET or POST /api/raster/sample returns the fire-frequency value at many
+points in one round trip, plus the climate series of each state hit:
+
+    /api/raster/sample?points=37.5,-120.1;36.2,-119.4&start=2000&end=2020
+    POST /api/raster/sample  {"points": [[37.5, -120.1], [36.2, -119.4]], "year": 2012}
+
+All points are converted to pixels in one vectorized inverse-affine step and
+read from memory-mapped rasters (see maps.sampling); 'year' additionally
+samples that year's plane of the fire stack. 'series=0' omits the series.
+
+GET /api/raster/ndvi/<state>/<from>/<to>.png serves the computed NDVI
+change map between two years (see maps.ndvi).
+
+POST /api/raster/zonal returns fire-frequency statistics inside a GeoJSON
+polygon (see maps.zonal):
+
+    POST /api/raster/zonal  {"geometry": {"type": "Polygon", "coordinates": [...]}, "year": 2012}
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from graphs.comparison import COMPARISON_VARIABLES
+from maps.fire_stack import load_fire_stack
+from maps.ndvi import ndvi_change_png
+from maps.sampling import fire_samplers, sample_grid
+from maps.zonal import zonal_stats
+from routes.api import _json_column
+from routes.filters import FilterError, parse_year_range
+
+raster_bp = Blueprint('raster_bp', __name__, url_prefix='/api/raster')
+
+MAX_SAMPLE_POINTS = 1000
+
+
+@raster_bp.route("/fire/<int:year>.png")
+def fire_frame(year):
+    """Serve one year's fire-frequency overlay."""
+    stack = load_fire_stack()
+    if stack is None:
+        return jsonify({'error': "No fire raster stack has been ingested"}), 404
+    if year not in stack.years:
+        return jsonify({'error': f"No fire raster for {year}"}), 404
+
+    etag = f"{stack.tag}-{year}"
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(stack.frame_png(year), mimetype='image/png')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+
+@raster_bp.route("/ndvi/<state>/<int:year_from>/<int:year_to>.png")
+def ndvi_change(state, year_from, year_to):
+    """Serve the NDVI change overlay between two years."""
+    try:
+        png, _ = ndvi_change_png(state.upper(), year_from, year_to)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = Response(png, mimetype='image/png')
+    response.set_etag(hashlib.sha1(png).hexdigest())
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response.make_conditional(request)
+
+
+def _parse_points(payload) -> np.ndarray:
+    """Read 'points' ([[lat, lon], ...] or 'lat,lon;lat,lon') into an (n, 2) float array."""
+    points = payload.get('points')
+    if isinstance(points, str):
+        points = [p.split(',') for p in points.split(';') if p.strip()]
+    if not points or not isinstance(points, list):
+        raise FilterError("'points' is required, as [[lat, lon], ...] or 'lat,lon;lat,lon'")
+    if len(points) > MAX_SAMPLE_POINTS:
+        raise FilterError(f"At most {MAX_SAMPLE_POINTS} points per request")
+    try:
+        array = np.asarray(points, dtype=np.float64).reshape(len(points), 2)
+    except (TypeError, ValueError):
+        raise FilterError("Each point must be a [lat, lon] pair of numbers")
+    if not np.isfinite(array).all() or (np.abs(array[:, 0]) > 90).any() or (np.abs(array[:, 1]) > 180).any():
+        raise FilterError("Latitudes must be within ±90 and longitudes within ±180")
+    return array
+
+
+@lru_cache(maxsize=16)
+def _state_series(data_manager, data_tag, code, year_range) -> Dict:
+    """JSON-ready yearly climate series of one state (memoized per data version and range)."""
+    series = {}
+    for variable, (column, _) in COMPARISON_VARIABLES.items():
+        df = data_manager.get_state_series(code, variable, year_range)
+        if not df.empty:
+            series[variable] = {'Year': _json_column(df['Year']), column: _json_column(df[column])}
+    return series
+
+
+@raster_bp.route("/sample", methods=["GET", "POST"])
+def sample():
+    """Sample fire frequency (and optionally one year of the fire stack) at many points."""
+    data_manager = current_app.extensions['data_manager']
+    payload = (request.get_json(silent=True) or {}) if request.method == 'POST' else request.args
+    if not isinstance(payload, dict):
+        return jsonify({'error': "Expected a JSON object body"}), 400
+    try:
+        points = _parse_points(payload)
+        year_range = parse_year_range(payload, data_manager.get_year_bounds())
+        year = payload.get('year')
+        try:
+            year = int(year) if year is not None else None
+        except (TypeError, ValueError):
+            raise FilterError("'year' must be a year")
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    lats, lons = points[:, 0], points[:, 1]
+
+    # Each point takes the first state raster that covers it
+    frequency = np.full(len(points), np.nan)
+    states = np.full(len(points), None, dtype=object)
+    assigned = np.zeros(len(points), dtype=bool)
+    for code, sampler in fire_samplers().items():
+        values, inside = sampler.sample(lats, lons)
+        hit = inside & ~assigned
+        frequency[hit] = values[hit]
+        states[hit] = code
+        assigned |= hit
+
+    counts = None
+    if year is not None:
+        stack = load_fire_stack()
+        if stack is None or year not in stack.years:
+            return jsonify({'error': f"No fire raster for {year}"}), 404
+        counts, _ = sample_grid(stack.plane(year), stack.transform, stack.meta['crs'], lats, lons)
+
+    results = []
+    for i in range(len(points)):
+        row = {
+            'lat': float(lats[i]),
+            'lon': float(lons[i]),
+            'state': states[i],
+            'fire_frequency': None if np.isnan(frequency[i]) else float(frequency[i]),
+        }
+        if counts is not None:
+            row['fire_count'] = None if np.isnan(counts[i]) else int(counts[i])
+        results.append(row)
+
+    response = {'count': len(results), 'points': results}
+    if str(payload.get('series', '1')) not in ('0', 'false'):
+        response['series'] = {
+            code: _state_series(data_manager, data_manager.data_tag, code, year_range)
+            for code in sorted({s for s in states if s is not None})
+        }
+    return jsonify(response)
+
+
+@raster_bp.route("/zonal", methods=["POST"])
+def zonal():
+    """Fire-frequency statistics inside a polygon, cached by geometry hash."""
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': "Expected a JSON object body"}), 400
+    try:
+        year = int(payload['year']) if payload.get('year') is not None else None
+        stats = zonal_stats(payload.get('geometry') or payload, state=payload.get('state', 'CA'), year=year)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify(stats)
@@ -0,0 +1,5 @@
+"""
+Command-line tools for operating the wildfire climate change visualization dashboard.
+
+Each module is runnable with `python -m tools.<name>`.
+"""
@@ -0,0 +1,304 @@
+"""
+Build every expensive derived artifact offline, rebuilding only what is stale.
+
+Each artifact is a node of a small dependency graph with the files it is
+derived from as inputs:
+
+- data-snapshot: source CSVs -> Parquet snapshot of every dataset with the
+  fire-risk levels (data.data_manager)
+- reproject:<raster>: GeoTIFF -> tiled, compressed Web Mercator GeoTIFF (maps.reproject)
+- raster-copy:<state>: fire-frequency GeoTIFF -> memory-mapped .npy copy (maps.sampling)
+- fire-overlay: warped fire rasters -> PNG overlays and the folium map (maps.wildfire_map)
+- ndvi-change:<state>: first and last NDVI raster -> default change map (maps.ndvi)
+- figures: data snapshot, dashboard code and the raster artifacts -> pickled
+  bundle of every warm-up figure (utils.warmup)
+
+A node's fingerprint hashes its name, version, the content of its inputs and
+the fingerprints of the nodes it depends on. Nodes whose fingerprint matches
+the manifest of the last build, and whose outputs still exist, are skipped;
+the others run in a process pool as soon as their dependencies are done. A
+deploy that runs this command ships every artifact prebuilt, so workers load
+them at startup instead of computing them.
+
+Usage:
+    python -m tools.build
+    python -m tools.build --list
+    python -m tools.build --jobs 4 figures
+    python -m tools.build --force data-snapshot
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from data.data_manager import SNAPSHOT_DIR, source_files
+from maps.ndvi import available_years, discover_rasters
+from maps.reproject import source_hash
+from maps.sampling import STATE_FIRE_RASTERS
+from maps.wildfire_map import FIRE_RASTERS
+from utils.warmup import figure_sources
+
+MANIFEST_PATH = os.environ.get("BUILD_MANIFEST", "build/manifest.json")
+
+
+@dataclass
+class Node:
+    """
+    One derived artifact of the build graph.
+
+    ``action`` runs in a worker process, so it must be picklable (a
+    module-level function or a functools.partial of one); it returns the
+    paths it wrote. Bumping ``version`` forces a rebuild after the action's
+    logic changes.
+    """
+
+    name: str
+    action: Callable[[], List[str]]
+    inputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    version: int = 1
+
+
+def build_data_snapshot() -> List[str]:
+    """Parse the source datasets and write the Parquet snapshot."""
+    from data.data_manager import DataManager
+
+    return DataManager(snapshot_dir=None).save_snapshot(SNAPSHOT_DIR)
+
+
+def reproject(path: str, kind: str) -> List[str]:
+    """Warp a raster to Web Mercator (content-addressed, so an unchanged source is not warped again)."""
+    from maps.reproject import warp_to_web_mercator
+
+    return [warp_to_web_mercator(path, kind)]
+
+
+def raster_copy(path: str) -> List[str]:
+    """Materialize the memory-mapped copy a RasterSampler reads."""
+    from maps.sampling import RasterSampler
+
+    return [RasterSampler(path).cache_path]
+
+
+def fire_overlay() -> List[str]:
+    """Write the fire-frequency PNG overlays and the folium map."""
+    from maps.wildfire_map import generate_wildfire_map, overlay_filename
+
+    html_path = generate_wildfire_map()
+    return [os.path.join("static", overlay_filename(path)) for path in FIRE_RASTERS.values()] + [html_path]
+
+
+def ndvi_change(state: str, year_from: int, year_to: int) -> List[str]:
+    """Render the NDVI change map between two years into the disk cache."""
+    from maps.ndvi import change_cache_paths, ndvi_change_png
+
+    ndvi_change_png(state, year_from, year_to)
+    rasters = discover_rasters()
+    return list(change_cache_paths(state, year_from, year_to,
+                                   rasters[(state, 'NDVI', year_from)], rasters[(state, 'NDVI', year_to)]))
+
+
+def build_figures() -> List[str]:
+    """Build every warm-up figure from the data snapshot and write the figure bundle."""
+    from data.data_manager import DataManager
+    from utils.warmup import write_figure_bundle
+
+    return [write_figure_bundle(DataManager())]
+
+
+def _stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def pipeline() -> List[Node]:
+    """
+    Describe the build graph of the current tree.
+
+    Returns:
+        list: Nodes in dependency order
+    """
+    nodes = [Node('data-snapshot', build_data_snapshot, inputs=source_files())]
+
+    fire_rasters = sorted(set(FIRE_RASTERS.values()) | set(STATE_FIRE_RASTERS.values()))
+    for path in fire_rasters:
+        nodes.append(Node(f'reproject:{_stem(path)}', functools.partial(reproject, path, 'categorical'), inputs=[path]))
+    for code, path in sorted(STATE_FIRE_RASTERS.items()):
+        nodes.append(Node(f'raster-copy:{code}', functools.partial(raster_copy, path), inputs=[path]))
+    nodes.append(Node('fire-overlay', fire_overlay, inputs=sorted(FIRE_RASTERS.values()),
+                      deps=[f'reproject:{_stem(path)}' for path in sorted(FIRE_RASTERS.values())]))
+
+    rasters = discover_rasters()
+    ndvi_paths = {key: path for key, path in rasters.items() if key[1] == 'NDVI'}
+    for path in sorted(ndvi_paths.values()):
+        nodes.append(Node(f'reproject:{_stem(path)}', functools.partial(reproject, path, 'continuous'), inputs=[path]))
+    for state, years in sorted(available_years().items()):
+        if len(years) < 2:
+            continue
+        first, last = ndvi_paths[(state, 'NDVI', years[0])], ndvi_paths[(state, 'NDVI', years[-1])]
+        nodes.append(Node(f'ndvi-change:{state}', functools.partial(ndvi_change, state, years[0], years[-1]),
+                          inputs=[first, last], deps=[f'reproject:{_stem(first)}', f'reproject:{_stem(last)}']))
+
+    # Section skeletons embed the fire map and the NDVI change map, so figures come last
+    nodes.append(Node('figures', build_figures, inputs=figure_sources(), deps=[node.name for node in nodes]))
+    return nodes
+
+
+def fingerprints(nodes: List[Node]) -> Dict[str, str]:
+    """Fingerprint every node from its inputs' content and its dependencies' fingerprints."""
+    result: Dict[str, str] = {}
+    for node in nodes:
+        digest = hashlib.sha1(f"{node.name}:{node.version}".encode('utf-8'))
+        for path in sorted(node.inputs):
+            digest.update(path.encode('utf-8'))
+            digest.update(source_hash(path).encode('ascii') if os.path.exists(path) else b'missing')
+        for dep in sorted(node.deps):
+            digest.update(result[dep].encode('ascii'))
+        result[node.name] = digest.hexdigest()
+    return result
+
+
+def _load_manifest(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable build manifest {path}: {e}")
+        return {}
+
+
+def _save_manifest(path: str, manifest: Dict[str, Dict]):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(partial, path)
+
+
+def _timed(action: Callable[[], List[str]]):
+    """Run a node action in a worker and return (outputs, seconds)."""
+    start = time.perf_counter()
+    outputs = action()
+    return outputs, time.perf_counter() - start
+
+
+def stale_nodes(nodes: List[Node], manifest: Dict[str, Dict], prints: Dict[str, str]) -> List[str]:
+    """Names of the nodes whose fingerprint changed or whose outputs are missing."""
+    stale = []
+    for node in nodes:
+        entry = manifest.get(node.name)
+        if (entry is None or entry.get('fingerprint') != prints[node.name]
+                or not all(os.path.exists(path) for path in entry.get('outputs', []))):
+            stale.append(node.name)
+    return stale
+
+
+def run(nodes: List[Node], manifest_path: str = MANIFEST_PATH, jobs: Optional[int] = None,
+        force: List[str] = (), dry_run: bool = False) -> Dict[str, str]:
+    """
+    Rebuild the stale nodes, independent ones in parallel.
+
+    Args:
+        nodes: Nodes in dependency order
+        manifest_path: JSON manifest of the last build's fingerprints and outputs
+        jobs: Process pool size (default: CPU count)
+        force: Names of nodes to rebuild even when fresh
+        dry_run: Only report what would be rebuilt
+
+    Returns:
+        dict: Node name -> 'fresh', 'built', 'failed' or 'skipped' (a dependency failed)
+    """
+    by_name = {node.name: node for node in nodes}
+    prints = fingerprints(nodes)
+    manifest = _load_manifest(manifest_path)
+    stale = set(stale_nodes(nodes, manifest, prints)) | set(force)
+    status = {name: 'fresh' for name in by_name if name not in stale}
+    if dry_run:
+        return {name: status.get(name, 'stale') for name in by_name}
+
+    pending = [node for node in nodes if node.name in stale]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while pending or running:
+            for node in list(pending):
+                dep_status = [status.get(dep) for dep in node.deps]
+                if any(s in ('failed', 'skipped') for s in dep_status):
+                    status[node.name] = 'skipped'
+                    pending.remove(node)
+                elif all(s in ('fresh', 'built') for s in dep_status):
+                    running[pool.submit(_timed, node.action)] = node
+                    pending.remove(node)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    outputs, seconds = future.result()
+                except Exception as e:
+                    status[node.name] = 'failed'
+                    print(f"  {node.name}: FAILED ({type(e).__name__}: {e})")
+                    continue
+                status[node.name] = 'built'
+                manifest[node.name] = {'fingerprint': prints[node.name], 'outputs': outputs,
+                                       'seconds': round(seconds, 3)}
+                # Saved after every node, so an interrupted build keeps its finished work
+                _save_manifest(manifest_path, manifest)
+                print(f"  {node.name}: built in {seconds:.2f}s")
+    return status
+
+
+def _with_dependencies(nodes: List[Node], targets: List[str]) -> List[Node]:
+    """Restrict the graph to the targets and everything they depend on."""
+    by_name = {node.name: node for node in nodes}
+    wanted = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(by_name[name].deps)
+    return [node for node in nodes if node.name in wanted]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the dashboard's derived artifacts.")
+    parser.add_argument('targets', nargs='*', help="Nodes to build with their dependencies (default: all)")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Rebuild the targets even when fresh")
+    parser.add_argument('--list', action='store_true', help="List the nodes and whether they are stale")
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help=f"Build manifest (default: {MANIFEST_PATH})")
+    args = parser.parse_args(argv)
+
+    nodes = pipeline()
+    unknown = sorted(set(args.targets) - {node.name for node in nodes})
+    if unknown:
+        print(f"Error: unknown nodes {unknown}; see --list", file=sys.stderr)
+        return 1
+    if args.targets:
+        nodes = _with_dependencies(nodes, args.targets)
+    force = (args.targets or [node.name for node in nodes]) if args.force else []
+
+    if args.list:
+        for name, state in run(nodes, args.manifest, dry_run=True, force=force).items():
+            print(f"{state:>6}  {name}")
+        return 0
+
+    start = time.perf_counter()
+    status = run(nodes, args.manifest, args.jobs, force)
+    counts = {state: sum(1 for s in status.values() if s == state) for state in ('built', 'fresh', 'failed', 'skipped')}
+    print(f"Built {counts['built']}, fresh {counts['fresh']}, failed {counts['failed']}, "
+          f"skipped {counts['skipped']} in {time.perf_counter() - start:.2f}s")
+    return 1 if counts['failed'] or counts['skipped'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+Export the whole dashboard as a self-contained static site.
+
+Renders every dashboard section plus every callback state the UI can reach
+(each bubble-chart slider year and "all years", each satellite-map option,
+every state/variable combination of the comparison chart and a grid of fire
+scenarios) with the same cached builders the Dash callbacks use. Component
+trees are rendered to plain HTML, figures are embedded as minified JSON, and
+a small script swaps prerendered states clientside, so the result can be
+served by any static file server with no Python at all.
+
+The static dashboard shows the default global year range; the range slider
+is replaced by a note. Scenario sliders snap to a coarser grid
+(--scenario-drought-step / --scenario-ndvi-step) to keep the page small.
+
+Output layout:
+    <out>/index.html              landing page (templates/landing.html)
+    <out>/dashboard/index.html    dashboard with embedded figure JSON
+    <out>/dashboard/snapshot.js   clientside interactivity
+    <out>/dashboard/plotly.min.js plotly.js bundled with the plotly package
+    <out>/dashboard/style.css     minified assets/style.css
+    <out>/static/...              optimized images
+    <out>/.static-export          marker: the directory may be replaced by the next export
+
+An existing output directory is only replaced when it is empty or carries
+the marker file of an earlier export, so a mistyped --out never deletes
+anything else.
+
+Usage:
+    python -m tools.export_static [--out dist]
+"""
+
+import argparse
+import html
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import plotly
+from plotly.utils import PlotlyJSONEncoder
+
+SITE_DIR = os.path.join(os.path.dirname(__file__), 'static_site')
+# Written into every export; only directories carrying it are replaced
+EXPORT_MARKER = '.static-export'
+
+# CSS properties that take unitless numbers in React style dicts
+_UNITLESS = {'fontWeight', 'opacity', 'zIndex', 'flex', 'flexGrow', 'flexShrink', 'lineHeight', 'order'}
+# Void HTML elements
+_VOID = {'img', 'br', 'hr', 'input', 'meta', 'link'}
+# Dash prop name -> HTML attribute name
+_ATTRIBUTES = {'className': 'class', 'srcDoc': 'srcdoc', 'htmlFor': 'for'}
+# Dash html props that are not HTML attributes
+_SKIP_PROPS = {'children', 'style', 'n_clicks', 'n_clicks_timestamp', 'disable_n_clicks', 'loading_state'}
+
+
+def minify_json(value: Any) -> str:
+    """Serialize to compact JSON that is safe to embed inside a <script> element."""
+    text = json.dumps(value, cls=PlotlyJSONEncoder, separators=(',', ':'), ensure_ascii=False)
+    return text.replace('</', '<\\/')
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def _style(style: Dict) -> str:
+    parts = []
+    for name, value in style.items():
+        prop = re.sub(r'([A-Z])', lambda m: '-' + m.group(1).lower(), name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and name not in _UNITLESS and value != 0:
+            value = f'{value}px'
+        parts.append(f'{prop}:{value}')
+    return ';'.join(parts)
+
+
+class StaticRenderer:
+    """
+    Render Dash component trees to static HTML.
+
+    html.* components map to their tags; dcc.Graph becomes a placeholder div
+    whose figure is collected into ``figures``; dcc inputs become native form
+    controls. Root-relative links are rewritten for pages one level deep.
+    """
+
+    def __init__(self, link_prefix: str = '..', overrides: Dict[str, Dict] = None, section_figure=None):
+        """
+        Initialize the renderer.
+
+        ``overrides`` maps component ids to replacement props; ``section_figure``
+        builds the figure of a deferred 'section-graph' placeholder from its name.
+        """
+        self.link_prefix = link_prefix
+        self.overrides = overrides or {}
+        self.section_figure = section_figure
+        self.figures: Dict[str, Any] = {}
+
+    def render(self, node) -> str:
+        """Render a component, list of components, string or number."""
+        if node is None:
+            return ''
+        if isinstance(node, (list, tuple)):
+            return ''.join(self.render(child) for child in node)
+        if isinstance(node, (str, int, float)):
+            return html.escape(str(node))
+        spec = node.to_plotly_json()
+        props = dict(spec['props'])
+        if isinstance(props.get('id'), str):
+            props.update(self.overrides.get(props['id'], {}))
+        namespace, kind = spec['namespace'], spec['type']
+        if namespace == 'dash_html_components':
+            return self._element(kind.lower(), props)
+        if namespace == 'dash_leaflet' and kind in ('Map', 'MapContainer') and any(
+                getattr(child, 'id', None) == 'fire-frequency-overlay' for child in props.get('children') or []):
+            return self._leaflet_map(props)
+        handler = getattr(self, f'_dcc_{kind}', None) if namespace == 'dash_core_components' else None
+        if handler is None:
+            return f'<div class="snapshot-unsupported">{html.escape(kind)} is not available in the static snapshot.</div>'
+        return handler(props)
+
+    def _link(self, value):
+        if isinstance(value, str):
+            if value == '/home':
+                return f'{self.link_prefix}/index.html'
+            if value.startswith('/static/'):
+                return self.link_prefix + value
+        return value
+
+    def _attributes(self, props: Dict) -> str:
+        attrs = []
+        for name, value in props.items():
+            if name in _SKIP_PROPS or value is None or value is False:
+                continue
+            name = _ATTRIBUTES.get(name, name)
+            if value is True:
+                attrs.append(f' {name}')
+            else:
+                attrs.append(f' {name}="{html.escape(str(self._link(value)), quote=True)}"')
+        if props.get('style'):
+            attrs.append(f' style="{html.escape(_style(props["style"]), quote=True)}"')
+        return ''.join(attrs)
+
+    def _element(self, tag: str, props: Dict, extra: str = '') -> str:
+        attrs = self._attributes(props) + extra
+        if tag in _VOID:
+            return f'<{tag}{attrs}>'
+        return f'<{tag}{attrs}>{self.render(props.get("children"))}</{tag}>'
+
+    def _leaflet_map(self, props: Dict) -> str:
+        # The prebuilt cumulative folium map stands in for the Leaflet map (no time slider or drawing)
+        with open('assets/california_fire_map.html', encoding='utf-8') as f:
+            document = html.escape(f.read(), quote=True)
+        style = html.escape(_style(props.get('style') or {}), quote=True)
+        return f'<iframe srcdoc="{document}" width="100%" height="600" style="border:none;{style}"></iframe>'
+
+    def _dcc_Graph(self, props: Dict) -> str:
+        key = props.get('id') or f'graph-{len(self.figures)}'
+        if isinstance(key, dict) and key.get('type') == 'section-graph':
+            # Deferred placeholder: prerender the figure its callback would fill in
+            key = key['name']
+            if self.section_figure is not None:
+                props = {**props, 'figure': self.section_figure(key)}
+        if props.get('figure') is not None:
+            self.figures[key] = props['figure']
+        config = html.escape(minify_json(props.get('config') or {}), quote=True)
+        style = f' style="{html.escape(_style(props["style"]), quote=True)}"' if props.get('style') else ''
+        return f'<div id="{html.escape(key)}" class="snapshot-graph" data-figure="{html.escape(key)}" data-config="{config}"{style}></div>'
+
+    def _dcc_Loading(self, props: Dict) -> str:
+        return self.render(props.get('children'))
+
+    def _dcc_Store(self, props: Dict) -> str:
+        return ''
+
+    def _dcc_RangeSlider(self, props: Dict) -> str:
+        start, end = props.get('value') or (props.get('min'), props.get('max'))
+        return f'<p class="snapshot-range">Showing {start}–{end} (static snapshot)</p>'
+
+    def _dcc_Slider(self, props: Dict) -> str:
+        ident = html.escape(props['id'])
+        return (f'<div class="snapshot-slider"><input type="range" id="{ident}" min="{props.get("min")}" '
+                f'max="{props.get("max")}" step="{props.get("step") or 1}" value="{props.get("value")}">'
+                f'<span id="{ident}-value">{html.escape(str(props.get("value")))}</span></div>')
+
+    @staticmethod
+    def _options(props: Dict) -> List[Dict]:
+        return [o if isinstance(o, dict) else {'label': o, 'value': o} for o in props.get('options') or []]
+
+    def _dcc_Dropdown(self, props: Dict) -> str:
+        ident = html.escape(props['id'])
+        value = props.get('value')
+        if props.get('multi'):
+            selected = set(value or [])
+            boxes = ''.join(
+                f'<label><input type="checkbox" value="{html.escape(str(o["value"]))}"'
+                f'{" checked" if o["value"] in selected else ""}> {html.escape(str(o["label"]))}</label>'
+                for o in self._options(props)
+            )
+            return f'<div id="{ident}" class="snapshot-checklist">{boxes}</div>'
+        options = ''.join(
+            f'<option value="{html.escape(str(o["value"]))}"{" selected" if o["value"] == value else ""}>'
+            f'{html.escape(str(o["label"]))}</option>'
+            for o in self._options(props)
+        )
+        style = f' style="{html.escape(_style(props["style"]), quote=True)}"' if props.get('style') else ''
+        return f'<select id="{ident}"{style}>{options}</select>'
+
+    def _dcc_RadioItems(self, props: Dict) -> str:
+        ident = html.escape(props['id'])
+        value = props.get('value')
+        radios = ''.join(
+            f'<label><input type="radio" name="{ident}" value="{html.escape(str(o["value"]))}"'
+            f'{" checked" if o["value"] == value else ""}> {html.escape(str(o["label"]))}</label>'
+            for o in self._options(props)
+        )
+        return f'<div id="{ident}" class="snapshot-radio">{radios}</div>'
+
+
+def collect_states(data_manager, drought_step: float, ndvi_step: float) -> Dict[str, Dict]:
+    """
+    Prerender every callback output reachable from the static controls.
+
+    Returns:
+        dict: 'bubble', 'vegMaps', 'comparison' and 'scenario' state maps keyed
+        the way snapshot.js looks them up
+    """
+    from components.callbacks import build_bubble_outputs, build_scenario_outputs, build_veg_map_output
+    from components.dashboard_components import FIRE_SLIDER_YEARS, VEG_MAP_YEAR_OPTIONS
+    from data.data_manager import DEFAULT_YEAR_RANGE
+    from graphs.comparison import COMPARISON_VARIABLES, build_state_comparison_graph
+
+    renderer = StaticRenderer()
+    bubble = {}
+    for year in FIRE_SLIDER_YEARS:
+        figure, text = build_bubble_outputs(data_manager, (year, year))
+        bubble[str(year)] = {'figure': figure, 'text': text}
+    figure, text = build_bubble_outputs(data_manager, DEFAULT_YEAR_RANGE)
+    bubble['all'] = {'figure': figure, 'text': text}
+
+    veg_maps = {o['value']: renderer.render(build_veg_map_output(data_manager, o['value'])) for o in VEG_MAP_YEAR_OPTIONS}
+
+    # Every subset of states for small state counts, otherwise all states and each single state
+    codes = data_manager.get_state_codes()
+    if len(codes) <= 4:
+        subsets = [list(c) for r in range(len(codes) + 1) for c in itertools.combinations(codes, r)]
+    else:
+        subsets = [codes] + [[code] for code in codes]
+    comparison = {
+        f"{','.join(sorted(subset))}|{variable}": build_state_comparison_graph(data_manager, subset, variable, DEFAULT_YEAR_RANGE)
+        for subset in subsets for variable in COMPARISON_VARIABLES
+    }
+
+    scenario = {}
+    for drought in np.arange(-2.0, 2.0 + 1e-9, drought_step):
+        for ndvi in np.arange(-30.0, 30.0 + 1e-9, ndvi_step):
+            drought_key, ndvi_key = round(float(drought), 1) + 0.0, int(round(float(ndvi)))
+            figure, text = build_scenario_outputs(data_manager, drought_key, ndvi_key, DEFAULT_YEAR_RANGE)
+            scenario[f'{drought_key:.1f}|{ndvi_key}'] = {'figure': figure, 'text': text}
+
+    return {'bubble': bubble, 'vegMaps': veg_maps, 'comparison': comparison, 'scenario': scenario}
+
+
+def render_dashboard(data_manager, drought_step: float, ndvi_step: float) -> str:
+    """Render the dashboard page with every section and callback state embedded."""
+    from components.callbacks import SECTION_BUILDERS, build_section_figure, render_section
+    from components.layout import get_main_layout
+    from data.data_manager import DEFAULT_YEAR_RANGE
+
+    renderer = StaticRenderer(overrides={
+        'scenario-drought-shift': {'step': drought_step},
+        'scenario-ndvi-pct': {'step': ndvi_step},
+        'info-panel': {'children': "Move the year slider or click the drought chart to explore individual years."},
+    }, section_figure=lambda name: build_section_figure(data_manager, name, DEFAULT_YEAR_RANGE))
+    tabs = ''.join(
+        f'<div class="snapshot-tab" data-tab="{tab}" style="display:none">'
+        f'{renderer.render(render_section(data_manager, tab))}</div>'
+        for tab in SECTION_BUILDERS
+    )
+    body = renderer.render(get_main_layout(data_manager))
+    # Sections go into the (empty) tab content area; nav buttons switch tabs clientside
+    body = body.replace('<div id="tab-content" class="tab-content-container"></div>',
+                        f'<div id="tab-content" class="tab-content-container">{tabs}</div>', 1)
+    body = re.sub(r'<button id="btn-(\w+)"', r'<button data-tab-button="\1" id="btn-\1"', body)
+
+    data = {
+        'defaultTab': 'trends',
+        'figures': renderer.figures,
+        'states': collect_states(data_manager, drought_step, ndvi_step),
+    }
+    with open(os.path.join(SITE_DIR, 'dashboard.html')) as f:
+        page = f.read()
+    return page.replace('{{ body }}', body).replace('{{ data }}', minify_json(data))
+
+
+def rewrite_landing(page: str) -> str:
+    """Point the landing page's root-relative links at the static site layout."""
+    page = page.replace('href="/dashboard/"', 'href="dashboard/index.html"')
+    return page.replace('"/static/', '"static/')
+
+
+def optimize_image(source: str, target: str):
+    """Copy an image, re-encoding PNGs losslessly when that makes them smaller."""
+    shutil.copy2(source, target)
+    if not source.lower().endswith('.png'):
+        return
+    try:
+        from PIL import Image
+        optimized = target + '.tmp'
+        with Image.open(source) as image:
+            image.save(optimized, format='PNG', optimize=True)
+        if os.path.getsize(optimized) < os.path.getsize(target):
+            os.replace(optimized, target)
+        else:
+            os.remove(optimized)
+    except (ImportError, OSError) as e:
+        print(f"Kept {os.path.basename(source)} unoptimized: {e}")
+
+
+def export(out_dir: str, drought_step: float, ndvi_step: float) -> Dict[str, int]:
+    """
+    Write the static site.
+
+    Args:
+        out_dir: Output directory (replaced if it is empty or an earlier export)
+        drought_step: Scenario drought slider step in the snapshot
+        ndvi_step: Scenario NDVI slider step (percent) in the snapshot
+
+    Returns:
+        dict: Size in bytes of each written top-level file
+
+    Raises:
+        FileExistsError: If out_dir exists, is not empty and was not written by an earlier export
+    """
+    from data.data_manager import DataManager
+
+    if os.path.exists(out_dir):
+        if os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, EXPORT_MARKER)):
+            raise FileExistsError(f"{out_dir} is not empty and was not written by this exporter; "
+                                  f"refusing to replace it")
+        shutil.rmtree(out_dir)
+    dashboard_dir = os.path.join(out_dir, 'dashboard')
+    static_dir = os.path.join(out_dir, 'static')
+    os.makedirs(dashboard_dir)
+    os.makedirs(static_dir)
+    with open(os.path.join(out_dir, EXPORT_MARKER), 'w') as f:
+        f.write("Written by tools.export_static; replaced by the next export.\n")
+
+    data_manager = DataManager()
+    written = {}
+
+    def write(path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        written[os.path.relpath(path, out_dir)] = os.path.getsize(path)
+
+    write(os.path.join(dashboard_dir, 'index.html'), render_dashboard(data_manager, drought_step, ndvi_step))
+    with open('templates/landing.html', encoding='utf-8') as f:
+        write(os.path.join(out_dir, 'index.html'), rewrite_landing(f.read()))
+    with open('assets/style.css', encoding='utf-8') as f:
+        write(os.path.join(dashboard_dir, 'style.css'), minify_css(f.read()))
+    shutil.copy2(os.path.join(SITE_DIR, 'snapshot.js'), os.path.join(dashboard_dir, 'snapshot.js'))
+    shutil.copy2(os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js'),
+                 os.path.join(dashboard_dir, 'plotly.min.js'))
+    for name in sorted(os.listdir('static')):
+        source = os.path.join('static', name)
+        if os.path.isfile(source):
+            optimize_image(source, os.path.join(static_dir, name))
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the dashboard as a static site.")
+    parser.add_argument('--out', default='dist', help="Output directory (default: dist)")
+    parser.add_argument('--scenario-drought-step', type=float, default=0.5, help="Scenario drought slider step")
+    parser.add_argument('--scenario-ndvi-step', type=float, default=10, help="Scenario NDVI slider step (%%)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        written = export(args.out, args.scenario_drought_step, args.scenario_ndvi_step)
+    except OSError as e:
+        print(f"Error writing static site: {e}", file=sys.stderr)
+        return 1
+    for path, size in written.items():
+        print(f"{size / 1024:10.1f} KiB  {path}")
+    print(f"Exported static site to {args.out}/ in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Startup-time budget for the dashboard's imports.
+
+Imports a module in a fresh interpreter with `-X importtime` and reports the
+most expensive modules by cumulative time, plus the self time summed per
+top-level package (pandas, plotly, dash, ...). With --budget-ms the command
+exits non-zero when the total import time exceeds the budget, so it can guard
+cold-start regressions in CI or before a deploy.
+
+Usage:
+    python -m tools.importtime                      # import app
+    python -m tools.importtime --module graphs.correlations --top 15
+    python -m tools.importtime --budget-ms 1500
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+# "import time:      1234 |       5678 |     package.module"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str) -> List[Dict]:
+    """
+    Import a module in a fresh interpreter and parse its -X importtime output.
+
+    Args:
+        module: Dotted module name to import (e.g. 'app')
+
+    Returns:
+        list: One dict per imported module with 'name', 'self_us', 'cumulative_us' and 'depth'
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, cwd=os.getcwd()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            entries.append({
+                'name': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                # Nested imports are indented by two spaces per level
+                'depth': (len(match.group(3)) - 1) // 2,
+            })
+    return entries
+
+
+def total_us(entries: List[Dict]) -> int:
+    """Total import time: the sum of cumulative times of the top-level imports."""
+    return sum(e['cumulative_us'] for e in entries if e['depth'] == 0)
+
+
+def by_package(entries: List[Dict]) -> Dict[str, int]:
+    """Sum self time per top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for e in entries:
+        totals[e['name'].split('.')[0]] += e['self_us']
+    return dict(totals)
+
+
+def format_report(module: str, entries: List[Dict], top: int) -> str:
+    """Render the slowest modules and packages as a plain-text report."""
+    lines = [f"import {module}: {total_us(entries) / 1000:.1f} ms total, {len(entries)} modules", ""]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for e in sorted(entries, key=lambda e: e['cumulative_us'], reverse=True)[:top]:
+        lines.append(f"{e['cumulative_us'] / 1000:14.1f} {e['self_us'] / 1000:9.1f}  {e['name']}")
+    lines.append("")
+    lines.append(f"{'self ms':>14}  package")
+    for name, us in sorted(by_package(entries).items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{us / 1000:14.1f}  {name}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report cumulative import cost per module.")
+    parser.add_argument('--module', default='app', help="Module to import (default: app)")
+    parser.add_argument('--top', type=int, default=25, help="Number of modules/packages to list")
+    parser.add_argument('--budget-ms', type=float, help="Fail if the total import time exceeds this")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = measure(args.module)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(format_report(args.module, entries, args.top))
+
+    if args.budget_ms is not None:
+        elapsed = total_us(entries) / 1000
+        if elapsed > args.budget_ms:
+            print(f"\nOver budget: {elapsed:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+            return 1
+        print(f"\nWithin budget: {elapsed:.1f} ms <= {args.budget_ms:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
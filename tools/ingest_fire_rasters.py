@@ -0,0 +1,54 @@
+"""
+Ingest per-year fire rasters into the memory-mapped stack used by the map's time slider.
+
+Each input GeoTIFF holds one year of fire counts (band 1); the year is taken
+from the first four-digit 19xx/20xx number in the file name. The rasters are
+written into one uint8 (year × row × col) .npy stack plus a JSON sidecar,
+see maps.fire_stack.
+
+Usage:
+    python -m tools.ingest_fire_rasters data/california/fire_years/*.tif
+    python -m tools.ingest_fire_rasters --out data/california/fire_stack CA_Fire_2001.tif CA_Fire_2002.tif
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from maps.fire_stack import STACK_DIR, ingest_fire_rasters
+
+_YEAR = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the per-year fire raster stack.")
+    parser.add_argument('rasters', nargs='+', help="Per-year GeoTIFFs (year in the file name)")
+    parser.add_argument('--out', default=STACK_DIR, help=f"Output directory (default: {STACK_DIR})")
+    args = parser.parse_args(argv)
+
+    paths_by_year = {}
+    for path in args.rasters:
+        match = _YEAR.search(os.path.basename(path))
+        if not match:
+            print(f"Error: no year in file name {path}", file=sys.stderr)
+            return 1
+        year = int(match.group(1))
+        if year in paths_by_year:
+            print(f"Error: {path} and {paths_by_year[year]} are both for {year}", file=sys.stderr)
+            return 1
+        paths_by_year[year] = path
+
+    try:
+        meta = ingest_fire_rasters(paths_by_year, args.out)
+    except (OSError, ValueError) as e:
+        print(f"Error ingesting fire rasters: {e}", file=sys.stderr)
+        return 1
+    size_mb = len(meta['years']) * meta['height'] * meta['width'] / 1e6
+    print(f"Wrote {len(meta['years'])} years ({meta['years'][0]}–{meta['years'][-1]}), "
+          f"{meta['height']}×{meta['width']} px, {size_mb:.1f} MB -> {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Recompute the statewide vegetation-index CSV from NDVI/EVI rasters.
+
+Reads every <STATE>_<INDEX>_<YEAR>.tif in the raster directory (see
+maps.ndvi), computes each raster's statewide mean block by block and writes
+the values into Vegetation_Index_California_Georgia.csv. Rows for
+(year, state) pairs without rasters are kept as they are.
+
+Usage:
+    python -m tools.ingest_vegetation
+    python -m tools.ingest_vegetation --rasters data/vegetation/rasters --csv data/vegetation/Vegetation_Index_California_Georgia.csv
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+from loader import ClimateDataLoader
+from maps.ndvi import INDICES, RASTER_DIR, discover_rasters, vegetation_table
+
+DEFAULT_CSV = "data/vegetation/Vegetation_Index_California_Georgia.csv"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compute statewide NDVI/EVI means from rasters.")
+    parser.add_argument('--rasters', default=RASTER_DIR, help=f"Raster directory (default: {RASTER_DIR})")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="Vegetation CSV to update")
+    args = parser.parse_args(argv)
+
+    rasters = discover_rasters(args.rasters)
+    if not rasters:
+        print(f"Error: no <STATE>_<NDVI|EVI>_<YEAR>.tif rasters in {args.rasters}", file=sys.stderr)
+        return 1
+    state_names = {code: name for code, (name, _) in ClimateDataLoader().discover_states().items()}
+    try:
+        computed = vegetation_table(rasters, state_names)
+        existing = pd.read_csv(args.csv)
+    except (OSError, ValueError) as e:
+        print(f"Error computing vegetation means: {e}", file=sys.stderr)
+        return 1
+
+    # Raster-derived values replace the matching cells; everything else is kept
+    merged = existing.set_index(['Year', 'State'])
+    update = computed.set_index(['Year', 'State'])
+    merged = merged.combine_first(update)
+    merged.update(update)
+    merged = merged.reset_index().sort_values(['State', 'Year'], kind='stable')
+    merged[['Year', 'State', *INDICES]].to_csv(args.csv, index=False, float_format='%.2f')
+    print(f"Updated {len(computed)} (year, state) rows from {len(rasters)} rasters -> {args.csv}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
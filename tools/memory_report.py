@@ -0,0 +1,127 @@
+"""
+Per-worker memory report for a running gunicorn deployment.
+
+Reports RSS, PSS and USS for the gunicorn master and each worker. RSS counts
+shared pages in full for every process, so it overstates the cost of adding a
+worker; PSS splits shared pages between the processes that map them and USS is
+the memory a worker would free on exit. Comparing a report taken without
+preload mode against one taken with GUNICORN_PRELOAD=1 shows how much of each
+worker stays shared with the master.
+
+Usage:
+    python -m tools.memory_report --pid <master pid> [--save before.json]
+    python -m tools.memory_report --pidfile gunicorn.pid
+    python -m tools.memory_report --compare before.json after.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+import psutil
+
+MB = 1024 * 1024
+
+
+def _process_memory(proc: psutil.Process) -> Dict:
+    """Collect RSS/PSS/USS in bytes (PSS and USS need Linux /proc/<pid>/smaps)."""
+    info = proc.memory_full_info()
+    return {
+        'pid': proc.pid,
+        'rss': info.rss,
+        'pss': getattr(info, 'pss', None),
+        'uss': getattr(info, 'uss', None),
+    }
+
+
+def collect(master_pid: int) -> Dict:
+    """
+    Measure the gunicorn master and all of its worker processes.
+
+    Args:
+        master_pid: PID of the gunicorn master
+
+    Returns:
+        dict: {'master': {...}, 'workers': [{...}, ...], 'totals': {...}}
+    """
+    master = psutil.Process(master_pid)
+    workers = [_process_memory(child) for child in master.children()]
+    report = {'master': _process_memory(master), 'workers': workers}
+    everything = [report['master']] + workers
+    report['totals'] = {
+        key: sum(p[key] for p in everything if p[key] is not None)
+        for key in ('rss', 'pss', 'uss')
+    }
+    return report
+
+
+def _fmt(value) -> str:
+    return "n/a" if value is None else f"{value / MB:9.1f}"
+
+
+def format_report(report: Dict) -> str:
+    """Render a report as a fixed-width table in MiB."""
+    lines = [f"{'process':<10}{'pid':>8}{'RSS MiB':>10}{'PSS MiB':>10}{'USS MiB':>10}"]
+    rows: List = [('master', report['master'])] + [('worker', w) for w in report['workers']]
+    for label, p in rows:
+        lines.append(f"{label:<10}{p['pid']:>8}{_fmt(p['rss']):>10}{_fmt(p['pss']):>10}{_fmt(p['uss']):>10}")
+    totals = report['totals']
+    lines.append(f"{'total':<10}{'':>8}{_fmt(totals['rss']):>10}{_fmt(totals['pss']):>10}{_fmt(totals['uss']):>10}")
+    workers = report['workers']
+    if workers and all(w['pss'] is not None for w in workers):
+        lines.append(f"mean worker PSS: {sum(w['pss'] for w in workers) / len(workers) / MB:.1f} MiB")
+    return "\n".join(lines)
+
+
+def format_comparison(before: Dict, after: Dict) -> str:
+    """Compare the mean per-worker and total memory of two saved reports."""
+    lines = [f"{'metric':<20}{'before MiB':>12}{'after MiB':>12}{'change':>10}"]
+    for key in ('rss', 'pss', 'uss'):
+        for scope in ('worker', 'total'):
+            if scope == 'worker':
+                values = [
+                    [w[key] for w in r['workers'] if w[key] is not None] for r in (before, after)
+                ]
+                if not all(values):
+                    continue
+                b, a = (sum(v) / len(v) for v in values)
+            else:
+                b, a = before['totals'][key], after['totals'][key]
+            change = f"{(a - b) / b * 100:+.1f}%" if b else "n/a"
+            lines.append(f"{scope + ' ' + key.upper():<20}{b / MB:>12.1f}{a / MB:>12.1f}{change:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report gunicorn master/worker RSS, PSS and USS.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--pid', type=int, help="PID of the gunicorn master")
+    group.add_argument('--pidfile', help="gunicorn pidfile (see GUNICORN_PIDFILE)")
+    group.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="Compare two saved reports")
+    parser.add_argument('--save', help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f_before, open(args.compare[1]) as f_after:
+            print(format_comparison(json.load(f_before), json.load(f_after)))
+        return 0
+
+    pid = args.pid
+    if args.pidfile:
+        with open(args.pidfile) as f:
+            pid = int(f.read().strip())
+    try:
+        report = collect(pid)
+    except psutil.Error as e:
+        print(f"Error reading process {pid}: {e}", file=sys.stderr)
+        return 1
+    print(format_report(report))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+/*
+  Clientside interactivity for the static dashboard snapshot.
+
+  Every figure and callback output was prerendered by tools/export_static.py
+  and embedded as minified JSON in #snapshot-data; this script only swaps
+  prerendered states in response to the controls, without any server.
+*/
+(function () {
+  "use strict";
+
+  var data = JSON.parse(document.getElementById("snapshot-data").textContent);
+  var states = data.states;
+
+  function byId(id) { return document.getElementById(id); }
+
+  // Plot (or re-plot) a graph div; hidden graphs are drawn when their tab is shown
+  function setFigure(graphId, figure) {
+    var el = byId(graphId);
+    if (!el || !figure) { return; }
+    el._snapshotFigure = figure;
+    if (el.offsetParent !== null) { draw(el); }
+  }
+
+  function draw(el) {
+    var figure = el._snapshotFigure || data.figures[el.dataset.figure];
+    if (!figure) { return; }
+    var config = Object.assign({ responsive: true }, JSON.parse(el.dataset.config || "{}"));
+    Plotly.react(el, figure.data || [], Object.assign({}, figure.layout), config);
+    if (el.id === "drought-line-chart" && !el._snapshotClick) {
+      el._snapshotClick = true;
+      el.on("plotly_click", function (event) {
+        var year = event.points && event.points[0] && event.points[0].x;
+        var slider = byId("year-slider");
+        if (slider && Number.isInteger(year)) {
+          slider.value = year;
+          updateBubble(String(year));
+        }
+      });
+    }
+  }
+
+  function drawVisible(root) {
+    root.querySelectorAll(".snapshot-graph").forEach(function (el) {
+      if (el.offsetParent !== null) { draw(el); }
+    });
+  }
+
+  function showTab(tab) {
+    document.querySelectorAll(".snapshot-tab").forEach(function (section) {
+      section.style.display = section.dataset.tab === tab ? "" : "none";
+    });
+    var active = document.querySelector('.snapshot-tab[data-tab="' + tab + '"]');
+    if (active) { drawVisible(active); }
+  }
+
+  function setText(id, text) {
+    var el = byId(id);
+    if (el) { el.textContent = text || ""; }
+  }
+
+  function sliderLabel(slider) {
+    var label = byId(slider.id + "-value");
+    if (label) { label.textContent = slider.value; }
+  }
+
+  // California bubble chart and fire-risk badge, per slider year or "all"
+  function updateBubble(key) {
+    var state = states.bubble[key];
+    if (!state) { return; }
+    setFigure("bubble-chart-california", state.figure);
+    setText("fire-risk-badge", state.text);
+    var slider = byId("year-slider");
+    if (slider) { sliderLabel(slider); }
+  }
+
+  function updateComparison() {
+    var selector = byId("state-selector");
+    if (!selector) { return; }
+    var codes = Array.prototype.map.call(
+      selector.querySelectorAll("input:checked"), function (input) { return input.value; }
+    ).sort();
+    var variable = document.querySelector('input[name="comparison-variable"]:checked');
+    var key = codes.join(",") + "|" + (variable ? variable.value : "temperature");
+    var figure = states.comparison[key];
+    var note = byId("state-comparison-note");
+    if (!note) {
+      note = document.createElement("p");
+      note.id = "state-comparison-note";
+      note.className = "graph-subtitle";
+      selector.parentNode.insertBefore(note, selector.nextSibling);
+    }
+    note.textContent = figure ? "" : "This combination is not included in the snapshot.";
+    if (figure) { setFigure("state-comparison-graph", figure); }
+  }
+
+  function updateVegMaps() {
+    var select = byId("veg-map-year");
+    var display = byId("veg-map-display");
+    if (select && display) { display.innerHTML = states.vegMaps[select.value] || ""; }
+  }
+
+  function updateScenario() {
+    var drought = byId("scenario-drought-shift");
+    var ndvi = byId("scenario-ndvi-pct");
+    if (!drought || !ndvi) { return; }
+    sliderLabel(drought);
+    sliderLabel(ndvi);
+    var key = (Number(drought.value) + 0).toFixed(1) + "|" + Math.round(Number(ndvi.value));
+    var state = states.scenario[key];
+    if (state) {
+      setFigure("scenario-histogram", state.figure);
+      setText("scenario-summary", state.text);
+    }
+  }
+
+  function on(id, event, handler) {
+    var el = byId(id);
+    if (el) { el.addEventListener(event, handler); }
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("[data-tab-button]").forEach(function (button) {
+      button.addEventListener("click", function () { showTab(button.dataset.tabButton); });
+    });
+    on("year-slider", "input", function (e) { updateBubble(e.target.value); });
+    on("reset-year-btn", "click", function () { updateBubble("all"); });
+    on("veg-map-year", "change", updateVegMaps);
+    on("state-selector", "change", updateComparison);
+    document.querySelectorAll('input[name="comparison-variable"]').forEach(function (input) {
+      input.addEventListener("change", updateComparison);
+    });
+    on("scenario-drought-shift", "input", updateScenario);
+    on("scenario-ndvi-pct", "input", updateScenario);
+
+    var slider = byId("year-slider");
+    if (slider) { updateBubble(slider.value); }
+    updateComparison();
+    updateVegMaps();
+    updateScenario();
+    showTab(data.defaultTab);
+  });
+})();
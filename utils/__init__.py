@@ -0,0 +1,24 @@
+"""
+Utilities package for the wildfire climate change visualization dashboard.
+
+This package contains runtime support modules such as request profiling, the
+figure cache and its startup warm-up, figure precomputation for preloaded
+gunicorn deployments and the manager of background callbacks.
+"""
+
+from .profiling import install_profiler
+from .preload import preload_enabled
+from .figure_cache import cached_output, figure_cache
+from .warmup import FigureWarmup, install_warmup
+from .background import background_enabled, create_background_manager
+
+__all__ = [
+    'install_profiler',
+    'preload_enabled',
+    'cached_output',
+    'figure_cache',
+    'FigureWarmup',
+    'install_warmup',
+    'background_enabled',
+    'create_background_manager'
+]
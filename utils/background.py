@@ -0,0 +1,63 @@
+"""
+Background execution of slow dashboard callbacks.
+
+Callbacks that can take seconds (zonal statistics, NDVI change rendering)
+run as Dash background callbacks: the request that triggers one only starts
+a job in a separate process and returns, and the browser polls for progress
+and the result, so a slow job never holds a gunicorn request worker. Fast
+callbacks stay inline, since a job's start and first poll alone take longer
+than they do. Jobs are managed by a DiskcacheManager, which keeps
+job state and results in a local diskcache directory shared by every worker
+on the host and needs no external broker.
+
+Results are cached by the hash of the callback's inputs plus the
+DataManager data tag, so loading different data invalidates them.
+
+Configuration is read from environment variables:
+- BACKGROUND_CALLBACKS: '1' (default) to run heavy callbacks as background jobs, '0' to run them inline.
+- BACKGROUND_CACHE_DIR: diskcache directory of job state and results (default 'data/cache/background').
+- BACKGROUND_CACHE_EXPIRE: Seconds a cached result is kept (default 86400).
+
+diskcache and multiprocess are imported lazily; without them heavy callbacks
+run inline.
+"""
+
+import os
+
+CACHE_DIR = os.environ.get("BACKGROUND_CACHE_DIR", "data/cache/background")
+CACHE_EXPIRE = int(os.environ.get("BACKGROUND_CACHE_EXPIRE", "86400"))
+# Milliseconds between the browser's progress/result polls
+POLL_INTERVAL = 250
+
+
+def background_enabled() -> bool:
+    """Whether heavy callbacks should run as background jobs (BACKGROUND_CALLBACKS, default on)."""
+    return os.environ.get("BACKGROUND_CALLBACKS", "1") != "0"
+
+
+def create_background_manager(data_manager, cache_dir: str = CACHE_DIR):
+    """
+    Create the DiskcacheManager for the dashboard's background callbacks.
+
+    Args:
+        data_manager: DataManager whose data tag is part of every result's cache key
+        cache_dir: diskcache directory
+
+    Returns:
+        DiskcacheManager or None: None when disabled or diskcache/multiprocess are missing
+    """
+    if not background_enabled():
+        return None
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+        import multiprocess  # noqa: F401 (used by DiskcacheManager to start jobs)
+    except ImportError as e:
+        print(f"Background callbacks disabled, running heavy callbacks inline: {e}")
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    return DiskcacheManager(
+        diskcache.Cache(cache_dir),
+        cache_by=[lambda: data_manager.data_tag],
+        expire=CACHE_EXPIRE
+    )
@@ -0,0 +1,366 @@
+"""
+Cache for rendered callback outputs.
+
+Callback outputs (figure dicts and section component trees) are cached under
+a key made of the output name, the DataManager data tag and the control
+values that produced them, so loading different data invalidates every
+entry. Both backends are bounded and evict the least recently used entry
+first.
+
+- 'memory' keeps entries in a per-process dictionary.
+- 'sqlite' stores entries as JSON in a local SQLite database in WAL mode
+  that every gunicorn worker on the host shares, so each output is computed
+  once per host instead of once per worker. A lock row per key makes a
+  missing entry single-flight: one worker (or thread) builds it while the
+  others wait for its result.
+
+Values are never unpickled: figure dicts and zonal statistics are stored as
+plain JSON, with Dash components and tuples tagged so they decode back to the
+same objects. The database lives in a directory private to the app's user
+(created 0700, the file 0600); a directory or file owned by another user, or
+writable by others, is refused and the memory backend is used instead.
+
+Configuration is read from environment variables:
+- FIGURE_CACHE_BACKEND: 'memory' (default) or 'sqlite'.
+- FIGURE_CACHE_SIZE: Maximum number of entries of the memory backend (default 512).
+- FIGURE_CACHE_PATH: SQLite database path (default 'data/cache/figures/figures.sqlite').
+- FIGURE_CACHE_MAX_MB: Total size bound of the SQLite backend in megabytes (default 256).
+"""
+
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from dash.development.base_component import Component
+
+# Seconds a build may hold a key's lock before other workers take over
+LOCK_TTL = 30.0
+# Polling interval while waiting for another worker's build
+LOCK_POLL = 0.02
+
+DEFAULT_SQLITE_PATH = os.path.join("data", "cache", "figures", "figures.sqlite")
+
+# Keys tagging the JSON form of values that JSON has no type for
+_COMPONENT_TAG = "__component__"
+_TUPLE_TAG = "__tuple__"
+
+# (namespace, type) -> Dash component class, filled on demand
+_COMPONENT_CLASSES: Dict[Tuple[str, str], type] = {}
+
+
+class FigureCache:
+    """
+    Thread-safe in-process LRU cache of rendered outputs.
+
+    Builders run outside the lock, so a slow build does not block readers of
+    other entries; two threads missing on the same key may both build it.
+    """
+
+    def __init__(self, maxsize: int):
+        """Initialize an empty cache holding at most ``maxsize`` entries."""
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, building and storing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Return a snapshot of the (key, value) entries, least recently used first."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _to_json(value: Any) -> Any:
+    """JSON-ready form of a cached value, tagging Dash components and tuples."""
+    if isinstance(value, Component):
+        component = value.to_plotly_json()
+        return {_COMPONENT_TAG: [component['namespace'], component['type']], 'props': _to_json(component['props'])}
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _to_json(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'to_plotly_json'):
+        # e.g. a plotly Figure, stored as its figure dict
+        return _to_json(value.to_plotly_json())
+    return value
+
+
+def _component_class(namespace: str, type_name: str) -> type:
+    """Find the loaded Dash component class of a (namespace, type) pair."""
+    if (namespace, type_name) not in _COMPONENT_CLASSES:
+        todo = [Component]
+        while todo:
+            cls = todo.pop()
+            todo.extend(cls.__subclasses__())
+            if hasattr(cls, '_namespace') and hasattr(cls, '_type'):
+                _COMPONENT_CLASSES[(cls._namespace, cls._type)] = cls
+    return _COMPONENT_CLASSES[(namespace, type_name)]
+
+
+def _from_json(obj: Dict) -> Any:
+    """json.loads object hook reversing the tags of _to_json."""
+    if _COMPONENT_TAG in obj:
+        namespace, type_name = obj[_COMPONENT_TAG]
+        return _component_class(namespace, type_name)(**obj['props'])
+    if _TUPLE_TAG in obj:
+        return tuple(obj[_TUPLE_TAG])
+    return obj
+
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a cached value to JSON bytes (raises TypeError/ValueError for unsupported values)."""
+    return json.dumps(_to_json(value), separators=(',', ':')).encode('utf-8')
+
+
+def decode_value(blob: bytes) -> Any:
+    """Deserialize a value written by encode_value."""
+    return json.loads(blob, object_hook=_from_json)
+
+
+def _private_path(path: str) -> str:
+    """
+    Prepare a database path readable and writable only by this process' user.
+
+    The directory is created with mode 0700 and the file with 0600 (an own
+    file with a wider mode is narrowed to 0600). Symlinks, a directory owned by
+    another user or writable by others, and a file owned by another user are
+    refused.
+
+    Args:
+        path: Database path
+
+    Returns:
+        str: The path, safe to open
+
+    Raises:
+        PermissionError: If the directory or file is not private to this user
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    uid = os.getuid()
+    info = os.stat(directory)
+    if info.st_uid != uid or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{directory} must be owned by uid {uid} and not writable by others")
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    try:
+        info = os.fstat(fd)
+        if info.st_uid != uid:
+            raise PermissionError(f"{path} must be owned by uid {uid}")
+        if info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+    return path
+
+
+class SQLiteFigureCache:
+    """
+    Host-wide LRU cache of JSON-encoded outputs in a SQLite database shared by all workers.
+
+    Each thread of each process uses its own connection. The database runs in
+    WAL mode so readers never block the single writer. Any SQLite error falls
+    back to building the value without caching it.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """Initialize the cache at ``path`` bounded to ``max_bytes`` of encoded values."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+            CREATE TABLE IF NOT EXISTS locks (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires REAL NOT NULL
+            );
+        """)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _owner(self) -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _read(self, conn: sqlite3.Connection, key: str) -> Optional[bytes]:
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        # Refresh the LRU timestamp at most once a second to keep hits mostly read-only
+        now = time.time()
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ? AND accessed < ?", (now, key, now - 1.0))
+        return row[0]
+
+    def _acquire(self, conn: sqlite3.Connection, key: str) -> bool:
+        """Take the build lock for ``key`` unless another live owner holds it."""
+        now = time.time()
+        cursor = conn.execute(
+            "INSERT INTO locks (key, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+            "WHERE locks.expires < ?",
+            (key, self._owner(), now + LOCK_TTL, now)
+        )
+        return cursor.rowcount == 1
+
+    def _release(self, conn: sqlite3.Connection, key: str):
+        conn.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, self._owner()))
+
+    def _store(self, conn: sqlite3.Connection, key: str, blob: bytes):
+        """Insert an entry and evict least recently used entries beyond the size bound."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                for old_key, size in conn.execute(
+                    "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed", (key,)
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    excess -= size
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, building it in at most one worker on a miss."""
+        skey = repr(key)
+        try:
+            conn = self._connect()
+            blob = self._read(conn, skey)
+            # Single flight: build if we get the lock, otherwise wait for the owner's result
+            while blob is None and not self._acquire(conn, skey):
+                time.sleep(LOCK_POLL)
+                blob = self._read(conn, skey)
+            if blob is None:
+                # Another owner may have finished between our last read and taking the lock
+                blob = self._read(conn, skey)
+                if blob is not None:
+                    self._release(conn, skey)
+        except sqlite3.Error as e:
+            print(f"Figure cache unavailable ({e}); building without cache")
+            return build()
+        if blob is not None:
+            try:
+                value = decode_value(blob)
+                self.hits += 1
+                return value
+            except (ValueError, TypeError, KeyError) as e:
+                # e.g. an entry written by an older version; rebuilt and replaced below
+                print(f"Unreadable figure cache entry {skey} ({e}); rebuilding it")
+
+        self.misses += 1
+        try:
+            value = build()
+            try:
+                self._store(conn, skey, encode_value(value))
+            except (TypeError, ValueError) as e:
+                print(f"Figure cache entry {skey} is not JSON-serializable ({e}); not cached")
+            except sqlite3.Error as e:
+                print(f"Error writing figure cache entry: {e}")
+            return value
+        finally:
+            try:
+                self._release(conn, skey)
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        """Drop every cached entry and lock."""
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM locks")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def _create_cache():
+    """Build the cache backend selected by FIGURE_CACHE_BACKEND."""
+    backend = os.environ.get("FIGURE_CACHE_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        path = os.environ.get("FIGURE_CACHE_PATH", DEFAULT_SQLITE_PATH)
+        max_bytes = int(float(os.environ.get("FIGURE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        try:
+            return SQLiteFigureCache(_private_path(path), max_bytes)
+        except OSError as e:
+            print(f"Refusing the SQLite figure cache at {path} ({e}); using the in-memory cache")
+    return FigureCache(int(os.environ.get("FIGURE_CACHE_SIZE", "512")))
+
+
+figure_cache = _create_cache()
+
+
+def cached_output(name: str, data_manager, args: Tuple, build: Callable[[], Any]) -> Any:
+    """
+    Return a cached callback output, building it on first use.
+
+    Args:
+        name: Output name (e.g. 'section-trends')
+        data_manager: DataManager whose data tag versions the entry
+        args: Hashable control values the output depends on
+        build: Zero-argument function producing the output
+
+    Returns:
+        The cached or freshly built output
+    """
+    return figure_cache.get_or_build((name, data_manager.data_tag, args), build)
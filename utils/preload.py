@@ -0,0 +1,16 @@
+"""
+Precomputation of figures before gunicorn forks its workers.
+
+In preload mode (see gunicorn.conf.py) the app module is imported once in the
+gunicorn master. Running the figure warm-up there (see utils.warmup) builds
+the figure template skeletons and fills the figure caches in the master's
+memory, so forked workers inherit them through copy-on-write instead of each
+building their own copy on first request.
+"""
+
+import os
+
+
+def preload_enabled() -> bool:
+    """Whether figures should be precomputed at app creation (PRELOAD_FIGURES=1)."""
+    return os.environ.get("PRELOAD_FIGURES", "0") == "1"
@@ -0,0 +1,230 @@
+"""
+Opt-in sampling profiler for Dash callback requests.
+
+When enabled, a background thread samples the Python stack of the worker
+thread that is dispatching a Dash callback, so the time spent in pandas,
+the Plotly figure constructors and JSON serialization all shows up in one
+profile. Each profiled request is written as a flamegraph-ready file under
+a per-callback directory, keeping only the most recent files.
+
+Configuration is read from environment variables:
+- DASH_PROFILE: '1' profiles sampled requests, 'header' profiles only sampled
+  requests carrying an 'X-Dash-Profile: 1' header. Unset disables profiling.
+- DASH_PROFILE_RATE: Fraction of eligible requests to profile (default 1.0).
+- DASH_PROFILE_DIR: Output directory (default 'profiles').
+- DASH_PROFILE_FORMAT: 'collapsed' (Brendan Gregg folded stacks) or 'speedscope'.
+- DASH_PROFILE_KEEP: Number of files kept per callback id (default 20).
+- DASH_PROFILE_INTERVAL_MS: Sampling interval in milliseconds (default 5).
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, request
+
+DISPATCH_PATH_SUFFIX = "_dash-update-component"
+PROFILE_HEADER = "X-Dash-Profile"
+
+
+class StackSampler:
+    """
+    Periodically samples the call stack of a single thread.
+
+    Stacks are stored root-first as tuples of frame labels and counted, so the
+    output size depends on the number of distinct stacks rather than on the
+    duration of the request.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        """Initialize the sampler for the given thread id and interval in seconds."""
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counts: Counter = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="dash-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampling thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.counts[tuple(reversed(stack))] += 1
+
+    def to_collapsed(self) -> str:
+        """Render the samples in collapsed-stack format ('a;b;c count' per line)."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.counts.most_common())
+
+    def to_speedscope(self, name: str) -> Dict:
+        """Render the samples as a speedscope 'sampled' profile."""
+        frame_index: Dict[str, int] = {}
+        frames: List[Dict] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.counts.items():
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            samples.append(indices)
+            weights.append(count * self._interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "climate-dashboard",
+        }
+
+
+class RequestProfiler:
+    """
+    Flask request hooks that profile a fraction of Dash callback dispatches.
+    """
+
+    def __init__(self, mode: str, rate: float, output_dir: str, fmt: str, keep: int, interval: float):
+        """Initialize the profiler with its sampling and retention settings."""
+        self.mode = mode
+        self.rate = rate
+        self.output_dir = output_dir
+        self.format = fmt
+        self.keep = keep
+        self.interval = interval
+
+    @classmethod
+    def from_env(cls) -> Optional["RequestProfiler"]:
+        """Build a profiler from DASH_PROFILE_* variables, or return None when disabled."""
+        mode = os.environ.get("DASH_PROFILE", "").strip().lower()
+        if mode in ("", "0", "false", "off"):
+            return None
+        fmt = os.environ.get("DASH_PROFILE_FORMAT", "collapsed").lower()
+        if fmt not in ("collapsed", "speedscope"):
+            fmt = "collapsed"
+        return cls(
+            mode="header" if mode == "header" else "always",
+            rate=float(os.environ.get("DASH_PROFILE_RATE", "1.0")),
+            output_dir=os.environ.get("DASH_PROFILE_DIR", "profiles"),
+            fmt=fmt,
+            keep=int(os.environ.get("DASH_PROFILE_KEEP", "20")),
+            interval=float(os.environ.get("DASH_PROFILE_INTERVAL_MS", "5")) / 1000.0,
+        )
+
+    def _should_profile(self) -> bool:
+        if not request.path.endswith(DISPATCH_PATH_SUFFIX):
+            return False
+        if self.mode == "header" and request.headers.get(PROFILE_HEADER) != "1":
+            return False
+        return random.random() < self.rate
+
+    def before_request(self):
+        """Start a sampler for eligible callback requests."""
+        if self._should_profile():
+            g.dash_profiler = StackSampler(threading.get_ident(), self.interval)
+            g.dash_profiler.start()
+
+    def teardown_request(self, _exc=None):
+        """Stop the sampler, if any, and write its profile to disk."""
+        sampler = g.pop("dash_profiler", None)
+        if sampler is None:
+            return
+        sampler.stop()
+        try:
+            self._write(sampler, self._callback_id())
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+
+    def _callback_id(self) -> str:
+        body = request.get_json(silent=True) or {}
+        return str(body.get("output", "unknown"))
+
+    def _write(self, sampler: StackSampler, callback_id: str):
+        directory = os.path.join(self.output_dir, _safe_name(callback_id))
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S") + f"-{int(sampler.duration * 1000)}ms-{os.getpid()}"
+        if self.format == "speedscope":
+            path = os.path.join(directory, f"{stamp}.speedscope.json")
+            with open(path, "w") as f:
+                json.dump(sampler.to_speedscope(callback_id), f)
+        else:
+            path = os.path.join(directory, f"{stamp}.collapsed.txt")
+            with open(path, "w") as f:
+                f.write(sampler.to_collapsed())
+        self._enforce_retention(directory)
+
+    def _enforce_retention(self, directory: str):
+        entries: List[Tuple[float, str]] = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _safe_name(callback_id: str) -> str:
+    """Turn a Dash output id such as '..a.figure...b.children..' into a directory name."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", callback_id).strip("_")[:80]
+    digest = hashlib.sha1(callback_id.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def install_profiler(server) -> Optional[RequestProfiler]:
+    """
+    Attach the request profiler to a Flask server if DASH_PROFILE is set.
+
+    Args:
+        server: Flask server hosting the Dash app
+
+    Returns:
+        RequestProfiler or None: The installed profiler, or None when disabled
+    """
+    profiler = RequestProfiler.from_env()
+    if profiler is None:
+        return None
+    server.before_request(profiler.before_request)
+    server.teardown_request(profiler.teardown_request)
+    print(f"Request profiling enabled ({profiler.mode}, rate={profiler.rate}) -> {profiler.output_dir}")
+    return profiler
@@ -0,0 +1,264 @@
+"""
+Startup warm-up of the figure cache.
+
+Builds every figure served by the dashboard callbacks for every section and
+default control value (each 'year-slider' year, each 'veg-map-year' option,
+the default global year range, the default state comparison, the default
+fire scenario and every frame of the fire raster stack) on a thread pool, so
+the first visitor to each tab is served from the figure cache.
+
+The serving entry points start it (gunicorn.conf.py and app.py's __main__),
+never an import of the app. By default it runs in a background thread while
+the server already accepts traffic; its progress is reported by the /ready
+endpoint. In gunicorn preload mode it runs synchronously in the master before
+workers fork.
+
+The offline build (`python -m tools.build`) runs the same tasks once and
+pickles their outputs into a figure bundle. A warm-up first seeds the figure
+cache from that bundle when it was built from the same data (same data tag)
+and the same dashboard code, so its tasks become cache hits instead of
+figure builds.
+
+Configuration is read from environment variables:
+- WARMUP_FIGURES: '0' disables the background warm-up (default '1').
+- WARMUP_WORKERS: Thread pool size (default 4).
+- FIGURE_BUNDLE_PATH: Prebuilt figure bundle (default 'build/figures.pkl').
+"""
+
+import glob
+import hashlib
+import importlib
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from data.data_manager import DEFAULT_YEAR_RANGE
+
+EXTENSION_KEY = "figure_warmup"
+
+BUNDLE_PATH = os.environ.get("FIGURE_BUNDLE_PATH", "build/figures.pkl")
+# Packages whose code shapes the warm-up outputs; a bundle built from other code is ignored
+FIGURE_PACKAGES = ('components', 'graphs', 'maps', 'models')
+
+
+class FigureWarmup:
+    """
+    Runs the warm-up tasks on a thread pool and tracks their progress.
+    """
+
+    def __init__(self, data_manager, workers: int = 4):
+        """Initialize the warm-up for a DataManager with the given pool size."""
+        self.data_manager = data_manager
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self.state = "pending"
+        self.total = 0
+        self.completed = 0
+        self.failed: List[str] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.seeded = 0
+
+    def tasks(self) -> List[Tuple[str, Callable[[], Any]]]:
+        """List the (name, build) pairs for every cached callback output."""
+        # Imported here to avoid a circular import (components import utils.figure_cache)
+        from components.callbacks import (
+            SECTION_BUILDERS,
+            build_bubble_outputs,
+            build_scenario_outputs,
+            build_section_figure,
+            build_veg_map_output,
+            render_section
+        )
+        from components.dashboard_components import (
+            FIRE_SLIDER_YEARS,
+            SCENARIO_DEFAULTS,
+            SECTION_FIGURES,
+            VEG_MAP_YEAR_OPTIONS
+        )
+        from graphs.comparison import COMPARISON_VARIABLES, build_state_comparison_graph
+        from maps.fire_stack import load_fire_stack
+
+        dm = self.data_manager
+        tasks = [(f"section:{tab}", lambda tab=tab: render_section(dm, tab)) for tab in SECTION_BUILDERS]
+        tasks += [(f"figure:{name}", lambda name=name: build_section_figure(dm, name, DEFAULT_YEAR_RANGE))
+                  for name in SECTION_FIGURES]
+        tasks += [(f"bubble:{year}", lambda year=year: build_bubble_outputs(dm, (year, year)))
+                  for year in FIRE_SLIDER_YEARS]
+        tasks.append(("bubble:all", lambda: build_bubble_outputs(dm, DEFAULT_YEAR_RANGE)))
+        tasks += [(f"veg-map:{option['value']}", lambda value=option['value']: build_veg_map_output(dm, value))
+                  for option in VEG_MAP_YEAR_OPTIONS]
+        tasks.append(("scenario:default", lambda: build_scenario_outputs(dm, *SCENARIO_DEFAULTS, DEFAULT_YEAR_RANGE)))
+        states = dm.get_state_codes()
+        tasks += [(f"comparison:{variable}",
+                   lambda variable=variable: build_state_comparison_graph(dm, states, variable, DEFAULT_YEAR_RANGE))
+                  for variable in COMPARISON_VARIABLES]
+        stack = load_fire_stack()
+        if stack is not None:
+            tasks += [(f"fire-frame:{year}", lambda year=year: stack.frame_png(year)) for year in stack.years]
+        return tasks
+
+    def run(self) -> float:
+        """
+        Build every task on the thread pool and wait for completion.
+
+        Returns:
+            float: Seconds spent warming up
+        """
+        self.seeded = load_figure_bundle(self.data_manager)
+        tasks = self.tasks()
+        with self._lock:
+            self.state = "warming"
+            self.total = len(tasks)
+            self.started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warmup") as pool:
+            futures = {pool.submit(build): name for name, build in tasks}
+            for future in as_completed(futures):
+                error = future.exception()
+                with self._lock:
+                    self.completed += 1
+                    if error is not None:
+                        self.failed.append(futures[future])
+                if error is not None:
+                    print(f"Warm-up of {futures[future]} failed: {error}")
+        with self._lock:
+            self.state = "ready"
+            self.finished_at = time.perf_counter()
+        return self.finished_at - self.started_at
+
+    def start(self) -> threading.Thread:
+        """Run the warm-up in a daemon thread and return immediately."""
+        thread = threading.Thread(target=self._run_logged, name="figure-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _run_logged(self):
+        elapsed = self.run()
+        print(f"Warmed up {self.completed} figures ({len(self.failed)} failed, {self.seeded} seeded "
+              f"from the prebuilt bundle) in {elapsed:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        """Whether every warm-up task has finished."""
+        return self.state == "ready"
+
+    def status(self) -> Dict[str, Any]:
+        """Progress snapshot for the readiness endpoint."""
+        with self._lock:
+            end = self.finished_at or time.perf_counter()
+            return {
+                "state": self.state,
+                "total": self.total,
+                "completed": self.completed,
+                "failed": list(self.failed),
+                "seeded": self.seeded,
+                "elapsed_s": round(end - self.started_at, 3) if self.started_at else 0.0,
+            }
+
+
+def figure_sources() -> List[str]:
+    """The Python files whose code shapes the warm-up outputs."""
+    return sorted(path for package in FIGURE_PACKAGES for path in glob.glob(os.path.join(package, '*.py')))
+
+
+def _code_fingerprint() -> str:
+    digest = hashlib.sha1()
+    for path in figure_sources():
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def write_figure_bundle(data_manager, path: str = BUNDLE_PATH) -> str:
+    """
+    Build every warm-up output once and pickle them as a figure bundle.
+    
+    Args:
+        data_manager: DataManager instance containing all datasets
+        path: Output path of the bundle
+        
+    Returns:
+        str: The bundle path
+    """
+    # The module itself (the package attribute of the same name is the cache instance)
+    cache_module = importlib.import_module("utils.figure_cache")
+
+    # Collect the outputs in a private unbounded cache rather than the configured backend
+    shared, cache_module.figure_cache = cache_module.figure_cache, cache_module.FigureCache(sys.maxsize)
+    try:
+        warmup = FigureWarmup(data_manager, int(os.environ.get("WARMUP_WORKERS", "4")))
+        for _, build in warmup.tasks():
+            build()
+        entries = cache_module.figure_cache.items()
+    finally:
+        cache_module.figure_cache = shared
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'wb') as f:
+        pickle.dump({'data_tag': data_manager.data_tag, 'code': _code_fingerprint(), 'entries': entries},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial, path)
+    return path
+
+
+def load_figure_bundle(data_manager, path: str = BUNDLE_PATH) -> int:
+    """
+    Seed the figure cache from a prebuilt figure bundle.
+    
+    Args:
+        data_manager: DataManager whose data tag the bundle must match
+        path: Bundle path
+        
+    Returns:
+        int: Number of seeded entries (0 without a bundle for this data)
+    """
+    cache_module = importlib.import_module("utils.figure_cache")
+
+    try:
+        with open(path, 'rb') as f:
+            bundle = pickle.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Error loading figure bundle {path}: {e}")
+        return 0
+    if (bundle.get('data_tag'), bundle.get('code')) != (data_manager.data_tag, _code_fingerprint()):
+        print(f"Figure bundle {path} was built from other data or code; warming up from scratch")
+        return 0
+    for key, value in bundle['entries']:
+        # Stores the entry unless the cache already holds it
+        cache_module.figure_cache.get_or_build(key, lambda value=value: value)
+    return len(bundle['entries'])
+
+
+def warmup_enabled() -> bool:
+    """Whether figures should be warmed up in the background at startup (WARMUP_FIGURES, default on)."""
+    return os.environ.get("WARMUP_FIGURES", "1") != "0"
+
+
+def install_warmup(server, data_manager, background: bool = True) -> Optional[FigureWarmup]:
+    """
+    Create the figure warm-up, register it on the Flask server and run it.
+
+    Args:
+        server: Flask server; the warm-up is stored in server.extensions for /ready
+        data_manager: DataManager instance containing all datasets
+        background: Run in a daemon thread (True) or block until done (False)
+
+    Returns:
+        FigureWarmup or None: The warm-up, or None when disabled
+    """
+    if background and not warmup_enabled():
+        return None
+    warmup = FigureWarmup(data_manager, int(os.environ.get("WARMUP_WORKERS", "4")))
+    server.extensions[EXTENSION_KEY] = warmup
+    if background:
+        warmup.start()
+    else:
+        elapsed = warmup.run()
+        print(f"Warmed up {warmup.completed} figures in {elapsed:.2f}s")
+    return warmup